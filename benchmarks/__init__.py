@@ -0,0 +1,11 @@
+"""Benchmarks do LTIP Laboratory Webapp (executar com python -m benchmarks.<nome>).
+
+ - seed: gera inventário sintético (1k, 100k ou 1M linhas por tabela) e fixtures
+ - micro: micro-benchmarks em processo (busca, renderização, upload, download)
+ - load: driver de carga HTTP (vazão e percentis) contra SQLite ou PostgreSQL
+ - compare: compara dois resultados JSON e aponta regressões
+ - import_time, report_storage: inicialização e armazenamento de relatórios
+ - wire_size: bytes na rede por visualização de /inventory (CSS em cache, gzip/brotli)
+
+Os resultados ficam em benchmarks/results/<commit>-<nome>.json.
+"""
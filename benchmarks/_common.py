@@ -0,0 +1,71 @@
+"""Utilidades compartilhadas pelos benchmarks: metadados, percentis e resultados em JSON."""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def database_dialect(url):
+    if not url:
+        return "sqlite"
+    scheme = url.split(":", 1)[0].split("+", 1)[0]
+    return "postgresql" if scheme.startswith("postgres") else scheme
+
+
+def metadata(**extra):
+    info = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": database_dialect(os.environ.get("DATABASE_URL")),
+    }
+    info.update(extra)
+    return info
+
+
+def percentile(sorted_values, pct):
+    """Percentil por interpolação linear sobre uma lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize_ms(samples_s):
+    values = sorted(s * 1000 for s in samples_s)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p90_ms": round(percentile(values, 90), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def save_results(name, results, path=None):
+    """Grava em path ou em benchmarks/results/<commit>-<name>.json; devolve o caminho."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{results.get('meta', {}).get('commit', git_commit())}-{name}.json")
+    with open(path, "w") as fh:
+        json.dump(results, fh, indent=2, ensure_ascii=False)
+    return path
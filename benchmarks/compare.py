@@ -0,0 +1,63 @@
+"""
+Compara dois resultados de benchmark (micro ou load) e aponta regressões.
+
+Uso:
+    python -m benchmarks.compare benchmarks/results/abc123-micro.json benchmarks/results/def456-micro.json \
+        [--metric p50_ms] [--threshold 10]
+
+Sai com código 1 se algum caso piorar mais que --threshold por cento.
+"""
+
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def compare(before, after, metric, threshold):
+    regressions = []
+    rows = []
+    for case in sorted(set(before.get("cases", {})) | set(after.get("cases", {}))):
+        old = before.get("cases", {}).get(case, {}).get(metric)
+        new = after.get("cases", {}).get(case, {}).get(metric)
+        if old is None or new is None:
+            rows.append((case, old, new, None))
+            continue
+        delta = (new - old) / old * 100 if old else 0.0
+        rows.append((case, old, new, delta))
+        if delta > threshold:
+            regressions.append(case)
+    if "throughput_rps" in before and "throughput_rps" in after:
+        old, new = before["throughput_rps"], after["throughput_rps"]
+        delta = (old - new) / old * 100 if old else 0.0  # vazão: menor é pior
+        rows.append(("vazão (req/s)", old, new, -delta))
+        if delta > threshold:
+            regressions.append("vazão (req/s)")
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--metric", default="p50_ms")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regressão tolerada, em %%")
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    print(f"{before.get('meta', {}).get('commit', '?')} -> {after.get('meta', {}).get('commit', '?')} ({args.metric})")
+    rows, regressions = compare(before, after, args.metric, args.threshold)
+    for case, old, new, delta in rows:
+        if delta is None:
+            print(f"  {case:45s} {old!s:>10} -> {new!s:>10}   (ausente)")
+        else:
+            flag = "  REGRESSÃO" if case in regressions else ""
+            print(f"  {case:45s} {old:10.2f} -> {new:10.2f}  {delta:+6.1f}%{flag}")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
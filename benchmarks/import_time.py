@@ -0,0 +1,113 @@
+"""
+Benchmark de tempo de inicialização (cold start) baseado em python -X importtime.
+
+Mede, em processos novos (sem cache de módulos em memória):
+ - import: "import LTIP_Laboratory_Webapp_app" (o que todo worker paga)
+ - boot: import + create_app() (o que o gunicorn paga por worker)
+ - kiosk: import + create_app() só com os blueprints de listagem
+e lista os módulos de topo que mais pesam no import.
+
+Uso:
+    python -m benchmarks.import_time [--runs 5] [--top 15] [--json saida.json] [--compare base.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = "LTIP_Laboratory_Webapp_app"
+SCENARIOS = {
+    "import": f"import {MODULE}",
+    "boot": f"import {MODULE}; {MODULE}.create_app()",
+    "kiosk": f"import {MODULE}; {MODULE}.create_app(blueprints=('inventory', 'machines', 'reports'))",
+}
+
+
+def parse_importtime(stderr, max_depth=2):
+    """Devolve {módulo: cumulativo_us} dos imports até max_depth níveis de profundidade.
+
+    Nível 0 são os imports do próprio -c (o ponto de entrada e o que o interpretador
+    carrega); os níveis seguintes mostram o pacote ltip e suas dependências
+    (flask, flask_sqlalchemy...).
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            cumulative = int(cumulative)
+        except ValueError:
+            continue  # cabeçalho
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= max_depth:
+            modules[name.strip()] = modules.get(name.strip(), 0) + cumulative
+    return modules
+
+
+def measure(code):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    return wall_ms, parse_importtime(proc.stderr, max_depth=0), parse_importtime(proc.stderr)
+
+
+def run(runs, top):
+    results = {"python": sys.version.split()[0], "runs": runs, "scenarios": {}}
+    for name, code in SCENARIOS.items():
+        measure(code)  # aquecimento: gera .pyc e cache do sistema de arquivos
+        walls, imports = [], []
+        modules = {}
+        for _ in range(runs):
+            wall_ms, top_level, mods = measure(code)
+            walls.append(wall_ms)
+            imports.append(sum(top_level.values()) / 1000)
+            for mod, us in mods.items():
+                modules.setdefault(mod, []).append(us)
+        heaviest = sorted(((statistics.median(v) / 1000, m) for m, v in modules.items()), reverse=True)[:top]
+        results["scenarios"][name] = {
+            "wall_ms_median": round(statistics.median(walls), 1),
+            "import_ms_median": round(statistics.median(imports), 1),
+            "top_modules_ms": {m: round(ms, 1) for ms, m in heaviest},
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="grava o resultado neste arquivo")
+    parser.add_argument("--compare", help="resultado anterior (JSON) para comparar")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.top)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+
+    for name, r in results["scenarios"].items():
+        line = f"{name:6s} processo={r['wall_ms_median']} ms imports={r['import_ms_median']} ms"
+        if baseline and name in baseline.get("scenarios", {}):
+            before = baseline["scenarios"][name]["import_ms_median"]
+            line += f" (antes {before} ms, {r['import_ms_median'] - before:+.1f} ms)"
+        print(line)
+        for mod, ms in r["top_modules_ms"].items():
+            print(f"    {ms:8.1f} ms  {mod}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Driver de carga HTTP local: mede vazão e percentis de latência de um servidor
+do LTIP com uma mistura ponderada de páginas de leitura.
+
+O servidor pode já estar rodando (--base-url) ou ser iniciado pelo driver
+(--start-server), com gunicorn se instalado ou com o servidor do Flask. Rode
+uma vez com SQLite e outra com PostgreSQL local para comparar:
+
+    python -m benchmarks.load --start-server --database-url sqlite:////tmp/bench.db
+    python -m benchmarks.load --start-server --database-url postgresql://localhost/ltip_bench
+
+Cada execução grava benchmarks/results/<commit>-load-<banco>.json (ver benchmarks.compare).
+"""
+
+import argparse
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from benchmarks._common import ROOT, database_dialect, metadata, save_results, summarize_ms
+
+# rótulo -> (peso, gerador de caminho)
+DEFAULT_MIX = {
+    "/inventory": (30, lambda rng, ids: "/inventory"),
+    "/machines": (25, lambda rng, ids: "/machines"),
+    "/reports": (10, lambda rng, ids: "/reports"),
+    "/inventory/summary": (5, lambda rng, ids: "/inventory/summary" + rng.choice(["", "?by=localizacao", "?by=marca"])),
+    "/inventory?q=": (10, lambda rng, ids: "/inventory?q=" + quote(rng.choice(["Dell", "Sala 10", "Projetor", "UF12"]))),
+    "/reports?q=": (10, lambda rng, ids: "/reports?q=" + quote(rng.choice(["formatacao", "backup", "licenca"]))),
+    "/equipment/<id>": (10, lambda rng, ids: f"/equipment/{rng.randint(*ids)}"),
+    "/machine/<id>": (5, lambda rng, ids: f"/machine/{rng.randint(*ids)}"),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url, workers):
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, SECRET_KEY=os.environ.get("SECRET_KEY", "benchmark"))
+    target = "LTIP_Laboratory_Webapp_app:create_app()"
+    try:
+        import gunicorn  # noqa: F401
+        cmd = [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", target]
+    except ImportError:
+        cmd = [sys.executable, "-m", "flask", "--app", target, "run", "--port", str(port), "--with-threads"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return proc, base_url
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Servidor não respondeu em 30 s")
+
+
+def worker(base, mix, ids, deadline, seed, out):
+    rng = random.Random(seed)
+    labels = list(mix)
+    weights = [mix[label][0] for label in labels]
+    conn = http.client.HTTPConnection(base.hostname, base.port, timeout=60)
+    while time.perf_counter() < deadline:
+        label = rng.choices(labels, weights)[0]
+        path = mix[label][1](rng, ids)
+        t0 = time.perf_counter()
+        status = 0
+        for _ in range(2):  # uma nova tentativa se o servidor fechou a conexão keep-alive
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+                break
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(base.hostname, base.port, timeout=60)
+                t0 = time.perf_counter()
+        out.append((label, status, time.perf_counter() - t0))
+    conn.close()
+
+
+def run(base_url, concurrency, duration, ids, warmup):
+    base = urlsplit(base_url)
+    if warmup:
+        worker(base, DEFAULT_MIX, ids, time.perf_counter() + warmup, 0, [])
+
+    samples = []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=worker, args=(base, DEFAULT_MIX, ids, deadline, n + 1, samples))
+               for n in range(concurrency)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+
+    ok = [s for s in samples if 200 <= s[1] < 400]
+    results = {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "throughput_rps": round(len(ok) / elapsed, 2),
+        "latency": summarize_ms([s[2] for s in ok]),
+        "cases": {},
+    }
+    for label in DEFAULT_MIX:
+        latencies = [s[2] for s in ok if s[0] == label]
+        if latencies:
+            results["cases"][label] = summarize_ms(latencies)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--start-server", action="store_true", help="inicia o servidor com --database-url")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", ""))
+    parser.add_argument("--workers", type=int, default=2, help="workers do gunicorn (--start-server)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30, help="segundos de medição")
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--ids", default="1-1000", help="faixa de ids para as páginas de detalhe")
+    parser.add_argument("--json", help="arquivo de saída")
+    args = parser.parse_args()
+
+    ids = tuple(int(n) for n in args.ids.split("-", 1))
+    proc = None
+    base_url = args.base_url
+    if args.start_server:
+        if not args.database_url:
+            parser.error("--start-server requer --database-url (ou DATABASE_URL)")
+        proc, base_url = start_server(args.database_url, args.workers)
+    try:
+        results = run(base_url, args.concurrency, args.duration, ids, args.warmup)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    dialect = database_dialect(args.database_url) if args.database_url else "remoto"
+    results["meta"] = metadata(base_url=base_url, database=dialect, concurrency=args.concurrency,
+                               duration_s=args.duration, workers=args.workers if proc else None)
+    lat = results["latency"]
+    print(f"{results['requests']} requisições, {results['errors']} erros, {results['throughput_rps']} req/s")
+    print(f"latência: p50={lat['p50_ms']} ms p90={lat['p90_ms']} ms p99={lat['p99_ms']} ms")
+    for label, summary in results["cases"].items():
+        print(f"  {label:18s} n={summary['count']:6d} p50={summary['p50_ms']:9.2f} ms p99={summary['p99_ms']:9.2f} ms")
+    print("Resultado gravado em", save_results(f"load-{dialect}", results, args.json))
+
+
+if __name__ == "__main__":
+    main()
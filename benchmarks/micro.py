@@ -0,0 +1,123 @@
+"""
+Micro-benchmarks em processo (Flask test client, sem rede) dos caminhos quentes:
+ - search: buscas em /inventory, /machines e /reports
+ - render: listagens completas, resumo do inventário e páginas de detalhe
+ - upload: cadastro de equipamento com imagem e envio de relatório
+ - download: download de relatório original e comprimido
+
+Rode contra um banco populado por benchmarks.seed (os uploads gravam linhas novas).
+
+Uso:
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.micro [--repeat 20] [--cases search,render]
+"""
+
+import argparse
+import io
+import time
+
+from benchmarks._common import metadata, save_results, summarize_ms
+from benchmarks.seed import pdf_bytes, png_bytes
+
+ADMIN = {"username": "rendeiro123", "password": "admLTIP2025"}
+
+
+def build_cases(db, models):
+    Equipment, Machine, Report = models.Equipment, models.Machine, models.Report
+    eq_id = db.session.query(db.func.min(Equipment.id)).scalar()
+    machine_id = db.session.query(db.func.min(Machine.id)).scalar()
+    raw = Report.query.filter(Report.storage_encoding.is_(None)).first()
+    packed = Report.query.filter(Report.storage_encoding.isnot(None)).first()
+    image = png_bytes(160, 120, (10, 80, 160))
+    pdf = pdf_bytes(["Relatório de benchmark", "formatação das máquinas da sala 101"])
+
+    def get(url, **kwargs):
+        return lambda client: client.get(url, **kwargs)
+
+    cases = {
+        "search": {
+            "inventory?q=Dell": get("/inventory?q=Dell"),
+            "machines?q=Ubuntu": get("/machines?q=Ubuntu"),
+            "reports?q=formatacao": get("/reports?q=formatacao"),
+        },
+        "render": {
+            "index": get("/"),
+            "inventory": get("/inventory"),
+            "inventory/summary": get("/inventory/summary"),
+            "inventory/summary?by=marca": get("/inventory/summary?by=marca"),
+            "machines": get("/machines"),
+            "reports": get("/reports"),
+        },
+        "upload": {
+            "equipment/add+imagem": lambda client: client.post("/equipment/add", data={
+                "name": "Equipamento benchmark", "quantidade": "1",
+                "imagem": (io.BytesIO(image), "bench.png")}, content_type="multipart/form-data"),
+            "reports/upload": lambda client: client.post("/reports/upload", data={
+                "title": "Relatório benchmark",
+                "report_file": (io.BytesIO(pdf), "bench.pdf")}, content_type="multipart/form-data"),
+        },
+        "download": {},
+    }
+    if eq_id:
+        cases["render"][f"equipment/{eq_id}"] = get(f"/equipment/{eq_id}")
+    if machine_id:
+        cases["render"][f"machine/{machine_id}"] = get(f"/machine/{machine_id}")
+    if raw:
+        cases["download"]["report (original)"] = get(f"/reports/download/{raw.id}")
+    if packed:
+        cases["download"]["report (gzip, cliente aceita)"] = get(
+            f"/reports/download/{packed.id}", headers={"Accept-Encoding": "gzip"})
+        cases["download"]["report (gzip, descomprime)"] = get(f"/reports/download/{packed.id}")
+        cases["download"]["report (gzip, Range)"] = get(
+            f"/reports/download/{packed.id}", headers={"Range": "bytes=1000-1999"})
+    return cases
+
+
+def run(groups, repeat, warmup):
+    from ltip import create_app, models
+    from ltip.extensions import db
+
+    app = create_app()
+    client = app.test_client()
+    with app.app_context():
+        cases = build_cases(db, models)
+        rows = {"equipment": db.session.query(db.func.count(models.Equipment.id)).scalar(),
+                "machine": db.session.query(db.func.count(models.Machine.id)).scalar(),
+                "report": db.session.query(db.func.count(models.Report.id)).scalar()}
+    client.post("/login", data=ADMIN)
+
+    results = {"meta": metadata(rows=rows, repeat=repeat), "cases": {}}
+    for group in groups:
+        for name, call in cases[group].items():
+            for _ in range(warmup):
+                call(client)
+            samples, size = [], 0
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                response = call(client)
+                body = response.get_data()
+                samples.append(time.perf_counter() - t0)
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{name}: HTTP {response.status_code}")
+                size = len(body)
+            summary = summarize_ms(samples)
+            summary["bytes"] = size
+            results["cases"][f"{group}/{name}"] = summary
+            print(f"{group + '/' + name:45s} p50={summary['p50_ms']:9.2f} ms "
+                  f"p90={summary['p90_ms']:9.2f} ms  {size} bytes")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default="search,render,upload,download")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--json", help="arquivo de saída (padrão: benchmarks/results/<commit>-micro.json)")
+    args = parser.parse_args()
+
+    results = run(args.cases.split(","), args.repeat, args.warmup)
+    print("Resultado gravado em", save_results("micro", results, args.json))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark do armazenamento comprimido de relatórios.
+
+Gera relatórios sintéticos (texto de PDF, fluxos já comprimidos simulando
+imagens e DOCX), comprime com cada codificação disponível e mede:
+ - ocupação em disco (original x comprimido)
+ - vazão de compressão (upload) e de descompressão em streaming (download)
+ - latência de uma leitura Range no meio do arquivo
+
+Uso:
+    python -m benchmarks.report_storage [--files 20] [--size-mb 4] [--json saida.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import zlib
+
+from ltip.report_storage import STORAGE_SUFFIXES, compress_file, open_compressed
+
+WORDS = (
+    "formatação máquina laboratório relatório licença sistema operacional limpeza "
+    "inventário equipamento tombo patrimônio bolsista coordenador manutenção rede"
+).split()
+
+
+def synthetic_report(size, rng):
+    """Mistura ~70% de páginas de texto (compressível) e ~30% de blocos já comprimidos (imagens)."""
+    out = bytearray(b"%PDF-1.7\n")
+    while len(out) < size:
+        if rng.random() < 0.7:
+            for _ in range(40):
+                line = " ".join(rng.choice(WORDS) for _ in range(12))
+                out += f"BT /F1 11 Tf ({line}) Tj ET\n".encode("utf-8")
+        else:
+            out += b"stream\n" + zlib.compress(rng.randbytes(4096)) + b"\nendstream\n"
+    return bytes(out[:size])
+
+
+def available_encodings():
+    encodings = ["gzip"]
+    try:
+        import zstandard  # noqa: F401
+        encodings.append("zstd")
+    except ImportError:
+        pass
+    return encodings
+
+
+def run(files, size, seed=42):
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix="ltip-bench-")
+    try:
+        originals = []
+        for i in range(files):
+            path = os.path.join(workdir, f"relatorio_{i}.pdf")
+            with open(path, "wb") as fh:
+                fh.write(synthetic_report(size, rng))
+            originals.append(path)
+        total = files * size
+        results = {"files": files, "file_size": size, "original_bytes": total, "encodings": {}}
+
+        for encoding in available_encodings():
+            copies = []
+            for path in originals:
+                copy = path + f".{encoding}.pdf"
+                shutil.copyfile(path, copy)
+                copies.append(copy)
+
+            t0 = time.perf_counter()
+            used = [compress_file(copy, encoding, min_saving=0) for copy in copies]
+            compress_s = time.perf_counter() - t0
+            stored = [copy + STORAGE_SUFFIXES[encoding] for copy in copies]
+            disk = sum(os.path.getsize(p) for p in stored)
+
+            t0 = time.perf_counter()
+            for path, enc in zip(stored, used):
+                with open_compressed(path, enc) as fh:
+                    while fh.read(64 * 1024):
+                        pass
+            stream_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for path, enc in zip(stored, used):
+                with open_compressed(path, enc) as fh:
+                    fh.seek(size // 2)
+                    fh.read(64 * 1024)
+            range_ms = (time.perf_counter() - t0) * 1000 / files
+
+            results["encodings"][encoding] = {
+                "disk_bytes": disk,
+                "ratio": round(disk / total, 4),
+                "compress_mb_s": round(total / compress_s / 1e6, 1),
+                "stream_mb_s": round(total / stream_s / 1e6, 1),
+                "mid_range_read_ms": round(range_ms, 2),
+            }
+            for path in stored:
+                os.remove(path)
+
+        t0 = time.perf_counter()
+        for path in originals:
+            with open(path, "rb") as fh:
+                while fh.read(64 * 1024):
+                    pass
+        results["raw_stream_mb_s"] = round(total / (time.perf_counter() - t0) / 1e6, 1)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--json", help="grava o resultado neste arquivo")
+    args = parser.parse_args()
+
+    results = run(args.files, int(args.size_mb * 1024 * 1024))
+    print(f"{results['files']} arquivos de {results['file_size']} bytes "
+          f"({results['original_bytes']} bytes, leitura direta {results['raw_stream_mb_s']} MB/s)")
+    for encoding, r in results["encodings"].items():
+        print(f"  {encoding:5s} disco={r['disk_bytes']} ({r['ratio']:.1%}) "
+              f"compressão={r['compress_mb_s']} MB/s streaming={r['stream_mb_s']} MB/s "
+              f"range@meio={r['mid_range_read_ms']} ms")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Gerador de inventário sintético para benchmarks.
+
+Cria equipamentos, máquinas e relatórios realistas em lote (INSERT em lotes
+de --batch linhas), além de um pequeno conjunto de imagens PNG e PDFs válidos
+em uploads/ que as linhas reutilizam em rodízio. Metade dos relatórios aponta
+para arquivos gzip, como os gravados pelo app. As máquinas são ligadas ao
+catálogo de softwares e licenças (como faz a migração do catálogo) e, como o
+INSERT em lote não passa pelo listener do ORM, equipment_summary é recalculado
+no final. Com
+--report-text também preenche report_text (e, por trigger, o índice FTS)
+com texto sintético.
+As linhas vão para o laboratório --lab (padrão: DEFAULT_LAB).
+
+Use um banco dedicado: DATABASE_URL decide onde os dados são gravados.
+
+Uso:
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.seed --size 100k
+    DATABASE_URL=postgresql://localhost/ltip_bench python -m benchmarks.seed --size 1m
+"""
+
+import argparse
+import os
+import random
+import struct
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
+
+from ltip.report_storage import compress_file
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+FIXTURE_COUNT = 16
+
+EQUIPAMENTOS = ["Osciloscópio", "Multímetro", "Projetor", "Roteador", "Switch 24 portas", "Nobreak",
+                "Impressora 3D", "Monitor 24\"", "Câmera IP", "Estação de solda", "Fonte de bancada",
+                "Access point", "Kit Arduino", "Raspberry Pi 4", "Scanner", "Tablet"]
+MARCAS = ["Dell", "Lenovo", "HP", "Positivo", "Asus", "Acer", "Epson", "TP-Link", "Intelbras",
+          "Cisco", "Samsung", "LG", "Minipa", "Tektronix", "APC"]
+LOCAIS = [f"Sala {n}" for n in range(101, 121)] + ["Almoxarifado", "Laboratório 1", "Laboratório 2", "Auditório"]
+FINALIDADES = ["Aulas práticas", "Pesquisa", "Administrativo", "Manutenção", "Eventos", "Extensão"]
+STATUS_MAQUINA = ["Formatado", "Não formatado", "Em andamento"]
+SISTEMAS = ["Windows 10 Pro", "Windows 11 Pro", "Ubuntu 22.04 LTS", "Ubuntu 24.04 LTS", "Debian 12"]
+SOFTWARES = ["LibreOffice", "Office 365", "QGIS", "AutoCAD", "R", "RStudio", "Python 3", "VS Code",
+             "Chrome", "Firefox", "MATLAB", "ArcGIS Pro", "7-Zip", "GIMP", "Inkscape"]
+LICENCAS = ["Windows 11 Educação", "Office 365 A3", "AutoCAD Educacional", "MATLAB Campus",
+            "ArcGIS Pro Named User", "Livre/GPL"]
+RESPONSAVEIS = ["Arthur", "Bolsista 1", "Bolsista 2", "Técnico TI", "Coordenação"]
+PALAVRAS = ("formatação limpeza máquina laboratório relatório licença sistema inventário equipamento "
+            "tombo patrimônio manutenção rede backup atualização driver impressora projetor sala").split()
+
+
+# ------------- Fixtures (imagens e PDFs) -------------
+def png_bytes(width, height, rgb):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    raw = b"".join(b"\x00" + bytes(rgb) * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def pdf_bytes(lines):
+    """PDF mínimo e válido (uma página de texto), legível pelo pypdf."""
+    content = "BT /F1 11 Tf 40 800 Td 14 TL " + " ".join(
+        "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '" for line in lines
+    ) + " ET"
+    content = content.encode("latin-1", errors="replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{off:010d} 00000 n \n".encode() for off in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def write_fixtures(upload_folder, rng):
+    """Grava as fixtures uma única vez; devolve (imagens, [(arquivo, codificação, tamanho)])."""
+    images, reports = [], []
+    for i in range(FIXTURE_COUNT):
+        name = f"bench_img_{i:02d}.png"
+        path = os.path.join(upload_folder, name)
+        if not os.path.exists(path):
+            with open(path, "wb") as fh:
+                fh.write(png_bytes(160, 120, (rng.randrange(256), rng.randrange(256), rng.randrange(256))))
+        images.append(name)
+
+        name = f"bench_relatorio_{i:02d}.pdf"
+        encoding = "gzip" if i % 2 else None
+        stored = os.path.join(upload_folder, name + (".gz" if encoding else ""))
+        if not os.path.exists(stored):
+            lines = [" ".join(rng.choice(PALAVRAS) for _ in range(10)) for _ in range(50)]
+            data = pdf_bytes(lines)
+            with open(os.path.join(upload_folder, name), "wb") as fh:
+                fh.write(data)
+            if encoding:
+                compress_file(os.path.join(upload_folder, name), encoding, min_saving=0)
+        reports.append((name, encoding, original_size(stored, encoding)))
+    return images, reports
+
+
+def original_size(path, encoding):
+    if encoding == "gzip":
+        with open(path, "rb") as fh:
+            fh.seek(-4, os.SEEK_END)
+            return struct.unpack("<I", fh.read(4))[0]  # ISIZE do trailer gzip
+    return os.path.getsize(path)
+
+
+# ------------- Linhas sintéticas -------------
+def random_date(rng, days=720):
+    return date.today() - timedelta(days=rng.randrange(days))
+
+
+def equipment_rows(start, count, rng, images, lab_id):
+    for i in range(start, start + count):
+        yield {
+            "lab_id": lab_id,
+            "name": f"{rng.choice(EQUIPAMENTOS)} {i}",
+            "tombo": f"UF{rng.randrange(10**6, 10**7)}",
+            "quantidade": rng.choice([1, 1, 1, 2, 3, 5, 10]),
+            "modelo": f"M-{rng.randrange(100, 9999)}",
+            "marca": rng.choice(MARCAS),
+            "finalidade": rng.choice(FINALIDADES),
+            "status": rng.choice(["Em uso", "Disponível", "Em manutenção"]),
+            "localizacao": rng.choice(LOCAIS),
+            "descricao": None,
+            "imagem_filename": rng.choice(images) if rng.random() < 0.3 else None,
+            "created_at": datetime.now(timezone.utc) - timedelta(minutes=rng.randrange(10**6)),
+        }
+
+
+def machine_rows(start, count, rng, images, lab_id):
+    for i in range(start, start + count):
+        tipo = rng.choice(["COMPUTADOR", "NOTEBOOK"])
+        yield {
+            "lab_id": lab_id,
+            "name": f"{'PC' if tipo == 'COMPUTADOR' else 'NB'} {i:06d}",
+            "status": rng.choice(STATUS_MAQUINA),
+            "tipo": tipo,
+            "marca": rng.choice(MARCAS),
+            "modelo": f"{rng.choice(['OptiPlex', 'ThinkCentre', 'ProDesk', 'Vostro', 'IdeaPad'])} {rng.randrange(3000, 7999)}",
+            "numero_serie": f"BENCH-{i:08d}",
+            "sistema_operacional": rng.choice(SISTEMAS),
+            "softwares_instalados": ", ".join(rng.sample(SOFTWARES, rng.randrange(2, 7))),
+            "licencas": ", ".join(rng.sample(LICENCAS, rng.randrange(1, 3))),
+            "limpeza_fisica_data": random_date(rng) if rng.random() < 0.8 else None,
+            "ultima_formatacao_data": random_date(rng) if rng.random() < 0.8 else None,
+            "responsavel_formatacao": rng.choice(RESPONSAVEIS),
+            "imagem_filename": rng.choice(images) if rng.random() < 0.2 else None,
+        }
+
+
+def report_rows(start, count, rng, fixtures, lab_id):
+    for i in range(start, start + count):
+        filename, encoding, size = fixtures[i % len(fixtures)]
+        yield {
+            "lab_id": lab_id,
+            "title": f"Relatório {rng.choice(['mensal', 'de manutenção', 'de formatação', 'de inventário'])} {i}",
+            "filename": filename,
+            "uploaded_at": datetime.now(timezone.utc) - timedelta(hours=rng.randrange(10**5)),
+            "storage_encoding": encoding,
+            "original_size": size,
+        }
+
+
+def insert_batches(db, model, rows, total, batch):
+    from sqlalchemy import insert
+
+    done, buffer = 0, []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) >= batch:
+            db.session.execute(insert(model), buffer)
+            db.session.commit()
+            done += len(buffer)
+            buffer = []
+            print(f"\r  {model.__tablename__}: {done}/{total}", end="", flush=True)
+    if buffer:
+        db.session.execute(insert(model), buffer)
+        db.session.commit()
+        done += len(buffer)
+    print(f"\r  {model.__tablename__}: {done}/{total}")
+
+
+def load_catalog(db, first_id, batch):
+    """Liga as máquinas com id >= first_id ao catálogo, em faixas de batch ids.
+
+    Mesmo passo da migração do catálogo: divide os campos de texto com as regras de
+    ltip/catalog.py, cria as entradas (e palavras) que faltam e grava as ligações.
+    """
+    from sqlalchemy import insert
+
+    from ltip.catalog import WORD_TABLES, name_words, split_names
+    from ltip.models import License, Machine, Software, machine_license, machine_software
+
+    last_id = db.session.query(db.func.max(Machine.id)).scalar() or 0
+    for column, model, association, fk in (
+        (Machine.softwares_instalados, Software, machine_software, "software_id"),
+        (Machine.licencas, License, machine_license, "license_id"),
+    ):
+        ids = dict(db.session.query(model.name_key, model.id))
+        word_table, _ = WORD_TABLES[model]
+        done = 0
+        for lo in range(first_id, last_id + 1, batch):
+            machines = [(machine_id, split_names(text)) for machine_id, text in db.session.query(Machine.id, column)
+                        .filter(Machine.id >= lo, Machine.id < lo + batch)]
+            new = {key: name for _, names in machines for key, name in names.items() if key not in ids}
+            if new:
+                db.session.execute(insert(model), [{"name": name, "name_key": key} for key, name in new.items()])
+                ids.update(db.session.query(model.name_key, model.id).filter(model.name_key.in_(list(new))))
+                db.session.execute(insert(word_table), [
+                    {fk: ids[key], "word": word} for key in new for word in name_words(key)])
+            links = [{"machine_id": machine_id, fk: ids[key]} for machine_id, names in machines for key in names]
+            if links:
+                db.session.execute(insert(association), links)
+            db.session.commit()
+            done += len(links)
+        print(f"  {association.name}: {done}")
+
+
+def seed(size, tables, batch=5000, seed_value=1234, report_text=True, lab=None):
+    from flask import current_app
+    from flask_migrate import upgrade
+
+    from ltip.commands import init_db_and_create_default_users
+    from ltip.config import DEFAULT_LAB
+    from ltip.equipment_summary import rebuild_equipment_summary
+    from ltip.extensions import db
+    from ltip.models import Equipment, Lab, Machine, Report, ReportText
+
+    rng = random.Random(seed_value)
+    upgrade()  # garante o esquema (inclusive FTS/tsvector) antes de inserir
+    init_db_and_create_default_users()
+    lab_row = Lab.query.filter_by(slug=lab or DEFAULT_LAB).first()
+    if lab_row is None:
+        raise SystemExit(f"Laboratório inexistente: {lab or DEFAULT_LAB} (veja flask labs create).")
+    lab_id = lab_row.id
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    images, fixtures = write_fixtures(upload_folder, rng)
+
+    count = SIZES[size]
+    t0 = time.perf_counter()
+    if "equipment" in tables:
+        start = db.session.query(db.func.count(Equipment.id)).scalar()
+        insert_batches(db, Equipment, equipment_rows(start, count, rng, images, lab_id), count, batch)
+        groups, _ = rebuild_equipment_summary()
+        print(f"  equipment_summary: {groups} grupo(s)")
+    if "machines" in tables:
+        start = db.session.query(db.func.count(Machine.id)).scalar()
+        first_id = (db.session.query(db.func.max(Machine.id)).scalar() or 0) + 1
+        insert_batches(db, Machine, machine_rows(start, count, rng, images, lab_id), count, batch)
+        load_catalog(db, first_id, batch)
+    if "reports" in tables:
+        start_id = (db.session.query(db.func.max(Report.id)).scalar() or 0) + 1
+        start = db.session.query(db.func.count(Report.id)).scalar()
+        insert_batches(db, Report, report_rows(start, count, rng, fixtures, lab_id), count, batch)
+        if report_text:
+            texts = ({
+                "report_id": start_id + n,
+                "title": f"Relatório {start + n}",
+                "body": " ".join(rng.choice(PALAVRAS) for _ in range(60)),
+                "source_filename": fixtures[(start + n) % len(fixtures)][0],
+                "indexed_at": datetime.now(timezone.utc),
+            } for n in range(count))
+            insert_batches(db, ReportText, texts, count, batch)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="1k", help="linhas por tabela")
+    parser.add_argument("--tables", default="equipment,machines,reports")
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-report-text", action="store_true", help="não preenche report_text/FTS")
+    parser.add_argument("--lab", help="slug do laboratório que recebe as linhas (padrão: DEFAULT_LAB)")
+    args = parser.parse_args()
+
+    from ltip import create_app
+
+    app = create_app(with_migrations=True)
+    with app.app_context():
+        elapsed = seed(args.size, set(args.tables.split(",")), args.batch, args.seed, not args.no_report_text,
+                       args.lab)
+    print(f"Concluído em {elapsed:.1f} s ({app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}).")
+
+
+if __name__ == "__main__":
+    main()
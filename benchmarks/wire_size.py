@@ -0,0 +1,126 @@
+"""
+Bytes na rede por visualização de página (padrão: /inventory).
+
+Para cada Accept-Encoding (identity, gzip, br) mede:
+ - primeira visita: HTML + folhas de estilo referenciadas (<link rel="stylesheet">)
+ - visitas seguintes: só o HTML, pois o CSS com hash no nome fica no cache do navegador
+
+O cenário "antes" reconstrói a página anterior à extração do CSS: o mesmo HTML sem
+compressão com a folha de estilo embutida num <style>, enviada de novo a cada visita.
+Com --base-url mede um servidor já rodando (por exemplo, um commit anterior), sem
+reconstrução.
+
+Uso:
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.wire_size [--path /inventory]
+    python -m benchmarks.wire_size --base-url http://127.0.0.1:5000
+"""
+
+import argparse
+import http.client
+import re
+from urllib.parse import urlsplit
+
+from benchmarks._common import metadata, save_results
+
+ENCODINGS = ["identity", "gzip", "br"]
+STYLESHEET_RE = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+
+
+def in_process_fetcher():
+    from ltip import create_app
+
+    client = create_app().test_client()
+
+    def fetch(path, encoding):
+        response = client.get(path, headers={"Accept-Encoding": encoding})
+        return response.status_code, response.headers.get("Content-Encoding"), response.get_data()
+    return fetch
+
+
+def http_fetcher(base_url):
+    parts = urlsplit(base_url)
+
+    def fetch(path, encoding):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        try:
+            conn.request("GET", path, headers={"Accept-Encoding": encoding})
+            response = conn.getresponse()
+            return response.status, response.getheader("Content-Encoding"), response.read()
+        finally:
+            conn.close()
+    return fetch
+
+
+def decoded(body, content_encoding):
+    if content_encoding == "gzip":
+        import gzip
+        return gzip.decompress(body)
+    if content_encoding == "br":
+        import brotli
+        return brotli.decompress(body)
+    return body
+
+
+def measure(fetch, path, encoding):
+    status, content_encoding, body = fetch(path, encoding)
+    if status != 200:
+        raise RuntimeError(f"{path}: HTTP {status}")
+    html = decoded(body, content_encoding).decode("utf-8")
+    css_bytes = 0
+    for href in STYLESHEET_RE.findall(html):
+        css_status, _, css_body = fetch(href, encoding)
+        if css_status != 200:
+            raise RuntimeError(f"{href}: HTTP {css_status}")
+        css_bytes += len(css_body)
+    return {
+        "content_encoding": content_encoding or "identity",
+        "html_bytes": len(body),
+        "css_bytes": css_bytes,
+        "first_view_bytes": len(body) + css_bytes,
+        "repeat_view_bytes": len(body),
+    }, html
+
+
+def inline_baseline(fetch, html):
+    """Página com o CSS embutido e sem compressão, como antes: mesmo tamanho em toda visita."""
+    page = html
+    for href in STYLESHEET_RE.findall(html):
+        css = fetch(href, "identity")[2].decode("utf-8")
+        page = page.replace(f'<link rel="stylesheet" href="{href}">', f"<style>\n{css}</style>")
+    size = len(page.encode("utf-8"))
+    return {"content_encoding": "identity", "html_bytes": size, "css_bytes": 0,
+            "first_view_bytes": size, "repeat_view_bytes": size}
+
+
+def run(fetch, path):
+    cases = {}
+    html = None
+    for encoding in ENCODINGS:
+        cases[encoding], page = measure(fetch, path, encoding)
+        if encoding == "identity":
+            html = page
+    return cases, html
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/inventory")
+    parser.add_argument("--base-url", help="mede um servidor já rodando em vez do app em processo")
+    parser.add_argument("--json", help="arquivo de saída (padrão: benchmarks/results/<commit>-wire_size.json)")
+    args = parser.parse_args()
+
+    fetch = http_fetcher(args.base_url) if args.base_url else in_process_fetcher()
+    cases, html = run(fetch, args.path)
+    if not args.base_url:
+        cases = {"antes (CSS embutido)": inline_baseline(fetch, html), **cases}
+
+    print(f"{'cenário':24s} {'codificação':>12s} {'HTML':>8s} {'CSS':>8s} {'1ª visita':>10s} {'seguintes':>10s}")
+    for name, case in cases.items():
+        print(f"{name:24s} {case['content_encoding']:>12s} {case['html_bytes']:8d} {case['css_bytes']:8d} "
+              f"{case['first_view_bytes']:10d} {case['repeat_view_bytes']:10d}")
+    results = {"meta": metadata(path=args.path, base_url=args.base_url), "cases": cases}
+    print("Resultado gravado em", save_results("wire_size", results, args.json))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Configuração do gunicorn, lida automaticamente quando ele é iniciado na raiz do projeto."""
+
+import os
+
+# Workers gevent: cada conexão SSE ociosa de /machines/events custa uma greenlet, não uma thread
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+
+def post_fork(server, worker):
+    # Com gevent, o psycopg2 precisa do psycogreen para não bloquear o worker inteiro nas consultas
+    if worker_class == "gevent":
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            return
+        patch_psycopg()
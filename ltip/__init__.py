@@ -0,0 +1,94 @@
+"""
+LTIP Laboratory Webapp - pacote da aplicação.
+
+Organização:
+ - config.py / extensions.py / models.py: configuração, SQLAlchemy e modelos
+ - labs.py: vários laboratórios (/lab/<slug> ou hostname) e filtro automático por laboratório
+ - blueprints/: inventory, machines, reports (listagens), auth e admin (formulários)
+ - views.py: página inicial e arquivos enviados (sempre registrados)
+ - storage.py: uploads em disco local ou S3 (URLs pré-assinadas, cache LRU em disco)
+ - ratelimit.py, report_storage.py, report_search.py, machine_events.py, inventory_sync.py,
+   equipment_summary.py: serviços usados pelos blueprints
+ - assets.py, compression.py: CSS com hash no nome (static/) e compressão das respostas
+ - backup.py: backup online do banco (flask backup e agendamento opcional)
+"""
+
+import click
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from .config import (
+    BACKUP_INTERVAL_HOURS, DATABASE_REPLICA_URLS, LTIP_BLUEPRINTS, SECRET_KEY, TRUSTED_PROXIES, UPLOAD_FOLDER, UPLOAD_STORAGE, database_uri,
+)
+from .extensions import db
+from .storage import make_storage
+
+
+def _running_under_flask_cli():
+    # Comandos "flask ..." carregam o app dentro de um contexto click; gunicorn não
+    return click.get_current_context(silent=True) is not None
+
+
+def create_app(config=None, with_migrations=None, blueprints=None):
+    """Cria e configura o app.
+
+    with_migrations=None liga o Flask-Migrate apenas na CLI; blueprints=None usa
+    LTIP_BLUEPRINTS (ex.: "kiosk" para workers somente leitura).
+    """
+    from . import compression, equipment_summary, labs
+    from .assets import register_assets
+    from .blueprints import parse_blueprints, register_blueprints
+    from .views import register_core_views
+
+    app = Flask(__name__, static_folder=None)
+    app.config["SECRET_KEY"] = SECRET_KEY
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+    app.config["UPLOAD_STORAGE"] = UPLOAD_STORAGE
+    app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024  # 10 MB por arquivo
+    app.config["DATABASE_REPLICA_URLS"] = DATABASE_REPLICA_URLS
+    app.config["BACKUP_INTERVAL_HOURS"] = BACKUP_INTERVAL_HOURS
+    if config:
+        app.config.update(config)
+
+    # Uploads em disco local ou num bucket S3 (ver storage.py)
+    app.extensions["ltip_storage"] = make_storage(app.config["UPLOAD_STORAGE"], app.config["UPLOAD_FOLDER"])
+    replica_binds = {f"replica{n}": url for n, url in enumerate(app.config["DATABASE_REPLICA_URLS"])}
+    if replica_binds:
+        app.config["SQLALCHEMY_BINDS"] = {**app.config.get("SQLALCHEMY_BINDS", {}), **replica_binds}
+    db.init_app(app)
+    labs.init_app(app)
+    equipment_summary.init_app(app)
+    if TRUSTED_PROXIES:
+        # Por fora do LabPathMiddleware; x_host: o laboratório é resolvido pelo Host original
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES, x_proto=TRUSTED_PROXIES, x_host=TRUSTED_PROXIES)
+    if replica_binds:
+        from . import replicas
+        replicas.init_app(app, list(replica_binds))
+    cli = _running_under_flask_cli()
+    if with_migrations is None:
+        with_migrations = cli
+    if with_migrations:
+        # Alembic é pesado e só é necessário para "flask db ..."
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    if app.config["BACKUP_INTERVAL_HOURS"] and not cli:
+        from .backup import start_scheduler
+        start_scheduler(app, app.config["BACKUP_INTERVAL_HOURS"])
+
+    if blueprints is None:
+        blueprints = parse_blueprints(LTIP_BLUEPRINTS)
+    register_core_views(app)
+    register_assets(app)
+    compression.init_app(app)
+    register_blueprints(app, blueprints)
+    # Templates escondem links para blueprints que este worker não registrou
+    app.jinja_env.globals["blueprint_enabled"] = lambda name: name in app.blueprints
+
+    if cli:
+        # Comandos de manutenção só fazem sentido na CLI
+        from .commands import COMMANDS
+        for command in COMMANDS:
+            app.cli.add_command(command)
+    return app
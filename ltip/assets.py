@@ -0,0 +1,83 @@
+"""Arquivos estáticos com impressão digital (hash do conteúdo no nome).
+
+Templates usam asset_url('ltip.css'), que gera /static/ltip.<hash>.css. Como o
+nome muda sempre que o conteúdo muda, a resposta pode ser cacheada pelo navegador
+por um ano sem revalidação (Cache-Control: immutable). As variantes gzip/brotli
+são comprimidas uma única vez, no nível máximo, quando o arquivo é carregado.
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import Response, abort, request, url_for
+
+from .compression import STATIC_LEVELS, compress_bytes, negotiate_encoding, supported_encodings
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+
+class StaticAsset:
+    def __init__(self, name, data):
+        self.name = name
+        self.digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        self.hashed_name = f"{stem}.{self.digest}{ext}"
+        self.mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.variants = {None: data}
+        for encoding in supported_encodings():
+            packed = compress_bytes(data, encoding, STATIC_LEVELS[encoding])
+            if len(packed) < len(data):
+                self.variants[encoding] = packed
+
+
+_assets = {}  # nome -> StaticAsset; nome com hash -> StaticAsset
+_lock = threading.Lock()
+
+
+def get_asset(name):
+    asset = _assets.get(name)
+    if asset is None:
+        path = os.path.join(STATIC_DIR, name)
+        if os.path.dirname(name) or not os.path.isfile(path):
+            return None
+        with open(path, "rb") as fh:
+            asset = StaticAsset(name, fh.read())
+        with _lock:
+            _assets[name] = asset
+            _assets[asset.hashed_name] = asset
+    return asset
+
+
+def asset_url(name):
+    asset = get_asset(name)
+    if asset is None:
+        raise ValueError(f"Arquivo estático inexistente: {name}")
+    return url_for("static", filename=asset.hashed_name)
+
+
+def static_file(filename):
+    # Só nomes com hash são servidos: um hash antigo (deploy anterior) dá 404 em vez
+    # de conteúdo novo preso no cache do navegador sob o nome velho
+    stem, _, ext = filename.rpartition(".")
+    asset = get_asset(stem.rpartition(".")[0] + "." + ext) if stem else None
+    if asset is None or asset.hashed_name != filename:
+        abort(404)
+    encoding = negotiate_encoding([e for e in asset.variants if e])
+    response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_MAX_AGE
+    response.cache_control.immutable = True
+    response.set_etag(asset.digest + (f"-{encoding}" if encoding else ""))
+    return response.make_conditional(request)
+
+
+def register_assets(app):
+    # Substitui a rota /static padrão do Flask (criado com static_folder=None)
+    app.add_url_rule("/static/<path:filename>", endpoint="static", view_func=static_file)
+    app.jinja_env.globals["asset_url"] = asset_url
@@ -0,0 +1,289 @@
+"""Backup online do banco, sem parar o app.
+
+SQLite: API de backup online (sqlite3.Connection.backup) em passos de
+BACKUP_SQLITE_PAGES páginas, com uma pausa entre eles; o banco só fica travado
+para escrita durante cada passo. Se outra conexão gravar no meio, o SQLite
+recomeça a cópia no passo seguinte, então o resultado é sempre um instantâneo
+consistente; depois de SQLITE_MAX_RESTARTS recomeços, a cópia é feita num passo só. PostgreSQL: a saída do pg_dump (formato custom) é lida em fluxo,
+sem arquivo intermediário descomprimido.
+
+Cada backup vira BACKUP_DIR/ltip-<data>.<sqlite3|dump>.gz com um arquivo .sha256
+ao lado (formato do sha256sum -c). Só os BACKUP_KEEP mais recentes são mantidos.
+verify_backup() confere o checksum e restaura a cópia num local temporário.
+"""
+
+import glob
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from .config import (
+    BACKUP_DIR, BACKUP_KEEP, BACKUP_SQLITE_PAGES, BACKUP_STEP_SLEEP, BACKUP_VERIFY_DATABASE_URL,
+)
+from .extensions import db
+
+BACKUP_PREFIX = "ltip-"
+COPY_CHUNK_SIZE = 1024 * 1024
+SQLITE_MAX_RESTARTS = 3
+
+
+class BackupError(RuntimeError):
+    pass
+
+
+class BackupInProgress(BackupError):
+    pass
+
+
+_local_lock = threading.Lock()  # sem fcntl (Windows): vale só dentro do processo
+
+
+@contextmanager
+def backup_lock(directory):
+    """Garante um backup por vez em directory, entre threads e processos (workers, CLI)."""
+    try:
+        import fcntl
+    except ImportError:
+        if not _local_lock.acquire(blocking=False):
+            raise BackupInProgress("Já existe um backup em andamento.")
+        try:
+            yield
+        finally:
+            _local_lock.release()
+        return
+    with open(os.path.join(directory, ".lock"), "a") as fh:
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise BackupInProgress("Já existe um backup em andamento.")
+        yield  # o lock é liberado ao fechar o arquivo
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _stepper():
+    state = {"remaining": None, "restarts": 0}
+
+    def progress(status, remaining, total):
+        # remaining subindo = o SQLite recomeçou a cópia porque o banco mudou
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > SQLITE_MAX_RESTARTS:
+                raise _TooManyRestarts()
+        state["remaining"] = remaining
+        # Com workers gevent, time.sleep entre os passos cede a vez às requisições
+        if remaining:
+            time.sleep(BACKUP_STEP_SLEEP)
+    return progress
+
+
+def _backup_sqlite(engine, out, directory):
+    source_path = engine.url.database
+    if not source_path or source_path == ":memory:":
+        raise BackupError("Banco SQLite em memória não tem backup.")
+    fd, raw_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        src = sqlite3.connect(source_path)
+        dst = sqlite3.connect(raw_path)
+        try:
+            try:
+                src.backup(dst, pages=BACKUP_SQLITE_PAGES, progress=_stepper())
+            except _TooManyRestarts:
+                # Escritas constantes: um passo só (trava as escritas pelo tempo da cópia)
+                src.backup(dst, pages=-1)
+        finally:
+            dst.close()
+            src.close()
+        with open(raw_path, "rb") as raw:
+            shutil.copyfileobj(raw, out, COPY_CHUNK_SIZE)
+    finally:
+        os.remove(raw_path)
+
+
+def _pg_command(url):
+    # Senha pelo ambiente, não na linha de comando (visível no ps)
+    env = dict(os.environ)
+    if url.password:
+        env["PGPASSWORD"] = url.password
+    dsn = url.set(drivername="postgresql", password=None).render_as_string(hide_password=False)
+    return dsn, env
+
+
+def _backup_postgresql(engine, out, directory):
+    dsn, env = _pg_command(engine.url)
+    with tempfile.TemporaryFile() as errors:
+        try:
+            proc = subprocess.Popen(
+                ["pg_dump", "--format=custom", "--compress=0", "--no-owner", f"--dbname={dsn}"],
+                stdout=subprocess.PIPE, stderr=errors, env=env,
+            )
+        except FileNotFoundError:
+            raise BackupError("pg_dump não encontrado no PATH.")
+        with proc:
+            shutil.copyfileobj(proc.stdout, out, COPY_CHUNK_SIZE)
+        if proc.returncode != 0:
+            errors.seek(0)
+            raise BackupError(f"pg_dump falhou: {errors.read().decode('utf-8', 'replace').strip()}")
+
+
+def list_backups(directory=BACKUP_DIR):
+    """Backups em directory, do mais antigo para o mais recente."""
+    return sorted(glob.glob(os.path.join(directory, BACKUP_PREFIX + "*.gz")))
+
+
+def _rotate(directory, keep):
+    for path in list_backups(directory)[:-keep] if keep > 0 else []:
+        for name in (path, path + ".sha256"):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+
+def backup_database(directory=BACKUP_DIR, keep=BACKUP_KEEP, min_age=None):
+    """Faz um backup do banco principal em directory. Devolve o caminho do .gz.
+
+    Com min_age (segundos), não faz nada e devolve None se o último backup for mais
+    novo que isso. Levanta BackupInProgress se outro backup estiver rodando.
+    Chamar num app context.
+    """
+    os.makedirs(directory, exist_ok=True)
+    engine = db.engine
+    kind = {"sqlite": "sqlite3", "postgresql": "dump"}.get(engine.dialect.name)
+    if kind is None:
+        raise BackupError(f"Backup não suportado para {engine.dialect.name}.")
+    with backup_lock(directory):
+        latest = latest_backup(directory)
+        if min_age and latest and time.time() - os.path.getmtime(latest) < min_age:
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(directory, f"{BACKUP_PREFIX}{stamp}.{kind}.gz")
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as fh, gzip.GzipFile(fileobj=fh, mode="wb", compresslevel=6) as out:
+                backup = _backup_sqlite if kind == "sqlite3" else _backup_postgresql
+                backup(engine, out, directory)
+            with open(path + ".sha256", "w", encoding="ascii") as fh:
+                fh.write(f"{_sha256(tmp)}  {os.path.basename(path)}\n")
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        _rotate(directory, keep)
+    return path
+
+
+def latest_backup(directory=BACKUP_DIR):
+    backups = list_backups(directory)
+    return backups[-1] if backups else None
+
+
+def _check_sha256(path):
+    try:
+        with open(path + ".sha256", encoding="ascii") as fh:
+            expected = fh.read().split()[0]
+    except (FileNotFoundError, IndexError):
+        raise BackupError(f"Checksum ausente: {path}.sha256")
+    if _sha256(path) != expected:
+        raise BackupError(f"Checksum não confere: {path}")
+
+
+def _verify_sqlite(restored):
+    conn = sqlite3.connect(restored)
+    try:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if result != "ok":
+            raise BackupError(f"integrity_check falhou: {result}")
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+
+
+def _run(command, env=None):
+    result = subprocess.run(command, capture_output=True, env=env)
+    if result.returncode != 0:
+        raise BackupError(f"{command[0]} falhou: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout.decode("utf-8", "replace")
+
+
+def _verify_postgresql(restored):
+    # Lê o arquivo inteiro (sumário e dados); a restauração completa exige um banco descartável
+    entries = sum(1 for line in _run(["pg_restore", "--list", restored]).splitlines()
+                  if line and not line.startswith(";"))
+    summary = {"entradas no arquivo": entries}
+    if BACKUP_VERIFY_DATABASE_URL:
+        from sqlalchemy import create_engine, inspect, text
+
+        engine = create_engine(BACKUP_VERIFY_DATABASE_URL)
+        try:
+            dsn, env = _pg_command(engine.url)
+            _run(["pg_restore", "--clean", "--if-exists", "--no-owner", "--exit-on-error",
+                  f"--dbname={dsn}", restored], env=env)
+            with engine.connect() as conn:
+                for table in inspect(conn).get_table_names():
+                    summary[table] = conn.execute(text(f'SELECT COUNT(*) FROM "{table}"')).scalar()
+        finally:
+            engine.dispose()
+    return summary
+
+
+def verify_backup(path):
+    """Confere o checksum e restaura o backup num local temporário.
+
+    Devolve {tabela: linhas} do banco restaurado; levanta BackupError se algo falhar.
+    """
+    _check_sha256(path)
+    with tempfile.TemporaryDirectory() as tmp:
+        restored = os.path.join(tmp, "restored")
+        try:
+            with gzip.open(path, "rb") as src, open(restored, "wb") as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        except (OSError, EOFError) as e:
+            raise BackupError(f"Arquivo corrompido: {e}")
+        if path.endswith(".sqlite3.gz"):
+            return _verify_sqlite(restored)
+        return _verify_postgresql(restored)
+
+
+# ------------- Backup periódico -------------
+def _scheduler(app, interval):
+    while True:
+        time.sleep(interval)
+        with app.app_context():
+            try:
+                # Vários workers rodam o agendador; quem chega depois vê o backup recente e desiste
+                path = backup_database(min_age=interval * 0.9)
+                if path:
+                    verify_backup(path)
+                    app.logger.info("Backup do banco gravado e verificado: %s", path)
+            except BackupInProgress:
+                pass
+            except Exception:
+                app.logger.exception("Falha no backup periódico do banco.")
+            finally:
+                db.session.remove()
+
+
+def start_scheduler(app, interval_hours):
+    threading.Thread(target=_scheduler, args=(app, interval_hours * 3600), name="db-backup", daemon=True).start()
@@ -0,0 +1,38 @@
+"""Registro dos blueprints.
+
+Cada blueprint só é importado se estiver habilitado, junto com seus templates.
+Workers "kiosk" (somente leitura) registram apenas as listagens:
+
+    LTIP_BLUEPRINTS=inventory,machines,reports gunicorn "LTIP_Laboratory_Webapp_app:create_app()"
+"""
+
+import importlib
+
+BLUEPRINTS = {
+    "inventory": "ltip.blueprints.inventory",
+    "machines": "ltip.blueprints.machines",
+    "reports": "ltip.blueprints.reports",
+    "auth": "ltip.blueprints.auth",
+    "admin": "ltip.blueprints.admin",
+}
+KIOSK_BLUEPRINTS = ("inventory", "machines", "reports")
+
+
+def parse_blueprints(spec):
+    """Converte "inventory,machines" (ou "kiosk"/"all") na lista de nomes."""
+    spec = (spec or "all").strip().lower()
+    if spec == "all":
+        return list(BLUEPRINTS)
+    if spec == "kiosk":
+        return list(KIOSK_BLUEPRINTS)
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BLUEPRINTS]
+    if unknown:
+        raise ValueError(f"Blueprint(s) desconhecido(s): {', '.join(unknown)}")
+    return names
+
+
+def register_blueprints(app, names):
+    for name in names:
+        module = importlib.import_module(BLUEPRINTS[name])
+        app.register_blueprint(module.bp)
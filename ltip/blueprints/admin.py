@@ -0,0 +1,367 @@
+"""Formulários de cadastro e edição (equipamentos, máquinas, relatórios, laboratório).
+
+Só é registrado em workers que atendem escrita; workers "kiosk" não o importam.
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, abort, flash, jsonify, redirect, render_template_string, request, url_for
+
+from ..catalog import sync_machine_catalog
+from ..extensions import db
+from ..helpers import current_user, get_lab_info, roles_required, save_uploaded_file, upload_filename
+from ..inventory_sync import (
+    EquipmentConflict, EquipmentEditError, apply_equipment_edit, lock_equipment, parse_equipment_changes,
+    record_equipment_change,
+)
+from ..machine_bulk import BulkUpdateError, bulk_update_machines, parse_bulk_changes, parse_machine_ids
+from ..machine_events import record_machine_change
+from ..models import Equipment, License, Machine, Report
+from ..report_search import schedule_report_indexing
+from ..report_storage import store_report_file
+from ..templates import BASE_TEMPLATE
+
+bp = Blueprint("admin", __name__)
+
+ADD_EDIT_EQUIPMENT_TEMPLATE = r"""
+<a href="{{ url_for('inventory.inventory') }}" class="btn btn-back">← Voltar</a>
+<h2>{{ 'Editar' if edit else 'Cadastrar' }} Equipamento</h2>
+<form method="post" enctype="multipart/form-data" style="margin-top: 15px;">
+  <div class="form-row"><label>Nome / Equipamento</label><input name="name" required value="{{ item.name if item else '' }}"></div>
+  <div style="display: flex; gap: 15px;">
+    <div class="form-row" style="flex: 1;"><label>Marca</label><input name="marca" value="{{ item.marca if item else '' }}"></div>
+    <div class="form-row" style="flex: 1;"><label>Modelo</label><input name="modelo" value="{{ item.modelo if item else '' }}"></div>
+  </div>
+  <div style="display: flex; gap: 15px;">
+    <div class="form-row" style="flex: 1;"><label>TOMBO (Nº de Patrimônio)</label><input name="tombo" value="{{ item.tombo if item else '' }}"></div>
+    <div class="form-row" style="flex: 1;"><label>Quantidade</label><input name="quantidade" type="number" min="1" value="{{ item.quantidade if item else 1 }}"></div>
+  </div>
+  <div class="form-row"><label>Localização</label><input name="localizacao" value="{{ item.localizacao if item else '' }}"></div>
+  <div class="form-row"><label>Finalidade</label><input name="finalidade" value="{{ item.finalidade if item else '' }}"></div>
+  <div class="form-row"><label>Imagem (Opcional)</label><input type="file" name="imagem"></div>
+  <div class="form-row"><button class="btn">Salvar</button></div>
+</form>
+"""
+
+ADD_EDIT_MACHINE_TEMPLATE = r"""
+<a href="{{ url_for('machines.machine_inventory') }}" class="btn btn-back">← Voltar</a>
+<h2>{{ 'Editar' if edit else 'Cadastrar' }} Máquina</h2>
+<form method="post" enctype="multipart/form-data" style="margin-top: 15px;">
+  <div class="form-row"><label>ID / Nome da Máquina (ex: PC 01)</label><input name="name" required value="{{ item.name if item else '' }}"></div>
+  <div style="display: flex; gap: 15px;">
+    <div class="form-row" style="flex: 1;"><label>Tipo</label>
+        <select name="tipo">
+            {% set current_tipo = item.tipo if item else '' %}
+            <option value="COMPUTADOR" {% if current_tipo == 'COMPUTADOR' %}selected{% endif %}>COMPUTADOR</option>
+            <option value="NOTEBOOK" {% if current_tipo == 'NOTEBOOK' %}selected{% endif %}>NOTEBOOK</option>
+        </select>
+    </div>
+    <div class="form-row" style="flex: 1;"><label>Status</label>
+        <select name="status" required>
+            {% set current_status = item.status if item else 'Não formatado' %}
+            <option value="Formatado" {% if current_status == 'Formatado' %}selected{% endif %}>Formatado (Cor Verde)</option>
+            <option value="Não formatado" {% if current_status == 'Não formatado' %}selected{% endif %}>Não formatado (Cor Vermelho)</option>
+            <option value="Em andamento" {% if current_status == 'Em andamento' %}selected{% endif %}>Em andamento (Cor Amarelo)</option>
+        </select>
+    </div>
+  </div>
+
+  <div style="display:flex; gap:15px;">
+    <div class="form-row" style="flex:1;"><label>Marca</label><input name="marca" value="{{ item.marca if item else '' }}"></div>
+    <div class="form-row" style="flex:1;"><label>Modelo</label><input name="modelo" value="{{ item.modelo if item else '' }}"></div>
+  </div>
+
+  <div class="form-row"><label>Número de Série</label><input name="numero_serie" required value="{{ item.numero_serie if item else '' }}"></div>
+  <div class="form-row"><label>Sistema Operacional</label><input name="sistema_operacional" value="{{ item.sistema_operacional if item else '' }}"></div>
+  <div class="form-row"><label>Licenças (separadas por vírgula ou ponto e vírgula)</label><input name="licencas" value="{{ item.licencas if item else '' }}"></div>
+  <div class="form-row"><label>Softwares Instalados (separados por vírgula, ponto e vírgula ou um por linha)</label><textarea name="softwares_instalados" rows="3">{{ item.softwares_instalados if item and item.softwares_instalados else '' }}</textarea></div>
+  <div style="display:flex; gap:15px;">
+    <div class="form-row" style="flex:1;"><label>Última Limpeza Física</label><input name="limpeza_fisica_data" type="date" value="{{ item.limpeza_fisica_data | default('', true) }}"></div>
+    <div class="form-row" style="flex:1;"><label>Última Formatação</label><input name="ultima_formatacao_data" type="date" value="{{ item.ultima_formatacao_data | default('', true) }}"></div>
+  </div>
+
+  <div class="form-row"><label>Responsável pela Formatação</label><input name="responsavel_formatacao" value="{{ item.responsavel_formatacao if item else '' }}"></div>
+  <div class="form-row"><label>Imagem (Opcional)</label><input type="file" name="imagem"></div>
+
+  <div class="form-row"><button class="btn">Salvar</button></div>
+</form>
+"""
+
+LAB_INFO_TEMPLATE = r"""
+<a href="{{ url_for('index') }}" class="btn btn-back">← Voltar</a>
+<h2>Configurações e Contatos do Laboratório</h2>
+<form method="post" style="margin-top: 15px;">
+  <p style="font-weight: bold; margin-bottom: 5px;">Informações do Coordenador</p>
+  <div class="form-row"><label>Nome do Coordenador</label><input name="coordenador_name" required value="{{ info.coordenador_name }}"></div>
+  <div class="form-row"><label>Email do Coordenador</label><input name="coordenador_email" type="email" value="{{ info.coordenador_email }}"></div>
+  
+  <p style="font-weight: bold; margin-top: 15px; margin-bottom: 5px;">Informações do Bolsista</p>
+  <div class="form-row"><label>Nome do Bolsista</label><input name="bolsista_name" required value="{{ info.bolsista_name }}"></div>
+  <div class="form-row"><label>Email do Bolsista</label><input name="bolsista_email" type="email" value="{{ info.bolsista_email }}"></div>
+  
+  <div class="form-row"><button class="btn">Salvar Configurações</button> <a href="{{ url_for('index') }}" class="btn btn-outline">Cancelar</a></div>
+</form>
+"""
+
+UPLOAD_REPORT_TEMPLATE = r"""
+<a href="{{ url_for('reports.reports') }}" class="btn btn-back">← Voltar</a>
+<h2>Enviar Relatório</h2>
+<form method="post" enctype="multipart/form-data" style="margin-top:15px;">
+  <div class="form-row"><label>Título</label><input name="title" required></div>
+  <div class="form-row"><label>Arquivo (PDF/DOCX)</label><input type="file" name="report_file" accept=".pdf,.docx,.doc"></div>
+  <div class="form-row"><button class="btn">Enviar</button></div>
+</form>
+"""
+
+# --- Lab Info (edição atualiza imediatamente) ---
+@bp.route("/lab_info", methods=["GET", "POST"])
+@roles_required(["admin", "bolsista"])
+def lab_info():
+    info = get_lab_info()
+    if request.method == "POST":
+        info.coordenador_name = request.form.get("coordenador_name")
+        info.coordenador_email = request.form.get("coordenador_email")
+        info.bolsista_name = request.form.get("bolsista_name")
+        info.bolsista_email = request.form.get("bolsista_email")
+        db.session.commit()
+        db.session.expire_all()
+        flash("Informações do Laboratório atualizadas.", "success")
+        return redirect(url_for("index"))
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", LAB_INFO_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), info=info)
+
+# --- Equipamentos ---
+@bp.route("/equipment/add", methods=["GET", "POST"])
+@roles_required(["admin", "bolsista"])
+def add_equipment():
+    if request.method == "POST":
+        try:
+            quantidade = int(request.form.get("quantidade") or 1)
+        except ValueError:
+            quantidade = 1
+        imagem = request.files.get("imagem")
+        saved = save_uploaded_file(imagem)
+        eq = Equipment(
+            name=request.form.get("name"),
+            tombo=request.form.get("tombo"),
+            quantidade=quantidade,
+            modelo=request.form.get("modelo"),
+            marca=request.form.get("marca"),
+            localizacao=request.form.get("localizacao"),
+            finalidade=request.form.get("finalidade"),
+            imagem_filename=saved,
+        )
+        db.session.add(eq)
+        record_equipment_change(eq)
+        db.session.commit()
+        flash("Equipamento cadastrado com sucesso.", "success")
+        return redirect(url_for("inventory.inventory"))
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", ADD_EDIT_EQUIPMENT_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), edit=False, item=None)
+
+@bp.route("/equipment/edit/<int:eq_id>", methods=["GET", "POST"])
+@roles_required(["admin", "bolsista"])
+def edit_equipment(eq_id):
+    if request.method == "POST":
+        # Linha travada até o commit: outra edição simultânea espera esta terminar
+        item = lock_equipment(eq_id)
+        if item is None:
+            abort(404)
+        try:
+            item.quantidade = int(request.form.get("quantidade") or 1)
+        except ValueError:
+            item.quantidade = 1
+        item.name = request.form.get("name")
+        item.tombo = request.form.get("tombo")
+        item.modelo = request.form.get("modelo")
+        item.marca = request.form.get("marca")
+        item.localizacao = request.form.get("localizacao")
+        item.finalidade = request.form.get("finalidade")
+        imagem = request.files.get("imagem")
+        saved = save_uploaded_file(imagem)
+        if saved:
+            item.imagem_filename = saved
+        record_equipment_change(item)
+        db.session.commit()
+        flash("Atualizado com sucesso.", "success")
+        return redirect(url_for("inventory.view_equipment", eq_id=item.id))
+    item = Equipment.query.get_or_404(eq_id)
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", ADD_EDIT_EQUIPMENT_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), edit=True, item=item)
+
+@bp.route("/api/equipment/<int:eq_id>", methods=["POST"])
+@roles_required(["admin", "bolsista"], api=True)
+def api_edit_equipment(eq_id):
+    # JSON: {"base_seq": 42, "localizacao": "Sala 2", ...}; usado pela fila offline do inventário
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify(error="Envie um objeto JSON."), 400
+    try:
+        base_seq = int(data.get("base_seq"))
+    except (TypeError, ValueError):
+        return jsonify(error="base_seq inválido."), 400
+    try:
+        changes = parse_equipment_changes(data)
+    except EquipmentEditError as e:
+        return jsonify(error=str(e)), 400
+    try:
+        item = apply_equipment_edit(eq_id, base_seq, changes)
+    except EquipmentConflict as e:
+        return jsonify(error=str(e), item=e.item), 409
+    if item is None:
+        return jsonify(error="Equipamento não encontrado."), 404
+    return jsonify(item=item)
+
+# --- Máquinas ---
+@bp.route("/machine/add", methods=["GET", "POST"])
+@roles_required(["admin", "bolsista"])
+def add_machine():
+    if request.method == "POST":
+        def parse_date_str(s):
+            try:
+                return datetime.strptime(s, "%Y-%m-%d").date() if s else None
+            except Exception:
+                return None
+        ultima_formatacao = parse_date_str(request.form.get("ultima_formatacao_data"))
+        limpeza_data = parse_date_str(request.form.get("limpeza_fisica_data"))
+
+        if request.form.get("numero_serie") and Machine.query.filter_by(numero_serie=request.form.get("numero_serie")).first():
+            flash("Erro: Número de Série já cadastrado.", "danger")
+            return redirect(url_for("admin.add_machine"))
+
+        imagem = request.files.get("imagem")
+        saved = save_uploaded_file(imagem)
+
+        m = Machine(
+            name=request.form.get("name"),
+            status=request.form.get("status"),
+            tipo=request.form.get("tipo"),
+            numero_serie=request.form.get("numero_serie"),
+            ultima_formatacao_data=ultima_formatacao,
+            limpeza_fisica_data=limpeza_data,
+            responsavel_formatacao=request.form.get("responsavel_formatacao"),
+            marca=request.form.get("marca"),
+            modelo=request.form.get("modelo"),
+            sistema_operacional=request.form.get("sistema_operacional"),
+            licencas=request.form.get("licencas"),
+            softwares_instalados=request.form.get("softwares_instalados"),
+            imagem_filename=saved,
+        )
+        db.session.add(m)
+        sync_machine_catalog(m)
+        record_machine_change(m)
+        db.session.commit()
+        flash("Máquina cadastrada com sucesso.", "success")
+        return redirect(url_for("machines.machine_inventory"))
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", ADD_EDIT_MACHINE_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), edit=False, item=None)
+
+@bp.route("/machine/edit/<int:machine_id>", methods=["GET", "POST"])
+@roles_required(["admin", "bolsista"])
+def edit_machine(machine_id):
+    item = Machine.query.get_or_404(machine_id)
+    if request.method == "POST":
+        def parse_date_str(s):
+            try:
+                return datetime.strptime(s, "%Y-%m-%d").date() if s else None
+            except Exception:
+                return None
+        ultima_formatacao = parse_date_str(request.form.get("ultima_formatacao_data"))
+        limpeza_data = parse_date_str(request.form.get("limpeza_fisica_data"))
+
+        if request.form.get("numero_serie") and Machine.query.filter(Machine.numero_serie == request.form.get("numero_serie"), Machine.id != machine_id).first():
+            flash("Erro: Número de Série já cadastrado em outra máquina.", "danger")
+            return redirect(url_for("admin.edit_machine", machine_id=machine_id))
+
+        item.name = request.form.get("name")
+        item.status = request.form.get("status")
+        item.tipo = request.form.get("tipo")
+        item.numero_serie = request.form.get("numero_serie")
+        item.ultima_formatacao_data = ultima_formatacao
+        item.limpeza_fisica_data = limpeza_data
+        item.responsavel_formatacao = request.form.get("responsavel_formatacao")
+        item.marca = request.form.get("marca")
+        item.modelo = request.form.get("modelo")
+        item.sistema_operacional = request.form.get("sistema_operacional")
+        item.licencas = request.form.get("licencas")
+        item.softwares_instalados = request.form.get("softwares_instalados")
+
+        imagem = request.files.get("imagem")
+        saved = save_uploaded_file(imagem)
+        if saved:
+            item.imagem_filename = saved
+
+        sync_machine_catalog(item)
+        record_machine_change(item)
+        db.session.commit()
+        flash("Máquina atualizada com sucesso.", "success")
+        return redirect(url_for("machines.view_machine", machine_id=item.id))
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", ADD_EDIT_MACHINE_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), edit=True, item=item)
+
+@bp.route("/licenses/<int:license_id>/seats", methods=["POST"])
+@roles_required(["admin", "bolsista"], all_labs=True)
+def edit_license_seats(license_id):
+    lic = License.query.get_or_404(license_id)
+    seats = (request.form.get("seats") or "").strip()
+    try:
+        lic.seats = max(int(seats), 0) if seats else None
+    except ValueError:
+        flash("Quantidade de licenças inválida.", "danger")
+        return redirect(url_for("machines.licenses"))
+    db.session.commit()
+    flash(f"Quantidade da licença {lic.name} atualizada.", "success")
+    return redirect(url_for("machines.licenses"))
+
+@bp.route("/machines/bulk", methods=["POST"])
+@roles_required(["admin", "bolsista"])
+def bulk_update_machines_form():
+    back = url_for("machines.machine_inventory", q=request.form.get("q") or None)
+    try:
+        ids = parse_machine_ids(request.form.getlist("ids"))
+        changes = parse_bulk_changes(request.form)
+        updated, _ = bulk_update_machines(ids, changes, current_user().username)
+    except BulkUpdateError as e:
+        flash(str(e), "danger")
+        return redirect(back)
+    flash(f"{updated} máquina(s) atualizada(s).", "success")
+    return redirect(back)
+
+@bp.route("/api/machines/bulk", methods=["POST"])
+@roles_required(["admin", "bolsista"], api=True)
+def api_bulk_update_machines():
+    # JSON: {"ids": [1, 2], "status": "Formatado", "ultima_formatacao_data": "2025-03-10", ...}
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify(error="Envie um objeto JSON."), 400
+    try:
+        ids = parse_machine_ids(data.get("ids"))
+        changes = parse_bulk_changes(data)
+        updated, audit = bulk_update_machines(ids, changes, current_user().username)
+    except BulkUpdateError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(updated=updated, audit_id=audit.id)
+
+# --- Relatórios ---
+@bp.route("/reports/upload", methods=["GET", "POST"])
+@roles_required(["admin", "bolsista"])
+def upload_report():
+    if request.method == "POST":
+        title = request.form.get("title") or "Relatório"
+        file = request.files.get("report_file")
+        if not file:
+            flash("Selecione um arquivo para enviar.", "danger")
+            return redirect(url_for("admin.upload_report"))
+        filename = upload_filename(file)
+        if not filename:
+            flash("Falha ao salvar o arquivo.", "danger")
+            return redirect(url_for("admin.upload_report"))
+        rpt = Report(title=title, filename=filename)
+        store_report_file(rpt, file)
+        db.session.add(rpt)
+        db.session.commit()
+        schedule_report_indexing()
+        flash("Relatório enviado com sucesso.", "success")
+        return redirect(url_for("reports.reports"))
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", UPLOAD_REPORT_TEMPLATE)
+    return render_template_string(final_template, user=current_user())
@@ -0,0 +1,55 @@
+"""Login e logout."""
+
+from flask import Blueprint, flash, make_response, redirect, render_template_string, request, session, url_for
+
+from ..config import LOGIN_RATE_LIMIT_STORAGE
+from ..helpers import current_user
+from ..models import User
+from ..ratelimit import login_rate_limited, login_rate_store, make_rate_limit_store
+from ..templates import BASE_TEMPLATE
+
+bp = Blueprint("auth", __name__)
+
+
+@bp.record_once
+def _init_rate_limit_store(state):
+    state.app.extensions["login_rate_store"] = make_rate_limit_store(LOGIN_RATE_LIMIT_STORAGE)
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    status = 200
+    retry_after = 0
+    if request.method == "POST":
+        username = (request.form.get("username") or "").strip()
+        password = request.form.get("password")
+        # Rejeita antes de consultar o banco e de calcular o hash da senha
+        retry_after = login_rate_limited(username)
+        if retry_after:
+            status = 429
+            flash(f"Muitas tentativas de login. Tente novamente em {int(retry_after) // 60 + 1} minuto(s).", "danger")
+        else:
+            user = User.query.filter_by(username=username).first()
+            if user and user.check_password(password):
+                login_rate_store().reset(f"user:{username.lower()}")
+                session["user_id"] = user.id
+                flash("Logado com sucesso.", "success")
+                return redirect(url_for("index"))
+            flash("Usuário ou senha inválidos.", "danger")
+    template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", """
+        <h2>Login</h2>
+        <form method="post">
+            <div class="form-row"><input name="username" placeholder="Usuário" required></div>
+            <div class="form-row"><input name="password" placeholder="Senha" type="password" required></div>
+            <div class="form-row"><button class="btn">Entrar</button></div>
+        </form>
+    """)
+    response = make_response(render_template_string(template, user=current_user()), status)
+    if retry_after:
+        response.headers["Retry-After"] = str(int(retry_after) + 1)
+    return response
+
+@bp.route("/logout")
+def logout():
+    session.pop("user_id", None)
+    flash("Logout realizado.", "success")
+    return redirect(url_for("index"))
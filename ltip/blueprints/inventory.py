@@ -0,0 +1,258 @@
+"""Listagem e detalhes do inventário de equipamentos (somente leitura).
+
+Inclui o modo offline (PWA): /inventory/offline é uma página estática que lê os
+equipamentos do IndexedDB e sincroniza por /api/inventory?since=N; /sw.js é o
+service worker que guarda essa página e os arquivos estáticos no navegador.
+"""
+
+import json
+import os
+
+from flask import Blueprint, Response, jsonify, render_template_string, request, url_for
+from sqlalchemy import or_
+
+from ..assets import STATIC_DIR, asset_url, get_asset
+from ..config import COLOR_DARK, COLOR_WHITE
+from ..equipment_summary import GROUP_FIELDS, summary_rows, summary_totals
+from ..helpers import current_user
+from ..inventory_sync import inventory_delta
+from ..models import Equipment
+from ..replicas import read_only
+from ..templates import BASE_TEMPLATE
+
+bp = Blueprint("inventory", __name__)
+
+INVENTORY_TEMPLATE = r"""
+<a href="{{ url_for('index') }}" class="btn btn-back">← Voltar</a>
+<h2>Inventário de Equipamentos</h2>
+
+<form method="get" style="margin-top:8px; display:flex; gap:8px; align-items:center;">
+  <input name="q" placeholder="Buscar por equipamento, marca, modelo, tombo ou finalidade..." value="{{ request.args.get('q','') }}">
+  <button class="btn">Buscar</button>
+  <a href="{{ url_for('inventory.inventory') }}" class="btn btn-outline">Limpar</a>
+  <a href="{{ url_for('inventory.equipment_summary') }}" class="btn btn-outline">Resumo</a>
+  <a href="{{ url_for('inventory.offline_inventory') }}" class="btn btn-outline">Modo offline</a>
+</form>
+
+<table>
+  <thead>
+    <tr>
+      <th>IMAGEM</th>
+      <th>EQUIPAMENTO</th>
+      <th>TOMBO</th>
+      <th>MARCA</th>
+      <th>MODELO</th>
+      <th>QUANTIDADE</th>
+      <th>LOCALIZAÇÃO</th>
+      <th>FINALIDADE</th>
+      <th>Ações</th>
+    </tr>
+  </thead>
+  <tbody>
+    {% for e in items %}
+      <tr>
+        <td>{% if e.imagem_filename %}<img class="img-thumb" src="{{ url_for('uploaded_file', filename=e.imagem_filename) }}">{% else %}-{% endif %}</td>
+        <td>{{ e.name }}</td>
+        <td>{{ e.tombo }}</td>
+        <td>{{ e.marca }}</td>
+        <td>{{ e.modelo }}</td>
+        <td>{{ e.quantidade }}</td>
+        <td>{{ e.localizacao }}</td>
+        <td>{{ e.finalidade }}</td>
+        <td>
+          <a href="{{ url_for('inventory.view_equipment', eq_id=e.id) }}">Ver</a>
+          {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %} | <a href="{{ url_for('admin.edit_equipment', eq_id=e.id) }}">Editar</a>{% endif %}
+        </td>
+      </tr>
+    {% endfor %}
+  </tbody>
+</table>
+<script src="{{ asset_url('inventory_app.js') }}" data-sw="{{ url_for('inventory.service_worker') }}" data-scope="{{ request.script_root }}/" defer></script>
+"""
+
+@bp.route("/inventory")
+@read_only
+def inventory():
+    q = (request.args.get("q") or "").strip()
+    query = Equipment.query
+    if q:
+        like = f"%{q}%"
+        query = query.filter(
+            or_(
+                Equipment.name.ilike(like),
+                Equipment.marca.ilike(like),
+                Equipment.modelo.ilike(like),
+                Equipment.tombo.ilike(like),
+                Equipment.finalidade.ilike(like),
+            )
+        )
+    items = query.order_by(Equipment.name).all()
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", INVENTORY_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), items=items, request=request)
+
+@bp.route("/equipment/<int:eq_id>")
+@read_only
+def view_equipment(eq_id):
+    item = Equipment.query.get_or_404(eq_id)
+    body = f"""
+    <a href="{{{{ url_for('inventory.inventory') }}}}" class="btn btn-back">← Voltar</a>
+    <h2>Detalhes do Equipamento: {item.name}</h2>
+    <p><strong>TOMBO:</strong> {item.tombo}</p>
+    <p><strong>Quantidade:</strong> {item.quantidade}</p>
+    <p><strong>Marca:</strong> {item.marca}</p>
+    <p><strong>Modelo:</strong> {item.modelo}</p>
+    <p><strong>Localização:</strong> {item.localizacao}</p>
+    <p><strong>Finalidade:</strong> {item.finalidade}</p>
+    """
+    if item.imagem_filename:
+        body += f'<p><strong>Imagem:</strong><br><img class="img-thumb" src="{{{{ url_for(\'uploaded_file\', filename=\'{item.imagem_filename}\') }}}}"></p>'
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", body)
+    return render_template_string(final_template, user=current_user(), item=item)
+
+SUMMARY_TEMPLATE = r"""
+<a href="{{ url_for('inventory.inventory') }}" class="btn btn-back">← Voltar</a>
+<h2>Resumo do Inventário</h2>
+<div style="margin-top:8px">
+  Agrupar por:
+  {% for field, label in group_fields.items() %}
+    <a href="{{ url_for('inventory.equipment_summary', by=field) }}" class="btn {{ '' if by == field else 'btn-outline' }}">{{ label }}</a>
+  {% endfor %}
+  <a href="{{ url_for('inventory.equipment_summary') }}" class="btn {{ '' if not by else 'btn-outline' }}">Detalhado</a>
+</div>
+
+<table>
+  <thead>
+    <tr>
+      {% if by %}<th>{{ group_fields[by] | upper }}</th>
+      {% else %}<th>LOCALIZAÇÃO</th><th>FINALIDADE</th><th>MARCA</th>{% endif %}
+      <th>CADASTROS</th>
+      <th>UNIDADES</th>
+    </tr>
+  </thead>
+  <tbody>
+    {% for row in rows %}
+      <tr>
+        {% if by %}<td>{{ row[by] or '(não informado)' }}</td>
+        {% else %}<td>{{ row.localizacao or '(não informado)' }}</td><td>{{ row.finalidade or '(não informado)' }}</td><td>{{ row.marca or '(não informado)' }}</td>{% endif %}
+        <td>{{ row.cadastros }}</td>
+        <td>{{ row.unidades }}</td>
+      </tr>
+    {% else %}
+      <tr><td colspan="{{ 3 if by else 5 }}" class="muted">Nenhum equipamento cadastrado.</td></tr>
+    {% endfor %}
+  </tbody>
+  <tfoot>
+    <tr>
+      <th colspan="{{ 1 if by else 3 }}">Total</th>
+      <th>{{ totals[0] }}</th>
+      <th>{{ totals[1] }}</th>
+    </tr>
+  </tfoot>
+</table>
+"""
+
+@bp.route("/inventory/summary")
+@read_only
+def equipment_summary():
+    by = request.args.get("by")
+    if by not in GROUP_FIELDS:
+        by = None
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", SUMMARY_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), rows=summary_rows(by), totals=summary_totals(),
+                                  by=by, group_fields=GROUP_FIELDS)
+
+# ------------- Modo offline (PWA) -------------
+OFFLINE_INVENTORY_TEMPLATE = r"""
+<a href="{{ url_for('inventory.inventory') }}" class="btn btn-back">← Voltar</a>
+<h2>Inventário (modo offline)</h2>
+<p class="small muted">Os equipamentos ficam guardados neste aparelho. Edições feitas sem rede são enviadas quando a conexão voltar. <span id="sync-status"></span></p>
+
+<div id="inventory-app"
+     data-db="ltip-inventory{{ request.script_root|replace('/', '-') }}"
+     data-api="{{ url_for('inventory.api_inventory') }}"
+     data-shell="{{ url_for('inventory.offline_inventory') }}"
+     data-equipment-path="{{ url_for('inventory.view_equipment', eq_id=0)[:-1] }}"
+     {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}data-edit-api="{{ url_for('admin.api_edit_equipment', eq_id=0)[:-1] }}"{% endif %}>
+  <input id="offline-search" placeholder="Buscar por equipamento, marca, modelo, tombo ou finalidade...">
+
+  <div id="offline-outbox" class="card" style="margin-top:12px" hidden>
+    <h3>Alterações pendentes</h3>
+    <ul id="offline-outbox-list"></ul>
+  </div>
+
+  <div id="offline-panel" class="card" style="margin-top:12px" hidden></div>
+
+  <table>
+    <thead>
+      <tr>
+        <th>EQUIPAMENTO</th>
+        <th>TOMBO</th>
+        <th>MARCA</th>
+        <th>MODELO</th>
+        <th>QUANTIDADE</th>
+        <th>LOCALIZAÇÃO</th>
+        <th>FINALIDADE</th>
+        <th>Ações</th>
+      </tr>
+    </thead>
+    <tbody id="offline-rows"></tbody>
+  </table>
+</div>
+<script src="{{ asset_url('inventory_app.js') }}" data-sw="{{ url_for('inventory.service_worker') }}" data-scope="{{ request.script_root }}/" defer></script>
+"""
+
+
+@bp.route("/inventory/offline")
+def offline_inventory():
+    # Página sem dados: o service worker a guarda e ela funciona sem rede
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", OFFLINE_INVENTORY_TEMPLATE)
+    return render_template_string(final_template, user=current_user())
+
+
+@bp.route("/api/inventory")
+@read_only
+def api_inventory():
+    since = request.args.get("since", 0, type=int)
+    response = jsonify(inventory_delta(since))
+    response.cache_control.no_store = True
+    return response
+
+
+@bp.route("/sw.js")
+def service_worker():
+    # Fora de /static: o escopo de um service worker é o diretório da sua URL, e ele
+    # precisa controlar /inventory e /equipment/<id>. A URL é fixa, então o conteúdo
+    # muda a cada deploy (lista de arquivos com hash) e o navegador sempre revalida.
+    precache = [asset_url(name) for name in ("ltip.css", "inventory_app.js")]
+    version = "-".join(get_asset(name).digest for name in ("ltip.css", "inventory_app.js"))
+    with open(os.path.join(STATIC_DIR, "sw.js"), encoding="utf-8") as fh:
+        script = fh.read()
+    settings = {
+        "version": version,
+        "shell": url_for("inventory.offline_inventory"),
+        "precache": precache,
+        "inventory": url_for("inventory.inventory"),
+        "equipmentPath": url_for("inventory.view_equipment", eq_id=0)[:-1],
+        "uploadsPath": url_for("uploaded_file", filename="x")[:-1],
+    }
+    script = script.replace("__SETTINGS__", json.dumps(settings))
+    response = Response(script, mimetype="text/javascript")
+    response.cache_control.no_cache = True
+    return response
+
+
+@bp.route("/manifest.webmanifest")
+def manifest():
+    data = {
+        "name": "LTIP - Inventário",
+        "short_name": "LTIP",
+        "start_url": url_for("inventory.offline_inventory"),
+        "scope": request.script_root + "/",
+        "display": "standalone",
+        "background_color": COLOR_WHITE,
+        "theme_color": COLOR_DARK,
+        "icons": [{"src": asset_url("icon.svg"), "sizes": "any", "type": "image/svg+xml"}],
+    }
+    response = Response(json.dumps(data, ensure_ascii=False), mimetype="application/manifest+json")
+    response.cache_control.max_age = 3600
+    return response
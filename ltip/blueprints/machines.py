@@ -0,0 +1,224 @@
+"""Listagem e detalhes das máquinas (somente leitura), com atualizações ao vivo via SSE."""
+
+from flask import Blueprint, Response, abort, current_app, render_template_string, request, stream_with_context
+from sqlalchemy import or_
+
+from ..catalog import license_usage, machine_catalog, machines_with_catalog_term, software_usage
+from ..change_feed import settled_cursor
+from ..extensions import db
+from ..helpers import current_user, get_status_color
+from ..labs import current_lab_id
+from ..machine_events import machine_event_hub
+from ..models import Machine, MachineChange
+from ..replicas import read_only
+from ..templates import BASE_TEMPLATE
+
+bp = Blueprint("machines", __name__)
+
+# Linha da tabela: usada na listagem e nos eventos de /machines/events
+MACHINE_ROW_TEMPLATE = r"""
+<tr id="machine-{{ m.id }}" data-name="{{ m.name }}">
+  {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}<td><input type="checkbox" class="check" name="ids" value="{{ m.id }}" form="bulk-form"></td>{% endif %}
+  <td>{% if m.imagem_filename %}<img class="img-thumb" src="{{ url_for('uploaded_file', filename=m.imagem_filename) }}">{% else %}-{% endif %}</td>
+  <td>{{ m.name }}</td>
+  <td>{{ m.tipo }}</td>
+  <td>{{ m.marca }}</td>
+  <td>{{ m.modelo }}</td>
+  <td>{{ m.sistema_operacional }}</td>
+  <td>{{ m.licencas }}</td>
+  <td style="{{ get_status_color(m.status) }}">{{ m.status }}</td>
+  <td>{{ m.limpeza_fisica_data | default('N/A', true) }}</td>
+  <td>{{ m.ultima_formatacao_data | default('N/A', true) }}</td>
+  <td>
+    <a href="{{ url_for('machines.view_machine', machine_id=m.id) }}">Ver</a>
+    {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %} | <a href="{{ url_for('admin.edit_machine', machine_id=m.id) }}">Editar</a>{% endif %}
+  </td>
+</tr>
+"""
+
+MACHINE_INVENTORY_TEMPLATE = r"""
+<a href="{{ url_for('index') }}" class="btn btn-back">← Voltar</a>
+<h2>Gerenciamento de Máquinas (Computadores/Notebooks)</h2>
+<p>
+{% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}
+<a href="{{ url_for('admin.add_machine') }}" class="btn">Cadastrar Nova Máquina</a>
+{% endif %}
+<a href="{{ url_for('machines.licenses') }}" class="btn btn-outline">Licenças e Softwares</a>
+</p>
+
+<form method="get" style="margin-top:8px; display:flex; gap:8px; align-items:center;">
+  <input name="q" placeholder="Buscar por ID, marca, modelo, N/S, SO, licença, software..." value="{{ request.args.get('q','') }}">
+  <button class="btn">Buscar</button>
+  <a href="{{ url_for('machines.machine_inventory') }}" class="btn btn-outline">Limpar</a>
+</form>
+
+{% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}
+<form id="bulk-form" method="post" action="{{ url_for('admin.bulk_update_machines_form') }}" class="card" style="margin-top:12px;">
+  <strong>Alterar máquinas selecionadas</strong> <span class="small muted">(campos em branco não são alterados)</span>
+  <input type="hidden" name="q" value="{{ request.args.get('q','') }}">
+  <div style="display:flex; gap:15px; margin-top:8px;">
+    <div class="form-row" style="flex:1;"><label>Status</label>
+        <select name="status">
+            <option value="">— manter —</option>
+            <option value="Formatado">Formatado (Cor Verde)</option>
+            <option value="Não formatado">Não formatado (Cor Vermelho)</option>
+            <option value="Em andamento">Em andamento (Cor Amarelo)</option>
+        </select>
+    </div>
+    <div class="form-row" style="flex:1;"><label>Última Limpeza Física</label><input name="limpeza_fisica_data" type="date"></div>
+    <div class="form-row" style="flex:1;"><label>Última Formatação</label><input name="ultima_formatacao_data" type="date"></div>
+    <div class="form-row" style="flex:1;"><label>Responsável pela Formatação</label><input name="responsavel_formatacao"></div>
+  </div>
+  <button class="btn">Aplicar às selecionadas</button>
+</form>
+{% endif %}
+
+<table>
+  <thead>
+    <tr>
+      {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}<th><input type="checkbox" class="check" id="bulk-select-all" title="Selecionar todas"></th>{% endif %}
+      <th>IMAGEM</th>
+      <th>ID</th>
+      <th>Tipo</th>
+      <th>Marca</th>
+      <th>Modelo</th>
+      <th>Sistema Operacional</th>
+      <th>Licença</th>
+      <th>Status</th>
+      <th>Última Limpeza Física</th>
+      <th>Última Formatação</th>
+      <th>Ações</th>
+    </tr>
+  </thead>
+  <tbody id="machine-rows" data-events="{{ url_for('machines.machine_events', since=events_since) }}"{% if request.args.get('q') %} data-filtered="1"{% endif %}>
+    {% for m in items %}
+__MACHINE_ROW__    {% endfor %}
+  </tbody>
+</table>
+<script src="{{ asset_url('machines.js') }}" defer></script>
+""".replace("__MACHINE_ROW__", MACHINE_ROW_TEMPLATE.lstrip("\n"))
+
+@bp.route("/machines")
+@read_only
+def machine_inventory():
+    q = (request.args.get("q") or "").strip()
+    # Lido antes das máquinas: o EventSource continua daqui sem perder alterações
+    # (cursor seguro: inclui as que ainda podem aparecer com id menor, ver change_feed.py)
+    events_since = settled_cursor(MachineChange)
+    query = Machine.query
+    if q:
+        like = f"%{q}%"
+        query = query.filter(
+            or_(
+                Machine.name.ilike(like),
+                Machine.marca.ilike(like),
+                Machine.modelo.ilike(like),
+                Machine.numero_serie.ilike(like),
+                Machine.sistema_operacional.ilike(like),
+                # Softwares e licenças: início de qualquer palavra do nome, pelas tabelas indexadas do catálogo
+                Machine.id.in_(machines_with_catalog_term(q)),
+            )
+        )
+    items = query.order_by(Machine.name).all()
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", MACHINE_INVENTORY_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), items=items, get_status_color=get_status_color, request=request, events_since=events_since)
+
+@bp.route("/machines/events")
+def machine_events():
+    # Reconexões do EventSource mandam Last-Event-ID; a primeira conexão usa ?since=
+    try:
+        cursor = int(request.headers.get("Last-Event-ID") or request.args.get("since"))
+    except (TypeError, ValueError):
+        cursor = None
+    user = current_user()
+    lab_id = current_lab_id()
+    hub = machine_event_hub()
+    if cursor is None:
+        cursor = hub.cursor
+    row_template = current_app.jinja_env.from_string(MACHINE_ROW_TEMPLATE.strip())
+    db.session.close()  # a conexão fica aberta por muito tempo: devolve a do banco ao pool
+
+    def render(m):
+        return row_template.render(m=m, user=user, get_status_color=get_status_color)
+
+    return Response(stream_with_context(hub.stream(cursor, render, lab_id)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@bp.route("/machine/<int:machine_id>")
+@read_only
+def view_machine(machine_id):
+    item = machine_catalog(machine_id)
+    if item is None:
+        abort(404)
+    body = f"""
+    <a href="{{{{ url_for('machines.machine_inventory') }}}}" class="btn btn-back">← Voltar</a>
+    <h2>Detalhes da Máquina: {item.name}</h2>
+    <p><strong>Status:</strong> <span style="{get_status_color(item.status)}">{item.status}</span></p>
+    <p><strong>Tipo:</strong> {item.tipo}</p>
+    <p><strong>Marca:</strong> {item.marca or 'N/A'}</p>
+    <p><strong>Modelo:</strong> {item.modelo or 'N/A'}</p>
+    <p><strong>Número de Série:</strong> {item.numero_serie or 'N/A'}</p>
+    <p><strong>Sistema Operacional:</strong> {item.sistema_operacional or 'N/A'}</p>
+    <p><strong>Licença:</strong> {item.licencas or 'N/A'}</p>
+    <p><strong>Softwares Instalados:</strong> {{{{ item.softwares | map(attribute='name') | join(', ') or 'N/A' }}}}</p>
+    <p><strong>Última Limpeza Física:</strong> {item.limpeza_fisica_data or 'N/A'}</p>
+    <p><strong>Última Formatação:</strong> {item.ultima_formatacao_data or 'N/A'}</p>
+    <p><strong>Responsável:</strong> {item.responsavel_formatacao or 'N/A'}</p>
+    """
+    if item.imagem_filename:
+        body += f'<p><strong>Imagem:</strong><br><img class="img-thumb" src="{{{{ url_for(\'uploaded_file\', filename=\'{item.imagem_filename}\') }}}}"></p>'
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", body)
+    return render_template_string(final_template, user=current_user(), item=item, get_status_color=get_status_color)
+
+LICENSES_TEMPLATE = r"""
+<a href="{{ url_for('machines.machine_inventory') }}" class="btn btn-back">← Voltar</a>
+<h2>Licenças e Softwares</h2>
+<p class="small muted">Contagens a partir dos campos "Licença" e "Softwares instalados" de cada máquina. As licenças adquiridas valem para todos os laboratórios.</p>
+
+<h3>Licenças em uso</h3>
+<table>
+  <thead><tr><th>Licença</th><th>Máquinas (este laboratório)</th><th>Máquinas (todos)</th><th>Adquiridas</th><th>Situação</th></tr></thead>
+  <tbody>
+    {% for lic, in_use, in_lab in licenses %}
+      <tr>
+        <td>{{ lic.name }}</td>
+        <td>{{ in_lab }}</td>
+        <td>{{ in_use }}</td>
+        <td>
+          {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] and user.lab_id is none %}
+          <form method="post" action="{{ url_for('admin.edit_license_seats', license_id=lic.id) }}" style="display:flex; gap:6px;">
+            <input name="seats" type="number" min="0" value="{{ lic.seats if lic.seats is not none else '' }}" style="max-width:90px">
+            <button class="btn">Salvar</button>
+          </form>
+          {% else %}{{ lic.seats if lic.seats is not none else 'N/A' }}{% endif %}
+        </td>
+        <td>
+          {% if lic.seats is none %}<span class="muted">Quantidade não informada</span>
+          {% elif in_use > lic.seats %}<span style="color: #e74c3c; font-weight: bold;">Excedida em {{ in_use - lic.seats }}</span>
+          {% else %}<span style="color: #1abc9c; font-weight: bold;">{{ lic.seats - in_use }} disponível(is)</span>{% endif %}
+        </td>
+      </tr>
+    {% else %}
+      <tr><td colspan="5" class="muted">Nenhuma licença cadastrada nas máquinas.</td></tr>
+    {% endfor %}
+  </tbody>
+</table>
+
+<h3 style="margin-top:20px">Softwares mais instalados</h3>
+<table>
+  <thead><tr><th>Software</th><th>Máquinas</th></tr></thead>
+  <tbody>
+    {% for sw, installs in softwares %}
+      <tr><td><a href="{{ url_for('machines.machine_inventory', q=sw.name) }}">{{ sw.name }}</a></td><td>{{ installs }}</td></tr>
+    {% else %}
+      <tr><td colspan="2" class="muted">Nenhum software cadastrado nas máquinas.</td></tr>
+    {% endfor %}
+  </tbody>
+</table>
+"""
+
+@bp.route("/licenses")
+@read_only
+def licenses():
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", LICENSES_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), licenses=license_usage(), softwares=software_usage())
@@ -0,0 +1,87 @@
+"""Listagem, busca e download de relatórios (somente leitura)."""
+
+from flask import Blueprint, flash, redirect, render_template_string, request, url_for
+
+from ..helpers import allowed_reports_list, current_user
+from ..models import Report
+from ..replicas import read_only
+from ..report_search import search_reports
+from ..report_storage import report_storage_key, send_report
+from ..storage import get_storage
+from ..templates import BASE_TEMPLATE
+
+bp = Blueprint("reports", __name__)
+
+REPORTS_TEMPLATE = r"""
+<a href="{{ url_for('index') }}" class="btn btn-back">← Voltar</a>
+<h2>Relatórios Mensais</h2>
+
+{% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}
+  <p><a href="{{ url_for('admin.upload_report') }}" class="btn">Enviar Relatório</a></p>
+{% endif %}
+
+<form method="get" style="margin-top:8px; display:flex; gap:8px; align-items:center;">
+  <input name="q" placeholder="Buscar no conteúdo dos relatórios..." value="{{ q }}">
+  <button class="btn">Buscar</button>
+  <a href="{{ url_for('reports.reports') }}" class="btn btn-outline">Limpar</a>
+</form>
+
+{% if q %}
+<table>
+  <thead>
+    <tr><th>TÍTULO</th><th>TRECHO</th><th>ENVIADO EM</th><th>AÇÕES</th></tr>
+  </thead>
+  <tbody>
+    {% for r, snippet in results %}
+      <tr>
+        <td>{{ r.title }}</td>
+        <td class="small">{{ snippet }}</td>
+        <td>{{ r.uploaded_at }}</td>
+        <td>
+          <a href="{{ url_for('reports.download_report', report_id=r.id) }}">Download</a>
+        </td>
+      </tr>
+    {% else %}
+      <tr><td colspan="4" class="muted">Nenhum relatório encontrado.</td></tr>
+    {% endfor %}
+  </tbody>
+</table>
+{% else %}
+<table>
+  <thead>
+    <tr><th>TÍTULO</th><th>ARQUIVO</th><th>ENVIADO EM</th><th>AÇÕES</th></tr>
+  </thead>
+  <tbody>
+    {% for r in reports %}
+      <tr>
+        <td>{{ r.title }}</td>
+        <td>{{ r.filename }}</td>
+        <td>{{ r.uploaded_at }}</td>
+        <td>
+          <a href="{{ url_for('reports.download_report', report_id=r.id) }}">Download</a>
+        </td>
+      </tr>
+    {% endfor %}
+  </tbody>
+</table>
+{% endif %}
+"""
+
+@bp.route("/reports")
+@read_only
+def reports():
+    q = (request.args.get("q") or "").strip()
+    if q:
+        results, reports = search_reports(q), []
+    else:
+        results, reports = [], allowed_reports_list()
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", REPORTS_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), reports=reports, results=results, q=q)
+
+@bp.route("/reports/download/<int:report_id>")
+def download_report(report_id):
+    rpt = Report.query.get_or_404(report_id)
+    if not get_storage().exists(report_storage_key(rpt)):
+        flash("Arquivo não encontrado.", "danger")
+        return redirect(url_for("reports.reports"))
+    return send_report(rpt)
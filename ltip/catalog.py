@@ -0,0 +1,155 @@
+"""Catálogo normalizado de softwares e licenças das máquinas.
+
+Os campos de texto livre (softwares_instalados, licencas) continuam sendo o que o
+formulário edita; a cada gravação eles são divididos em nomes (vírgula, ponto e
+vírgula ou quebra de linha) e ligados às tabelas software / license. Contagens de
+uso e a busca da listagem consultam essas tabelas em vez de varrer o texto; a busca
+encontra o termo no início de qualquer palavra do nome (software_word / license_word).
+"""
+
+import re
+
+from sqlalchemy import case, false, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from .extensions import db
+from .labs import current_lab_id
+from .models import License, Machine, Software, license_word, machine_license, machine_software, software_word
+
+NAME_SEPARATORS = re.compile(r"[,;\r\n]+")
+NAME_MAX_LENGTH = 200
+WORD_RE = re.compile(r"\w+")
+# Modelo -> (tabela de palavras, coluna com o id da entrada)
+WORD_TABLES = {Software: (software_word, "software_id"), License: (license_word, "license_id")}
+
+
+def name_key(name):
+    return " ".join(name.split()).lower()[:NAME_MAX_LENGTH]
+
+
+def name_words(key):
+    """Palavras distintas de um name_key (letras e dígitos; pontuação separa palavras)."""
+    return sorted(set(WORD_RE.findall(key)))
+
+
+def split_names(text):
+    """Nomes distintos (pela chave normalizada) do texto livre, na ordem em que aparecem."""
+    names = {}
+    for part in NAME_SEPARATORS.split(text or ""):
+        name = " ".join(part.split())[:NAME_MAX_LENGTH]
+        if name:
+            names.setdefault(name_key(name), name)
+    return names
+
+
+def _catalog_entries(model, names):
+    if not names:
+        return []
+    found = {e.name_key: e for e in model.query.filter(model.name_key.in_(list(names)))}
+    for key, name in names.items():
+        if key in found:
+            continue
+        entry = model(name=name, name_key=key)
+        try:
+            with db.session.begin_nested():
+                db.session.add(entry)
+                db.session.flush()
+                _add_words(model, entry)
+        except IntegrityError:
+            # Outro worker criou o mesmo nome ao mesmo tempo
+            entry = model.query.filter_by(name_key=key).one()
+        found[key] = entry
+    return [found[key] for key in names]
+
+
+def _add_words(model, entry):
+    # O nome de uma entrada não muda depois de criada: as palavras só são gravadas aqui
+    words = name_words(entry.name_key)
+    if words:
+        table, fk = WORD_TABLES[model]
+        db.session.execute(insert(table), [{fk: entry.id, "word": word} for word in words])
+
+
+def sync_machine_catalog(machine):
+    """Atualiza as ligações de machine a partir dos campos de texto; chamar antes do commit."""
+    machine.softwares = _catalog_entries(Software, split_names(machine.softwares_instalados))
+    machine.licenses = _catalog_entries(License, split_names(machine.licencas))
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _catalog_matches(model, key, word):
+    # Candidatas pelo índice de palavras (LIKE 'prefixo%'); o termo inteiro é conferido só nelas
+    table, fk = WORD_TABLES[model]
+    candidates = select(table.c[fk]).where(table.c.word.like(_like_escape(word) + "%", escape="\\"))
+    return select(model.id).where(model.id.in_(candidates),
+                                  model.name_key.like("%" + _like_escape(key) + "%", escape="\\"))
+
+
+def machines_with_catalog_term(term):
+    """Subconsulta com os ids das máquinas que têm software ou licença contendo term
+    a partir do início de uma palavra (ex.: "Reader" em "Adobe Reader", "365" em "Office 365").
+
+    LIKE 'prefixo%' sobre a palavra mais longa do termo usa o índice de software_word /
+    license_word (NOCASE no SQLite, text_pattern_ops no PostgreSQL); o LIKE '%termo%'
+    sobre name_key só percorre as entradas encontradas.
+    """
+    key = name_key(term)
+    words = WORD_RE.findall(key)
+    if not words:
+        return select(machine_software.c.machine_id).where(false())
+    word = max(words, key=len)
+    by_software = (
+        select(machine_software.c.machine_id)
+        .where(machine_software.c.software_id.in_(_catalog_matches(Software, key, word)))
+    )
+    by_license = (
+        select(machine_license.c.machine_id)
+        .where(machine_license.c.license_id.in_(_catalog_matches(License, key, word)))
+    )
+    return by_software.union(by_license)
+
+
+def license_usage():
+    """(License, máquinas em uso em todos os laboratórios, máquinas no laboratório atual)
+    para todas as licenças, numa única consulta agrupada.
+
+    seats vale para a instituição inteira, então a comparação usa o total.
+    """
+    lab_id = current_lab_id()
+    in_use = func.count(Machine.id)
+    in_lab = func.count(case((Machine.lab_id == lab_id, Machine.id))) if lab_id is not None else in_use
+    return (
+        db.session.query(License, in_use, in_lab)
+        .outerjoin(machine_license, machine_license.c.license_id == License.id)
+        .outerjoin(Machine, Machine.id == machine_license.c.machine_id)
+        .group_by(License.id)
+        .order_by(License.name)
+        .execution_options(include_all_labs=True)
+        .all()
+    )
+
+
+def software_usage(limit=50):
+    installs = func.count(Machine.id)
+    return (
+        db.session.query(Software, installs)
+        .join(machine_software, machine_software.c.software_id == Software.id)
+        .join(Machine, Machine.id == machine_software.c.machine_id)
+        .group_by(Software.id)
+        .order_by(installs.desc(), Software.name)
+        .limit(limit)
+        .all()
+    )
+
+
+def machine_catalog(machine_id):
+    """Máquina com softwares e licenças já carregados (página de detalhes)."""
+    return (
+        Machine.query.options(selectinload(Machine.softwares), selectinload(Machine.licenses))
+        .filter(Machine.id == machine_id)
+        .first()
+    )
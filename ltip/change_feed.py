@@ -0,0 +1,40 @@
+"""Cursor seguro dos feeds de alterações (equipment_change, machine_change).
+
+O id de uma linha do feed é reservado no INSERT, não no commit: no PostgreSQL a
+transação que pegou o id 41 pode terminar depois da que pegou o 42, e quem já
+leu até 42 nunca veria o 41. Por isso o cursor entregue aos clientes para antes
+de qualquer buraco recente na sequência: um id que falta logo abaixo de uma linha
+gravada há menos de CHANGE_FEED_GRACE_SECONDS pode ser uma transação ainda em
+andamento. Buracos mais antigos (rollbacks, ids pulados pela sequência) são
+ignorados. O que fica entre o cursor e a última linha é reenviado na próxima
+leitura, então o cliente precisa tolerar repetições.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from .config import CHANGE_FEED_GRACE_SECONDS
+from .extensions import db
+
+
+def settled_cursor(model, grace=CHANGE_FEED_GRACE_SECONDS):
+    """Maior id N do feed model tal que nenhuma linha com id <= N ainda vai aparecer.
+
+    Ler as linhas com id > N depois desta chamada não perde nenhuma alteração.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace)
+    # De cima para baixo pela chave primária; só as linhas recentes são percorridas
+    rows = (db.session.query(model.id, model.changed_at > cutoff)
+            .order_by(model.id.desc())
+            .yield_per(200))
+    cursor = 0
+    above = None
+    for change_id, recent in rows:
+        if above is None or change_id != above - 1:
+            cursor = change_id  # topo do feed, ou linha logo abaixo de um buraco recente
+        if not recent:
+            break
+        above = change_id
+    else:
+        if above is not None and above != 1:
+            cursor = 0  # só linhas recentes e ids faltando abaixo delas
+    return cursor
@@ -0,0 +1,194 @@
+"""Comandos da CLI (flask ...) e carga inicial do banco."""
+
+import os
+import shutil
+import tempfile
+
+import click
+from flask.cli import with_appcontext
+
+from .backup import BackupError, backup_database, latest_backup, list_backups, verify_backup
+from .config import BACKUP_DIR, BACKUP_KEEP, REPORT_COMPRESSION
+from .equipment_summary import rebuild_equipment_summary
+from .extensions import db
+from .labs import SLUG_RE, directory
+from .models import Lab, LabInfo, Report, User
+from .report_search import index_pending_reports
+from .report_storage import STORAGE_SUFFIXES, compress_file, report_storage_key
+from .storage import get_storage
+
+# ------------- DB init & defaults -------------
+def init_db_and_create_default_users():
+    # Deve ser chamada dentro de um app context (ver __main__)
+    # db.create_all() # <--- [REMOVIDO] Migrações (Flask-Migrate) farão este trabalho.
+
+    # Create default users if none exist
+    if User.query.count() == 0:
+        admin = User(username="rendeiro123", role="admin")
+        admin.set_password("admLTIP2025")
+        bols = User(username="arthur123", role="bolsista")
+        bols.set_password("LTIP2025")
+        visitor = User(username="visitante", role="visitor")
+        visitor.set_password("visitante123")
+        db.session.add_all([admin, bols, visitor])
+        db.session.commit()
+    if LabInfo.query.count() == 0:
+        info = LabInfo(
+            coordenador_name="Nome do Coordenador",
+            coordenador_email="coord@exemplo.com",
+            bolsista_name="Nome do Bolsista",
+            bolsista_email="bolsista@exemplo.com",
+        )
+        db.session.add(info)
+        db.session.commit()
+
+# ------------- CLI -------------
+@click.command("reports-index")
+@with_appcontext
+def reports_index_command():
+    """Indexa (de forma incremental) o texto dos relatórios pendentes."""
+    count = index_pending_reports()
+    print(f"{count} relatório(s) indexado(s).")
+
+@click.command("reports-compress")
+@with_appcontext
+def reports_compress_command():
+    """Comprime os relatórios já existentes que ainda estão sem compressão."""
+    storage = get_storage()
+    before = after = converted = 0
+    for rpt in Report.query.filter(Report.storage_encoding.is_(None)).all():
+        raw_key = report_storage_key(rpt)
+        if not storage.exists(raw_key):
+            print(f"Arquivo ausente, ignorado: {rpt.filename}")
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, rpt.filename)
+            with storage.open(raw_key) as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            rpt.original_size = os.path.getsize(path)
+            rpt.storage_encoding = compress_file(path, REPORT_COMPRESSION)
+            stored = path + STORAGE_SUFFIXES.get(rpt.storage_encoding, "")
+            after += os.path.getsize(stored)
+            if rpt.storage_encoding:
+                storage.put_file(report_storage_key(rpt), stored)
+        db.session.commit()
+        if rpt.storage_encoding:
+            storage.delete(raw_key)  # só depois do commit: falhas no meio deixam o original
+        before += rpt.original_size
+        converted += 1 if rpt.storage_encoding else 0
+    print(f"{converted} relatório(s) comprimido(s); {before} -> {after} bytes armazenados.")
+
+@click.group("backup", invoke_without_command=True)
+@click.option("--dir", "directory", default=BACKUP_DIR, show_default=True, help="Pasta dos backups.")
+@click.option("--keep", default=BACKUP_KEEP, show_default=True, help="Quantos backups manter.")
+@click.option("--verify", is_flag=True, help="Restaura a cópia num local temporário e confere.")
+@with_appcontext
+@click.pass_context
+def backup_command(ctx, directory, keep, verify):
+    """Backup online do banco (comprimido, com checksum e rotação)."""
+    if ctx.invoked_subcommand is not None:
+        return
+    try:
+        path = backup_database(directory, keep)
+        print(f"Backup gravado: {path} ({os.path.getsize(path)} bytes)")
+        if verify:
+            _print_verification(path)
+    except BackupError as e:
+        raise click.ClickException(str(e))
+
+def _print_verification(path):
+    tables = verify_backup(path)
+    print(f"Restauração verificada: {path}")
+    for table, rows in tables.items():
+        print(f"  {table}: {rows}")
+
+@backup_command.command("verify")
+@click.argument("path", required=False)
+@click.pass_context
+def backup_verify_command(ctx, path):
+    """Confere o checksum e restaura um backup (padrão: o mais recente)."""
+    path = path or latest_backup(ctx.parent.params["directory"])
+    if not path:
+        raise click.ClickException("Nenhum backup encontrado.")
+    try:
+        _print_verification(path)
+    except BackupError as e:
+        raise click.ClickException(str(e))
+
+@backup_command.command("list")
+@click.pass_context
+def backup_list_command(ctx):
+    """Lista os backups existentes, do mais antigo para o mais recente."""
+    for path in list_backups(ctx.parent.params["directory"]):
+        print(f"{path}  {os.path.getsize(path)} bytes")
+
+@click.command("inventory-summary")
+@click.option("--check", is_flag=True, help="Só compara, sem regravar o resumo.")
+@with_appcontext
+def inventory_summary_command(check):
+    """Recalcula o resumo do inventário (equipment_summary) e mostra as divergências."""
+    groups, diffs = rebuild_equipment_summary(check_only=check)
+    slugs = {lab.id: lab.slug for lab in Lab.query}
+    for (lab_id, *parts), stored, expected in diffs:
+        print(f"{slugs.get(lab_id, lab_id)}: {' / '.join(part or '-' for part in parts)}: gravado {stored}, esperado {expected}")
+    if not diffs:
+        print(f"Resumo consistente ({groups} grupo(s)).")
+    elif check:
+        raise click.ClickException(f"{len(diffs)} grupo(s) divergente(s).")
+    else:
+        print(f"{len(diffs)} grupo(s) corrigido(s); {groups} grupo(s) no total.")
+
+@click.group("labs")
+def labs_command():
+    """Laboratórios atendidos por esta instalação."""
+
+@labs_command.command("create")
+@click.argument("slug")
+@click.argument("name")
+@click.option("--host", default=None, help="Hostname que também leva a este laboratório.")
+@with_appcontext
+def labs_create_command(slug, name, host):
+    """Cadastra um laboratório (acessível em /lab/SLUG/)."""
+    if not SLUG_RE.match(slug):
+        raise click.ClickException("Slug inválido: use letras minúsculas, números e hífens (até 50).")
+    if Lab.query.filter_by(slug=slug).first():
+        raise click.ClickException(f"Já existe um laboratório com o slug {slug}.")
+    host = host.strip().lower() if host else None
+    if host and Lab.query.filter_by(hostname=host).first():
+        raise click.ClickException(f"O hostname {host} já pertence a outro laboratório.")
+    db.session.add(Lab(slug=slug, name=name.strip()[:200], hostname=host))
+    db.session.commit()
+    directory.invalidate()
+    print(f"Laboratório criado: /lab/{slug}/" + (f" e {host}" if host else ""))
+
+@labs_command.command("list")
+@with_appcontext
+def labs_list_command():
+    """Lista os laboratórios cadastrados e as contas de cada um."""
+    users = {}
+    for user in User.query.filter(User.lab_id.isnot(None)).order_by(User.username):
+        users.setdefault(user.lab_id, []).append(user.username)
+    for lab in Lab.query.order_by(Lab.slug):
+        print(f"{lab.slug}  {lab.name}" + (f"  ({lab.hostname})" if lab.hostname else ""))
+        if lab.id in users:
+            print(f"  contas: {', '.join(users[lab.id])}")
+
+@labs_command.command("set-user")
+@click.argument("username")
+@click.argument("slug", required=False)
+@with_appcontext
+def labs_set_user_command(username, slug):
+    """Restringe a conta USERNAME ao laboratório SLUG (sem SLUG: todos os laboratórios)."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"Usuário inexistente: {username}")
+    lab = None
+    if slug:
+        lab = Lab.query.filter_by(slug=slug).first()
+        if lab is None:
+            raise click.ClickException(f"Laboratório inexistente: {slug}")
+    user.lab_id = lab.id if lab else None
+    db.session.commit()
+    print(f"{username}: " + (f"somente /lab/{slug}/" if lab else "todos os laboratórios"))
+
+COMMANDS = (reports_index_command, reports_compress_command, backup_command, inventory_summary_command, labs_command)
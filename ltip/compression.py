@@ -0,0 +1,74 @@
+"""Compressão gzip/brotli das respostas HTML e JSON (Content-Encoding negociado)."""
+
+import gzip
+
+from flask import request
+
+from .config import RESPONSE_COMPRESSION, RESPONSE_COMPRESSION_MIN_SIZE
+
+COMPRESSIBLE_MIMETYPES = {"text/html", "application/json"}
+# Níveis moderados para respostas dinâmicas; arquivos estáticos usam o máximo (ver assets.py)
+DYNAMIC_LEVELS = {"gzip": 6, "br": 5}
+STATIC_LEVELS = {"gzip": 9, "br": 11}
+
+
+def supported_encodings(preferred=RESPONSE_COMPRESSION):
+    """Codificações de preferred disponíveis neste ambiente ("br" só com o pacote brotli)."""
+    available = []
+    for encoding in preferred:
+        if encoding == "br":
+            try:
+                import brotli  # noqa: F401  (dependência opcional)
+            except ImportError:
+                continue
+        if encoding in DYNAMIC_LEVELS:
+            available.append(encoding)
+    return available
+
+
+def compress_bytes(data, encoding, level):
+    if encoding == "gzip":
+        # mtime=0: mesma entrada, mesmos bytes (ETag estável)
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "br":
+        import brotli
+        return brotli.compress(data, quality=level)
+    raise ValueError(f"Codificação desconhecida: {encoding}")
+
+
+def negotiate_encoding(offered):
+    """Melhor codificação de offered aceita pelo cliente (respeitando q=0), ou None."""
+    return request.accept_encodings.best_match(offered) if offered else None
+
+
+def compress_response(response, encodings, min_size):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or "Content-Encoding" in response.headers or request.method == "HEAD"):
+        return response
+    if response.content_length is not None and response.content_length < min_size:
+        return response
+    encoding = negotiate_encoding(encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+    response.set_data(compress_bytes(data, encoding, DYNAMIC_LEVELS[encoding]))
+    response.headers["Content-Encoding"] = encoding
+    if response.get_etag()[0]:
+        response.set_etag(f"{response.get_etag()[0]}-{encoding}")
+    return response
+
+
+def init_app(app):
+    encodings = supported_encodings()
+    if not encodings:
+        return
+    min_size = RESPONSE_COMPRESSION_MIN_SIZE
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, encodings, min_size)
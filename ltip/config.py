@@ -0,0 +1,103 @@
+"""Configurações lidas do ambiente (sem efeitos colaterais no import)."""
+
+import os
+import tempfile
+
+# Pasta do projeto (acima do pacote): uploads/ e ltip.db continuam no mesmo lugar
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_FOLDER = os.path.join(APP_DIR, "uploads")
+DB_PATH = os.path.join(APP_DIR, "ltip.db")
+
+# Sensíveis via ambiente
+SECRET_KEY = os.environ.get("SECRET_KEY", "troque_esta_chave_em_producao")
+HOST_ENV = os.environ.get("HOST", "0.0.0.0")
+PORT_ENV = int(os.environ.get("PORT", 5000))
+FLASK_DEBUG = os.environ.get("FLASK_DEBUG", "False").lower() in ("1", "true", "yes")
+
+# Proteção do login contra força bruta (janela deslizante por IP e por usuário)
+# LOGIN_RATE_LIMIT_STORAGE: "memory" (por worker), "sqlite:///caminho.db" (compartilhado
+# entre workers do gunicorn no mesmo host) ou "redis://..." (requer o pacote redis)
+LOGIN_RATE_LIMIT_STORAGE = os.environ.get("LOGIN_RATE_LIMIT_STORAGE", "memory")
+LOGIN_RATE_WINDOW = int(os.environ.get("LOGIN_RATE_WINDOW", 300))  # segundos
+LOGIN_RATE_LIMIT_USER = int(os.environ.get("LOGIN_RATE_LIMIT_USER", 5))  # tentativas por usuário na janela
+LOGIN_RATE_LIMIT_IP = int(os.environ.get("LOGIN_RATE_LIMIT_IP", 20))  # tentativas por IP na janela
+LOGIN_RATE_MAX_KEYS = int(os.environ.get("LOGIN_RATE_MAX_KEYS", 10000))  # limite de memória do store local
+# Compressão dos relatórios em disco: "gzip" (padrão), "zstd" (requer zstandard) ou "none".
+# Arquivos que não encolhem pelo menos REPORT_COMPRESSION_MIN_SAVING ficam sem compressão.
+REPORT_COMPRESSION = os.environ.get("REPORT_COMPRESSION", "gzip").lower()
+REPORT_COMPRESSION_MIN_SAVING = float(os.environ.get("REPORT_COMPRESSION_MIN_SAVING", 0.05))
+# Compressão das respostas HTML/JSON: codificações em ordem de preferência ("br" requer
+# o pacote brotli) ou "none"; respostas menores que RESPONSE_COMPRESSION_MIN_SIZE vão sem compressão
+RESPONSE_COMPRESSION = [e.strip() for e in os.environ.get("RESPONSE_COMPRESSION", "br,gzip").lower().split(",") if e.strip() not in ("", "none")]
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", 1024))  # bytes
+# Armazenamento dos uploads: "local" (UPLOAD_FOLDER, padrão) ou "s3" (S3 ou compatível, como
+# MinIO via S3_ENDPOINT_URL; requer boto3 e as credenciais AWS_* do ambiente). Com S3, os
+# downloads são redirecionados para URLs pré-assinadas e o que o app precisa ler do disco fica
+# num cache LRU local de até UPLOAD_CACHE_MAX_BYTES.
+UPLOAD_STORAGE = os.environ.get("UPLOAD_STORAGE", "local").lower()
+S3_BUCKET = os.environ.get("S3_BUCKET")
+S3_PREFIX = os.environ.get("S3_PREFIX", "")  # ex.: "uploads/"
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None
+S3_REGION = os.environ.get("S3_REGION") or None
+S3_PRESIGNED_REDIRECTS = os.environ.get("S3_PRESIGNED_REDIRECTS", "True").lower() in ("1", "true", "yes")
+S3_PRESIGNED_EXPIRES = int(os.environ.get("S3_PRESIGNED_EXPIRES", 300))  # segundos
+UPLOAD_CACHE_DIR = os.environ.get("UPLOAD_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ltip-upload-cache"))
+UPLOAD_CACHE_MAX_BYTES = int(os.environ.get("UPLOAD_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# Blueprints registrados neste worker: "all" (padrão), "kiosk" (apenas listagens)
+# ou uma lista separada por vírgulas (inventory,machines,reports,auth,admin)
+LTIP_BLUEPRINTS = os.environ.get("LTIP_BLUEPRINTS", "all")
+# Quantidade de proxies reversos confiáveis à frente do app (ex.: 1 no Render) para obter o IP real
+TRUSTED_PROXIES = int(os.environ.get("TRUSTED_PROXIES", 0))
+
+# Tema (mantido)
+COLOR_DARK = "#003366"
+COLOR_LIGHT = "#66B2FF"
+COLOR_WHITE = "#FFFFFF"
+
+# <--- [MODIFICADO] Lógica para conexão dinâmica ao banco de dados (PostgreSQL/SQLite)
+database_uri = os.environ.get("DATABASE_URL")
+if database_uri:
+    # Correção para o Render/SQLAlchemy: troca 'postgres://' por 'postgresql://'
+    if database_uri.startswith("postgres://"):
+        database_uri = database_uri.replace("postgres://", "postgresql://", 1)
+else:
+    # Fallback para SQLite em desenvolvimento
+    database_uri = f"sqlite:///{DB_PATH}"
+# ---> FIM DA MODIFICAÇÃO
+
+def normalize_database_url(url):
+    # Mesma correção do Render aplicada às réplicas
+    url = url.strip()
+    return url.replace("postgres://", "postgresql://", 1) if url.startswith("postgres://") else url
+
+# Réplicas de leitura (opcional): URLs separadas por vírgula. Listagens e páginas de
+# detalhe passam a ler delas; ver ltip/replicas.py
+DATABASE_REPLICA_URLS = [normalize_database_url(u) for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 5))  # atraso máximo tolerado
+REPLICA_CHECK_INTERVAL = float(os.environ.get("REPLICA_CHECK_INTERVAL", 2))  # segundos entre verificações
+
+# Atualizações ao vivo de /machines (SSE). Cada worker tem um único leitor do feed
+# machine_change: no PostgreSQL acorda com LISTEN/NOTIFY, nos demais bancos consulta
+# a cada MACHINE_EVENTS_POLL_INTERVAL segundos. Rode o gunicorn com workers gevent
+# (gunicorn.conf.py) para que conexões ociosas não ocupem uma thread cada.
+MACHINE_EVENTS_POLL_INTERVAL = float(os.environ.get("MACHINE_EVENTS_POLL_INTERVAL", 1))
+MACHINE_EVENTS_HEARTBEAT = float(os.environ.get("MACHINE_EVENTS_HEARTBEAT", 15))  # segundos entre pings
+MACHINE_EVENTS_BUFFER = int(os.environ.get("MACHINE_EVENTS_BUFFER", 500))  # alterações mantidas em memória
+# Feeds machine_change/equipment_change (ltip/change_feed.py): o id é reservado no INSERT e
+# não no commit, então buracos recentes na sequência podem ser transações em andamento.
+# Deve ser maior que a transação de escrita mais longa; o que cai nessa janela é reenviado.
+CHANGE_FEED_GRACE_SECONDS = float(os.environ.get("CHANGE_FEED_GRACE_SECONDS", 30))
+
+# Backups online do banco (flask backup; ver ltip/backup.py). Com BACKUP_INTERVAL_HOURS > 0
+# os workers também fazem backups periódicos (um por vez, coordenados por um lock em BACKUP_DIR).
+BACKUP_DIR = os.environ.get("BACKUP_DIR", os.path.join(APP_DIR, "backups"))
+BACKUP_KEEP = int(os.environ.get("BACKUP_KEEP", 7))  # backups mantidos; os mais antigos são apagados
+BACKUP_INTERVAL_HOURS = float(os.environ.get("BACKUP_INTERVAL_HOURS", 0))  # 0 = só pela CLI
+BACKUP_SQLITE_PAGES = int(os.environ.get("BACKUP_SQLITE_PAGES", 256))  # páginas copiadas por passo
+BACKUP_STEP_SLEEP = float(os.environ.get("BACKUP_STEP_SLEEP", 0.02))  # pausa entre passos (escritas seguem)
+BACKUP_VERIFY_DATABASE_URL = os.environ.get("BACKUP_VERIFY_DATABASE_URL")  # PostgreSQL descartável para o teste de restauração
+
+# Vários laboratórios numa só instalação (ver ltip/labs.py). Sem /lab/<slug> na URL e sem
+# hostname cadastrado para o Host da requisição, vale o laboratório DEFAULT_LAB.
+DEFAULT_LAB = os.environ.get("DEFAULT_LAB", "ltip")
+LAB_CACHE_SECONDS = float(os.environ.get("LAB_CACHE_SECONDS", 60))  # cadastro de laboratórios em memória
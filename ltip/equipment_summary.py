@@ -0,0 +1,178 @@
+"""Resumo do inventário por localização, finalidade e marca.
+
+equipment_summary guarda, por grupo (dentro de cada laboratório), quantos cadastros e quantas unidades
+existem. Um listener before_flush aplica a diferença de cada Equipment criado,
+alterado ou removido na mesma transação (add_equipment, edit_equipment,
+/api/equipment/<id>), então a página de resumo lê uma linha por grupo, sem
+varrer equipment. UPDATE/DELETE em massa (fora do ORM) não passam pelo
+listener; "flask inventory-summary" recalcula a tabela e mostra divergências.
+"""
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+
+from .extensions import db
+from .models import Equipment, EquipmentSummary
+from .replicas import RoutingSession
+
+GROUP_FIELDS = {"localizacao": "Localização", "finalidade": "Finalidade", "marca": "Marca"}
+KEY_COLUMNS = ("lab_id", "localizacao", "finalidade", "marca")
+
+
+def group_key(lab_id, localizacao, finalidade, marca):
+    return (lab_id, (localizacao or "").strip()[:200], (finalidade or "").strip()[:200], (marca or "").strip()[:100])
+
+
+def _loaded_state(obj):
+    # Valores com que o objeto foi carregado: o histórico guarda o antigo dos atributos
+    # alterados. None se algum atributo não estava carregado (expirado).
+    attrs = inspect(obj).attrs
+    values = []
+    for name in ("lab_id", "localizacao", "finalidade", "marca", "quantidade"):
+        history = attrs[name].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            return None
+    return group_key(*values[:4]), values[4] or 0
+
+
+def _stored_state(connection, ids):
+    # Estado gravado dos equipamentos cujo estado carregado não se conhece; a linha
+    # fica travada até o commit (no PostgreSQL), como em lock_equipment
+    rows = connection.execute(
+        select(Equipment.id, Equipment.lab_id, Equipment.localizacao, Equipment.finalidade, Equipment.marca,
+               Equipment.quantidade)
+        .where(Equipment.id.in_(ids))
+        .with_for_update()
+    )
+    return {row[0]: (group_key(*row[1:5]), row[5] or 0) for row in rows}
+
+
+def _collect_deltas(session, connection):
+    """Diferenças por grupo deste flush.
+
+    O valor antigo vem do estado carregado, não de um SELECT agora: com duas edições
+    simultâneas o banco já pode ter o valor da outra, e a diferença seria contada
+    duas vezes. Por isso as rotas de edição carregam o equipamento com a linha
+    travada (inventory_sync.lock_equipment).
+    """
+    deltas = {}
+
+    def add(key, cadastros, unidades):
+        current = deltas.get(key, (0, 0))
+        deltas[key] = (current[0] + cadastros, current[1] + unidades)
+
+    changed = [obj for obj in session.dirty if isinstance(obj, Equipment) and session.is_modified(obj)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Equipment)]
+    old = {obj.id: _loaded_state(obj) for obj in changed + deleted}
+    unknown = [obj_id for obj_id, state in old.items() if state is None]
+    if unknown:
+        old.update(_stored_state(connection, unknown))
+    for obj in session.new:
+        if isinstance(obj, Equipment):
+            # quantidade None recebe o default da coluna (1) no INSERT
+            add(group_key(obj.lab_id, obj.localizacao, obj.finalidade, obj.marca), 1, 1 if obj.quantidade is None else obj.quantidade)
+    for obj in changed + deleted:
+        if old.get(obj.id) is not None:
+            key, unidades = old[obj.id]
+            add(key, -1, -unidades)
+    for obj in changed:
+        add(group_key(obj.lab_id, obj.localizacao, obj.finalidade, obj.marca), 1, obj.quantidade or 0)
+    return {key: delta for key, delta in deltas.items() if delta != (0, 0)}
+
+
+def _upsert(connection, key, cadastros, unidades):
+    table = EquipmentSummary.__table__
+    values = dict(zip(KEY_COLUMNS, key), cadastros=cadastros, unidades=unidades)
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table).values(**values)
+        # Atômico mesmo com dois workers criando o mesmo grupo ao mesmo tempo
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={"cadastros": table.c.cadastros + stmt.excluded.cadastros,
+                  "unidades": table.c.unidades + stmt.excluded.unidades},
+        ))
+        return
+    result = connection.execute(
+        update(table)
+        .where(*(table.c[column] == value for column, value in zip(KEY_COLUMNS, key)))
+        .values(cadastros=table.c.cadastros + cadastros, unidades=table.c.unidades + unidades)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(**values))
+
+
+def _apply_summary_deltas(session, flush_context, instances):
+    # Depois de labs._assign_lab (registrado com insert=True): objetos novos já têm lab_id
+    if not any(isinstance(obj, Equipment) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return
+    connection = session.connection()
+    deltas = _collect_deltas(session, connection)
+    for key, (cadastros, unidades) in deltas.items():
+        _upsert(connection, key, cadastros, unidades)
+    if any(cadastros < 0 for cadastros, _ in deltas.values()):
+        table = EquipmentSummary.__table__
+        connection.execute(delete(table).where(table.c.cadastros <= 0))
+
+
+def init_app(app):
+    if not event.contains(RoutingSession, "before_flush", _apply_summary_deltas):
+        event.listen(RoutingSession, "before_flush", _apply_summary_deltas)
+
+
+def summary_rows(by=None):
+    """Linhas do resumo: por grupo completo, ou somadas por um único campo (by)."""
+    if by is None:
+        return (EquipmentSummary.query
+                .order_by(EquipmentSummary.localizacao, EquipmentSummary.finalidade, EquipmentSummary.marca)
+                .all())
+    column = getattr(EquipmentSummary, by)
+    return (db.session.query(column.label(by), func.sum(EquipmentSummary.cadastros).label("cadastros"),
+                             func.sum(EquipmentSummary.unidades).label("unidades"))
+            .group_by(column)
+            .order_by(column)
+            .all())
+
+
+def summary_totals():
+    return db.session.query(func.coalesce(func.sum(EquipmentSummary.cadastros), 0),
+                            func.coalesce(func.sum(EquipmentSummary.unidades), 0)).one()
+
+
+def compute_summary():
+    """Totais recalculados a partir de equipment (para conferência)."""
+    totals = {}
+    rows = db.session.query(Equipment.lab_id, Equipment.localizacao, Equipment.finalidade, Equipment.marca,
+                            Equipment.quantidade)
+    for lab_id, localizacao, finalidade, marca, quantidade in rows.yield_per(1000):
+        key = group_key(lab_id, localizacao, finalidade, marca)
+        cadastros, unidades = totals.get(key, (0, 0))
+        totals[key] = (cadastros + 1, unidades + (quantidade or 0))
+    return totals
+
+
+def rebuild_equipment_summary(check_only=False):
+    """Compara equipment_summary com o recálculo e, se check_only for falso, a regrava.
+
+    Devolve (número de grupos, [(grupo, gravado, esperado)] para os que divergem).
+    """
+    expected = compute_summary()
+    stored = {(r.lab_id, r.localizacao, r.finalidade, r.marca): (r.cadastros, r.unidades) for r in EquipmentSummary.query}
+    diffs = [(key, stored.get(key), expected.get(key))
+             for key in sorted(set(expected) | set(stored)) if stored.get(key) != expected.get(key)]
+    if diffs and not check_only:
+        db.session.execute(delete(EquipmentSummary))
+        if expected:
+            db.session.execute(insert(EquipmentSummary), [
+                dict(zip(KEY_COLUMNS, key), cadastros=cadastros, unidades=unidades)
+                for key, (cadastros, unidades) in expected.items()
+            ])
+        db.session.commit()
+    return len(expected), diffs
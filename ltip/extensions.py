@@ -0,0 +1,7 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from .replicas import RoutingSession
+
+# Extensões sem app: a ligação (engine, migrações) é feita em create_app()
+# RoutingSession envia leituras de views @read_only para réplicas, se configuradas
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from flask import flash, jsonify, redirect, session, url_for
+from werkzeug.utils import secure_filename
+
+from .extensions import db
+from .labs import user_in_lab
+from .models import LabInfo, Report, User
+from .storage import get_storage
+
+# ------------- Helpers -------------
+# ... (Funções helpers inalteradas) ...
+
+def get_status_color(status):
+    if not status:
+        return 'color: #666;'
+    s = status.lower()
+    if 'formatado' in s:
+        return 'color: #1abc9c; font-weight: bold;'
+    elif 'não formatado' in s or 'nao formatado' in s:
+        return 'color: #e74c3c; font-weight: bold;'
+    elif 'andamento' in s or 'em andamento' in s:
+        return 'color: #f39c12; font-weight: bold;'
+    return 'color: #666;'
+
+def get_lab_info():
+    db.session.expire_all()
+    info = LabInfo.query.first()
+    if not info:
+        info = LabInfo(
+            coordenador_name='Nome do Coordenador',
+            coordenador_email='coord@exemplo.com',
+            bolsista_name='Nome do Bolsista',
+            bolsista_email='bolsista@exemplo.com'
+        )
+        db.session.add(info)
+        db.session.commit()
+    return info
+
+def current_user():
+    uid = session.get("user_id")
+    return User.query.get(uid) if uid else None
+
+def roles_required(allowed_roles, api=False, all_labs=False):
+    # all_labs=True: só contas sem laboratório (ver labs.user_in_lab)
+    from functools import wraps
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user = current_user()
+            if not user or user.role not in allowed_roles:
+                message = 'Acesso negado: permissões insuficientes.'
+            elif not user_in_lab(user, all_labs):
+                message = 'Acesso negado: sua conta não pertence a este laboratório.'
+            else:
+                return f(*args, **kwargs)
+            if api:
+                return jsonify(error=message), 403
+            flash(message, 'danger')
+            return redirect(url_for('index'))
+        return decorated
+    return decorator
+
+def upload_filename(file_storage):
+    # Nome único (com timestamp) para o arquivo enviado; None se não houver arquivo
+    if not file_storage:
+        return None
+    filename = secure_filename(file_storage.filename)
+    if filename == '':
+        return None
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S%f')
+    return f"{timestamp}_{filename}"
+
+def save_uploaded_file(file_storage):
+    filename = upload_filename(file_storage)
+    if filename is None:
+        return None
+    # Envia em streaming para o armazenamento configurado (disco local ou S3)
+    get_storage().put(filename, file_storage.stream, content_type=file_storage.mimetype or None)
+    return filename
+
+def allowed_reports_list():
+    return Report.query.order_by(Report.uploaded_at.desc()).all()
@@ -0,0 +1,140 @@
+"""Sincronização do inventário com o modo offline (service worker + IndexedDB).
+
+Toda alteração de equipamento grava uma linha em equipment_change na mesma
+transação; o id dessa linha é a versão. O cliente guarda a versão devolvida pelo
+servidor (um cursor seguro, ver change_feed.py) e pede só o que mudou depois dela
+(/api/inventory?since=N). Edições feitas sem rede ficam numa fila no navegador e
+são reenviadas com a versão do item em que se basearam (base_seq): se o item mudou
+no servidor nesse meio-tempo, a edição é recusada com 409 e o usuário decide o que
+fazer. A versão de um item é conferida com a linha travada (lock_equipment), então
+as alterações de um mesmo equipamento nunca chegam fora de ordem.
+"""
+
+from flask import url_for
+from sqlalchemy import func, select
+
+from .change_feed import settled_cursor
+from .extensions import db
+from .models import Equipment, EquipmentChange
+
+EDITABLE_FIELDS = ("name", "tombo", "quantidade", "modelo", "marca", "localizacao", "finalidade")
+FIELD_MAX_LENGTHS = {"name": 200, "tombo": 100, "modelo": 100, "marca": 100, "localizacao": 200, "finalidade": 200}
+
+
+class EquipmentEditError(ValueError):
+    pass
+
+
+class EquipmentConflict(Exception):
+    def __init__(self, item, seq):
+        super().__init__("Equipamento alterado por outra pessoa.")
+        self.item = item
+        self.seq = seq
+
+
+def record_equipment_change(equipment):
+    """Registra a alteração de equipment no feed; chamar antes do commit."""
+    db.session.flush()  # cadastro novo: garante equipment.id
+    db.session.add(EquipmentChange(equipment_id=equipment.id))
+
+
+def latest_equipment_change():
+    return db.session.query(func.max(EquipmentChange.id)).scalar() or 0
+
+
+def _versions():
+    # Versão atual de cada equipamento; os que nunca mudaram desde o feed ficam com 0
+    return (
+        select(EquipmentChange.equipment_id, func.max(EquipmentChange.id).label("seq"))
+        .group_by(EquipmentChange.equipment_id)
+        .subquery()
+    )
+
+
+def equipment_seq(equipment_id):
+    return (db.session.query(func.max(EquipmentChange.id))
+            .filter(EquipmentChange.equipment_id == equipment_id)
+            .scalar() or 0)
+
+
+def equipment_json(item, seq):
+    data = {field: getattr(item, field) for field in EDITABLE_FIELDS}
+    data["id"] = item.id
+    data["seq"] = seq
+    data["imagem_url"] = url_for("uploaded_file", filename=item.imagem_filename) if item.imagem_filename else None
+    return data
+
+
+def inventory_delta(since):
+    """Equipamentos alterados depois da versão since (todos, se since for 0 ou desconhecida).
+
+    A versão devolvida é o cursor seguro do feed (change_feed.settled_cursor), não a
+    maior versão: uma alteração com versão menor que ainda não tinha sido gravada
+    (commit fora de ordem) chega na próxima sincronização, junto com as repetidas.
+    """
+    # Lidas antes dos itens: nada fica entre as leituras
+    seq = settled_cursor(EquipmentChange)
+    latest = latest_equipment_change()
+    full = since <= 0 or since > latest
+    versions = _versions()
+    query = (db.session.query(Equipment, func.coalesce(versions.c.seq, 0))
+             .outerjoin(versions, versions.c.equipment_id == Equipment.id))
+    if not full:
+        changed = select(EquipmentChange.equipment_id).where(EquipmentChange.id > since)
+        query = query.filter(Equipment.id.in_(changed))
+    items = [equipment_json(item, seq) for item, seq in query.order_by(Equipment.name)]
+    return {"seq": seq, "full": full, "items": items}
+
+
+def parse_equipment_changes(data):
+    """Valida os campos de uma edição enviada pelo cliente offline."""
+    changes = {}
+    for field in EDITABLE_FIELDS:
+        if field not in data:
+            continue
+        value = data[field]
+        if field == "quantidade":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise EquipmentEditError("Quantidade inválida.")
+            if value < 1:
+                raise EquipmentEditError("Quantidade inválida.")
+        else:
+            value = str(value or "").strip()[:FIELD_MAX_LENGTHS[field]]
+            if field == "name" and not value:
+                raise EquipmentEditError("O nome do equipamento é obrigatório.")
+        changes[field] = value
+    if not changes:
+        raise EquipmentEditError("Nenhuma alteração informada.")
+    return changes
+
+
+def lock_equipment(equipment_id):
+    """Carrega o equipamento com a linha travada até o commit (None se não existe).
+
+    populate_existing: se o objeto já estava na sessão, os valores são relidos
+    junto com a trava. O resumo (equipment_summary) desconta esses valores.
+    """
+    return Equipment.query.filter_by(id=equipment_id).with_for_update().populate_existing().first()
+
+
+def apply_equipment_edit(equipment_id, base_seq, changes):
+    """Aplica changes se o equipamento ainda está na versão base_seq e faz commit.
+
+    Devolve o item em JSON com a nova versão; levanta EquipmentConflict com o item
+    atual quando outra edição chegou antes. Devolve None se o equipamento não existe.
+    """
+    item = lock_equipment(equipment_id)
+    if item is None:
+        return None
+    seq = equipment_seq(item.id)
+    if seq > base_seq:
+        current = equipment_json(item, seq)
+        db.session.rollback()
+        raise EquipmentConflict(current, seq)
+    for field, value in changes.items():
+        setattr(item, field, value)
+    record_equipment_change(item)
+    db.session.commit()
+    return equipment_json(item, equipment_seq(item.id))
@@ -0,0 +1,165 @@
+"""Vários laboratórios numa só instalação.
+
+O laboratório da requisição vem de:
+ - /lab/<slug>/...: LabPathMiddleware move o prefixo para SCRIPT_NAME, então as
+   rotas continuam as mesmas e url_for já gera links dentro do laboratório;
+ - o Host da requisição, se algum laboratório tiver esse hostname;
+ - senão, DEFAULT_LAB.
+
+Toda consulta ORM (SELECT, UPDATE e DELETE) às tabelas LabScoped recebe
+lab_id = <laboratório atual> via with_loader_criteria, inclusive carregamentos
+de relacionamentos; objetos novos recebem lab_id no before_flush. Fora de uma
+requisição (CLI, threads de fundo) nada é filtrado, e objetos novos vão para
+DEFAULT_LAB. SQL textual (busca de relatórios) precisa filtrar por conta própria.
+
+Contas com lab_id só alteram dados daquele laboratório; contas sem lab_id valem
+para todos (roles_required confere com user_in_lab).
+"""
+
+import re
+import threading
+import time
+
+from flask import abort, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import with_loader_criteria
+
+from .config import DEFAULT_LAB, LAB_CACHE_SECONDS
+from .models import Lab, LabScoped
+from .replicas import RoutingSession
+
+LAB_PATH_PREFIX = "/lab/"
+SLUG_RE = re.compile(r"^[a-z0-9][a-z0-9-]{0,49}$")
+
+
+class LabPathMiddleware:
+    """WSGI: /lab/<slug>/resto vira SCRIPT_NAME=/lab/<slug> e PATH_INFO=/resto."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path.startswith(LAB_PATH_PREFIX):
+            slug, _, rest = path[len(LAB_PATH_PREFIX):].partition("/")
+            if SLUG_RE.match(slug):
+                environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + LAB_PATH_PREFIX + slug
+                environ["PATH_INFO"] = "/" + rest
+                environ["ltip.lab_slug"] = slug
+        return self.app(environ, start_response)
+
+
+class LabDirectory:
+    """Cadastro de laboratórios em memória, relido a cada LAB_CACHE_SECONDS."""
+
+    def __init__(self, ttl=LAB_CACHE_SECONDS):
+        self.ttl = ttl
+        self._loaded_at = 0.0
+        self._by_slug = {}
+        self._by_host = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        if time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self.ttl:
+                return
+            labs = Lab.query.all()
+            self._by_slug = {lab.slug: _LabRef(lab) for lab in labs}
+            self._by_host = {lab.hostname.lower(): self._by_slug[lab.slug] for lab in labs if lab.hostname}
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._loaded_at = 0.0
+
+    def by_slug(self, slug):
+        self._refresh()
+        return self._by_slug.get(slug)
+
+    def by_host(self, host):
+        self._refresh()
+        return self._by_host.get(host.lower())
+
+    def all(self):
+        self._refresh()
+        return sorted(self._by_slug.values(), key=lambda lab: lab.name)
+
+
+class _LabRef:
+    # Cópia desanexada da sessão: pode ser compartilhada entre requisições
+    __slots__ = ("id", "slug", "name", "hostname")
+
+    def __init__(self, lab):
+        self.id, self.slug, self.name, self.hostname = lab.id, lab.slug, lab.name, lab.hostname
+
+
+directory = LabDirectory()
+
+
+def current_lab():
+    return g.get("ltip_lab") if has_request_context() else None
+
+
+def current_lab_id():
+    lab = current_lab()
+    return lab.id if lab else None
+
+
+def user_in_lab(user, all_labs=False):
+    """user pode alterar dados do laboratório atual? Com all_labs, só contas sem laboratório
+    (dados compartilhados, como a quantidade de licenças adquiridas)."""
+    if user.lab_id is None:
+        return True
+    return not all_labs and user.lab_id == current_lab_id()
+
+
+def default_lab_id():
+    lab = directory.by_slug(DEFAULT_LAB)
+    if lab is None:
+        raise RuntimeError(f"Laboratório padrão inexistente: {DEFAULT_LAB} (veja flask labs create).")
+    return lab.id
+
+
+def _resolve_lab():
+    slug = request.environ.get("ltip.lab_slug")
+    if slug:
+        lab = directory.by_slug(slug)
+        if lab is None:
+            abort(404)
+    else:
+        lab = directory.by_host(request.host.partition(":")[0]) or directory.by_slug(DEFAULT_LAB)
+    g.ltip_lab = lab
+
+
+def _scope_to_lab(state):
+    if not (state.is_select or state.is_update or state.is_delete):
+        return
+    if state.execution_options.get("include_all_labs"):
+        return
+    lab_id = current_lab_id()
+    if lab_id is None:
+        return
+    state.statement = state.statement.options(
+        with_loader_criteria(LabScoped, lambda cls: cls.lab_id == lab_id, include_aliases=True)
+    )
+
+
+def _assign_lab(session, flush_context, instances):
+    lab_id = None
+    for obj in session.new:
+        if isinstance(obj, LabScoped) and obj.lab_id is None:
+            if lab_id is None:
+                lab_id = current_lab_id() or default_lab_id()
+            obj.lab_id = lab_id
+
+
+def init_app(app):
+    app.wsgi_app = LabPathMiddleware(app.wsgi_app)
+    app.before_request(_resolve_lab)
+    app.jinja_env.globals["current_lab"] = current_lab
+    if not event.contains(RoutingSession, "do_orm_execute", _scope_to_lab):
+        event.listen(RoutingSession, "do_orm_execute", _scope_to_lab)
+    if not event.contains(RoutingSession, "before_flush", _assign_lab):
+        # insert=True: roda antes dos outros before_flush (o resumo de equipamentos usa lab_id)
+        event.listen(RoutingSession, "before_flush", _assign_lab, insert=True)
@@ -0,0 +1,87 @@
+"""Atualização em lote de máquinas (ex.: depois de formatar uma sala inteira).
+
+Uma operação é um único UPDATE ... WHERE id IN (...), uma linha em audit_log e
+um único INSERT ... SELECT no feed machine_change, que é o que avisa as listagens
+abertas (SSE) de todos os workers. Não há cache de páginas a invalidar além disso.
+"""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import update
+
+from .extensions import db
+from .machine_events import record_machine_changes
+from .models import AuditLog, Machine
+
+BULK_DATE_FIELDS = ("ultima_formatacao_data", "limpeza_fisica_data")
+MACHINE_STATUSES = ("Formatado", "Não formatado", "Em andamento")
+MAX_BULK_MACHINES = 1000
+
+
+class BulkUpdateError(ValueError):
+    pass
+
+
+def parse_machine_ids(values):
+    if not isinstance(values, (list, tuple)):
+        raise BulkUpdateError("IDs de máquina inválidos.")
+    try:
+        ids = sorted({int(v) for v in values})
+    except (TypeError, ValueError):
+        raise BulkUpdateError("IDs de máquina inválidos.")
+    if not ids:
+        raise BulkUpdateError("Selecione ao menos uma máquina.")
+    if len(ids) > MAX_BULK_MACHINES:
+        raise BulkUpdateError(f"No máximo {MAX_BULK_MACHINES} máquinas por operação.")
+    return ids
+
+
+def parse_bulk_changes(data):
+    """Valida os campos do formulário ou do JSON; campos vazios ficam como estão."""
+    changes = {}
+    status = str(data.get("status") or "").strip()
+    if status:
+        if status not in MACHINE_STATUSES:
+            raise BulkUpdateError(f"Status inválido: {status}")
+        changes["status"] = status
+    for field in BULK_DATE_FIELDS:
+        value = str(data.get(field) or "").strip()
+        if value:
+            # Diferente do formulário individual, data inválida não vira "sem data" em N máquinas
+            try:
+                changes[field] = datetime.strptime(value, "%Y-%m-%d").date()
+            except ValueError:
+                raise BulkUpdateError(f"Data inválida: {value}")
+    responsavel = str(data.get("responsavel_formatacao") or "").strip()
+    if responsavel:
+        changes["responsavel_formatacao"] = responsavel[:80]
+    if not changes:
+        raise BulkUpdateError("Nenhuma alteração informada.")
+    return changes
+
+
+def bulk_update_machines(ids, changes, username):
+    """Aplica changes às máquinas ids e faz commit. Devolve (máquinas alteradas, AuditLog).
+
+    Levanta BulkUpdateError se nenhuma das máquinas existir no laboratório atual.
+    """
+    # Só as máquinas visíveis (laboratório atual); o INSERT ... SELECT do feed não passa pelo filtro
+    ids = [machine_id for (machine_id,) in db.session.query(Machine.id).filter(Machine.id.in_(ids))]
+    if not ids:
+        raise BulkUpdateError("Nenhuma das máquinas selecionadas foi encontrada.")
+    result = db.session.execute(
+        update(Machine).where(Machine.id.in_(ids)).values(**changes),
+        execution_options={"synchronize_session": False},
+    )
+    audit = AuditLog(
+        username=username,
+        action="machine.bulk_update",
+        target_ids=json.dumps(ids),
+        details=json.dumps({k: v.isoformat() if k in BULK_DATE_FIELDS else v for k, v in changes.items()},
+                           ensure_ascii=False),
+    )
+    db.session.add(audit)
+    record_machine_changes(ids)
+    db.session.commit()
+    return result.rowcount, audit
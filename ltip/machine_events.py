@@ -0,0 +1,223 @@
+"""Atualizações ao vivo da listagem de máquinas via Server-Sent Events.
+
+add_machine/edit_machine gravam uma linha em machine_change na mesma transação
+da alteração (e, no PostgreSQL, um NOTIFY, entregue só no commit). Cada worker
+tem um único leitor desse feed (MachineEventHub), que busca as máquinas
+alteradas uma vez e as guarda num buffer circular; cada assinante de
+/machines/events só espera numa Condition e lê do buffer, sem consultar o banco.
+Com workers gevent, um assinante ocioso custa uma greenlet, não uma thread.
+"""
+
+import json
+import select
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import func, insert, literal, select as sql_select, text
+
+from .change_feed import settled_cursor
+from .config import MACHINE_EVENTS_BUFFER, MACHINE_EVENTS_HEARTBEAT, MACHINE_EVENTS_POLL_INTERVAL
+from .extensions import db
+from .models import Machine, MachineChange
+
+NOTIFY_CHANNEL = "machine_change"
+
+
+def _notify_machine_change():
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text(f"NOTIFY {NOTIFY_CHANNEL}"))
+
+
+def record_machine_change(machine):
+    """Registra a alteração de machine no feed; chamar antes do commit."""
+    db.session.flush()  # cadastro novo: garante machine.id
+    db.session.add(MachineChange(machine_id=machine.id))
+    _notify_machine_change()
+
+
+def record_machine_changes(machine_ids):
+    """Registra várias máquinas no feed com um único INSERT ... SELECT; chamar antes do commit."""
+    now = datetime.now(timezone.utc)
+    db.session.execute(insert(MachineChange).from_select(
+        ["machine_id", "changed_at"],
+        sql_select(Machine.id, literal(now, db.DateTime)).where(Machine.id.in_(machine_ids)).order_by(Machine.id),
+    ))
+    _notify_machine_change()
+
+
+def latest_machine_change():
+    return db.session.query(func.max(MachineChange.id)).scalar() or 0
+
+
+class MachineEventHub:
+    """Leitor do feed machine_change de um worker e buffer dos eventos publicados.
+
+    Um id menor pode ser gravado depois de um maior (commit fora de ordem, ver
+    change_feed.py): o leitor relê tudo acima do cursor seguro e pula os ids já
+    publicados. Por isso cada evento ganha uma posição local, na ordem em que foi
+    publicado, e os assinantes acompanham essa posição em vez do id.
+    """
+
+    def __init__(self, app, buffer_size=MACHINE_EVENTS_BUFFER, poll_interval=MACHINE_EVENTS_POLL_INTERVAL,
+                 heartbeat=MACHINE_EVENTS_HEARTBEAT):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.events = deque(maxlen=buffer_size)  # (pos, seq, Machine desanexada da sessão)
+        self.pos = 0  # posição do último evento publicado
+        self.floor_pos = 0  # eventos com pos <= floor_pos já não estão no buffer
+        self.floor_seq = 0  # maior seq que saiu do buffer (ou anterior ao início do leitor)
+        self.cursor = 0  # cursor seguro: toda alteração com seq <= cursor já foi publicada
+        self.seen = set()  # seqs acima do cursor já publicados
+        self.subscribers = 0
+        self._cond = threading.Condition()
+
+    def start(self):
+        with self.app.app_context():
+            self.cursor = self.floor_seq = max(latest_machine_change() - self.events.maxlen, 0)
+            self._poll()
+            db.session.remove()
+        threading.Thread(target=self._run, name="machine-events", daemon=True).start()
+
+    def _fetch(self, rows):
+        if not rows:
+            return []
+        machines = {m.id: m for m in Machine.query.filter(Machine.id.in_({r.machine_id for r in rows}))}
+        db.session.expunge_all()
+        return [(seq, machines.get(machine_id)) for seq, machine_id in rows]
+
+    def _poll(self):
+        """Publica as alterações ainda não vistas acima do cursor seguro.
+
+        Lê em páginas de até um buffer, sem esperar o próximo aviso quando a página
+        vem cheia (ex.: edição em massa logo antes do NOTIFY).
+        """
+        settled = settled_cursor(MachineChange)  # antes das leituras: nada fica entre elas
+        after = self.cursor
+        while True:
+            rows = (db.session.query(MachineChange.id, MachineChange.machine_id)
+                    .filter(MachineChange.id > after)
+                    .order_by(MachineChange.id)
+                    .limit(self.events.maxlen)
+                    .all())
+            self._publish(self._fetch([row for row in rows if row.id not in self.seen]))
+            if len(rows) < self.events.maxlen:
+                break
+            after = rows[-1].id
+        with self._cond:
+            if settled > self.cursor:
+                self.cursor = settled
+                self.seen = {seq for seq in self.seen if seq > settled}
+
+    def _publish(self, changes):
+        if not changes:
+            return
+        with self._cond:
+            for seq, machine in changes:
+                self.seen.add(seq)
+                if machine is not None:
+                    if len(self.events) == self.events.maxlen:
+                        self.floor_pos = self.events[0][0]
+                        self.floor_seq = max(self.floor_seq, self.events[0][1])
+                    self.pos += 1
+                    self.events.append((self.pos, seq, machine))
+            self._cond.notify_all()
+
+    def _listen(self):
+        # LISTEN numa conexão própria, fora do pool; outros drivers/bancos ficam no polling
+        if db.engine.dialect.name != "postgresql" or db.engine.dialect.driver != "psycopg2":
+            return None
+        raw = db.engine.raw_connection()
+        raw.detach()
+        conn = raw.driver_connection
+        conn.autocommit = True
+        conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return conn
+
+    def _wait(self, conn):
+        if conn is None:
+            time.sleep(self.poll_interval)
+            return
+        # Sob gevent o select coopera; o timeout garante uma consulta periódica mesmo sem NOTIFY
+        if select.select([conn], [], [], self.heartbeat)[0]:
+            conn.poll()
+            conn.notifies.clear()
+
+    def _run(self):
+        with self.app.app_context():
+            conn = None
+            while True:
+                try:
+                    if conn is None:
+                        conn = self._listen()
+                    self._wait(conn)
+                    if self.subscribers:
+                        self._poll()
+                except Exception:
+                    current_app.logger.exception("Falha ao ler o feed de alterações das máquinas.")
+                    if conn is not None:
+                        conn.close()
+                        conn = None
+                    time.sleep(self.poll_interval)
+                finally:
+                    db.session.remove()
+
+    def stream(self, cursor, render, lab_id=None):
+        """Gerador de eventos SSE a partir da sequência cursor (exclusive).
+
+        O leitor do feed vê todos os laboratórios; com lab_id, só as máquinas dele são enviadas.
+        O id de cada evento é um cursor seguro (Last-Event-ID na reconexão), não o seq da
+        alteração: a reconexão pode repetir eventos, mas não perde os gravados fora de ordem.
+        """
+        with self._cond:
+            self.subscribers += 1
+        try:
+            yield f"retry: {int(self.poll_interval * 3000)}\n\n"
+            with self._cond:
+                # Primeira leitura pelo seq (?since= ou Last-Event-ID), depois pela posição
+                reload = cursor < self.floor_seq
+                pending = [(seq, machine) for _, seq, machine in self.events if seq > cursor]
+                pos, safe = self.pos, self.cursor
+            while True:
+                if reload:
+                    # Perdeu alterações que já saíram do buffer: a página recarrega
+                    yield "event: reload\ndata: {}\n\n"
+                    return
+                latest = {}
+                for seq, machine in pending:
+                    if lab_id is None or machine.lab_id == lab_id:
+                        latest[machine.id] = machine
+                event_id = max(cursor, safe)
+                for machine in latest.values():
+                    data = json.dumps({"id": machine.id, "html": render(machine)})
+                    yield f"id: {event_id}\nevent: machine\ndata: {data}\n\n"
+                with self._cond:
+                    if self.pos <= pos:
+                        self._cond.wait(self.heartbeat)
+                    reload = pos < self.floor_pos
+                    pending = [(seq, machine) for event_pos, seq, machine in self.events if event_pos > pos]
+                    pos, safe = self.pos, self.cursor
+                if not pending and not reload:
+                    yield ": ping\n\n"
+        finally:
+            with self._cond:
+                self.subscribers -= 1
+
+
+_hub_lock = threading.Lock()
+
+
+def machine_event_hub():
+    app = current_app._get_current_object()
+    hub = app.extensions.get("machine_events")
+    if hub is None:
+        with _hub_lock:
+            hub = app.extensions.get("machine_events")
+            if hub is None:
+                hub = MachineEventHub(app)
+                hub.start()
+                app.extensions["machine_events"] = hub
+    return hub
@@ -0,0 +1,183 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import declared_attr
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from .extensions import db
+
+# ------------- Models -------------
+class Lab(db.Model):
+    # Cada laboratório da instituição; resolvido por /lab/<slug> ou pelo hostname (ver labs.py)
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(50), unique=True, nullable=False)
+    name = db.Column(db.String(200), nullable=False)
+    hostname = db.Column(db.String(255), unique=True, nullable=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+class LabScoped:
+    # Linhas que pertencem a um laboratório. Consultas ORM são filtradas pelo laboratório
+    # da requisição e objetos novos recebem lab_id no flush (ver labs.py).
+    @declared_attr
+    def lab_id(cls):
+        return db.Column(db.Integer, db.ForeignKey("lab.id"), nullable=False)
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    password_hash = db.Column(db.String(200), nullable=False)
+    role = db.Column(db.String(20), nullable=False)  # admin, bolsista, visitor
+    # Laboratório em que a conta pode alterar dados; None = todos (ver labs.user_in_lab)
+    lab_id = db.Column(db.Integer, db.ForeignKey("lab.id"), nullable=True)
+
+    def set_password(self, password):
+        self.password_hash = generate_password_hash(password)
+
+    def check_password(self, password):
+        return check_password_hash(self.password_hash, password)
+
+class LabInfo(LabScoped, db.Model):
+    __table_args__ = (db.UniqueConstraint("lab_id", name="uq_lab_info_lab_id"),)
+    id = db.Column(db.Integer, primary_key=True)
+    coordenador_name = db.Column(db.String(100))
+    coordenador_email = db.Column(db.String(100))
+    bolsista_name = db.Column(db.String(100))
+    bolsista_email = db.Column(db.String(100))
+
+class Equipment(LabScoped, db.Model):
+    # Índices começam por lab_id: listagens de um laboratório não percorrem os outros
+    __table_args__ = (db.Index("ix_equipment_lab_id_name", "lab_id", "name"),)
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)  # EQUIPAMENTO
+    tombo = db.Column(db.String(100), nullable=True)
+    quantidade = db.Column(db.Integer, nullable=True, default=1)
+    modelo = db.Column(db.String(100), nullable=True)
+    marca = db.Column(db.String(100), nullable=True)
+    finalidade = db.Column(db.String(200), nullable=True)  # NOVO
+    status = db.Column(db.String(100), nullable=True)
+    localizacao = db.Column(db.String(200), nullable=True)
+    descricao = db.Column(db.Text, nullable=True)
+    imagem_filename = db.Column(db.String(300), nullable=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+class Machine(LabScoped, db.Model):
+    # Número de série único dentro do laboratório (as verificações do admin já são por laboratório)
+    __table_args__ = (
+        db.Index("ix_machine_lab_id_name", "lab_id", "name"),
+        db.UniqueConstraint("lab_id", "numero_serie", name="uq_machine_lab_id_numero_serie"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)  # ID visível
+    status = db.Column(db.String(100), nullable=False, default='Não formatado')
+    tipo = db.Column(db.String(50), nullable=True)
+    marca = db.Column(db.String(100), nullable=True)
+    modelo = db.Column(db.String(100), nullable=True)
+    numero_serie = db.Column(db.String(100), nullable=True)
+    sistema_operacional = db.Column(db.String(200), nullable=True)
+    softwares_instalados = db.Column(db.Text, nullable=True)
+    licencas = db.Column(db.String(255), nullable=True)
+    limpeza_fisica_data = db.Column(db.Date, nullable=True)
+    ultima_formatacao_data = db.Column(db.Date, nullable=True)
+    responsavel_formatacao = db.Column(db.String(80), nullable=True)
+    imagem_filename = db.Column(db.String(300), nullable=True)
+    # Versões normalizadas de softwares_instalados / licencas (mantidas em sincronia por catalog.py)
+    softwares = db.relationship("Software", secondary="machine_software", order_by="Software.name")
+    licenses = db.relationship("License", secondary="machine_license", order_by="License.name")
+
+class Report(LabScoped, db.Model):
+    __table_args__ = (db.Index("ix_report_lab_id_uploaded_at", "lab_id", "uploaded_at"),)
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    filename = db.Column(db.String(300), nullable=False)
+    uploaded_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    storage_encoding = db.Column(db.String(10), nullable=True)  # None (arquivo original), gzip ou zstd
+    original_size = db.Column(db.BigInteger, nullable=True)  # tamanho descomprimido, em bytes
+
+class ReportText(db.Model):
+    # Texto extraído do arquivo do relatório. O índice de busca (tabela virtual
+    # report_fts no SQLite / coluna search_vector no PostgreSQL) é mantido pelo banco,
+    # ver a migração correspondente.
+    __tablename__ = "report_text"
+    report_id = db.Column(db.Integer, db.ForeignKey("report.id", ondelete="CASCADE"), primary_key=True)
+    title = db.Column(db.String(200), nullable=True)
+    body = db.Column(db.Text, nullable=True)
+    source_filename = db.Column(db.String(300), nullable=False)  # arquivo de onde o texto foi extraído
+    indexed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+class MachineChange(db.Model):
+    # Feed de alterações de máquinas compartilhado entre workers: o id (crescente, nunca
+    # reutilizado) é o número de sequência dos eventos de /machines/events.
+    __tablename__ = "machine_change"
+    __table_args__ = {"sqlite_autoincrement": True}
+    id = db.Column(db.Integer, primary_key=True)
+    machine_id = db.Column(db.Integer, db.ForeignKey("machine.id", ondelete="CASCADE"), nullable=False, index=True)
+    changed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+class EquipmentChange(db.Model):
+    # Mesmo esquema de machine_change: o id é a versão usada por /api/inventory?since=
+    # e, por equipamento, a maior versão é a base para detectar edições conflitantes.
+    __tablename__ = "equipment_change"
+    __table_args__ = {"sqlite_autoincrement": True}
+    id = db.Column(db.Integer, primary_key=True)
+    equipment_id = db.Column(db.Integer, db.ForeignKey("equipment.id", ondelete="CASCADE"), nullable=False, index=True)
+    changed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+class EquipmentSummary(LabScoped, db.Model):
+    # Totais por (laboratório, localização, finalidade, marca), mantidos a cada flush de
+    # Equipment (ver ltip/equipment_summary.py). Valores ausentes viram '' para caber na chave única.
+    __tablename__ = "equipment_summary"
+    __table_args__ = (db.UniqueConstraint("lab_id", "localizacao", "finalidade", "marca"),)
+    id = db.Column(db.Integer, primary_key=True)
+    localizacao = db.Column(db.String(200), nullable=False, default="")
+    finalidade = db.Column(db.String(200), nullable=False, default="")
+    marca = db.Column(db.String(100), nullable=False, default="")
+    cadastros = db.Column(db.Integer, nullable=False, default=0)  # linhas de equipment no grupo
+    unidades = db.Column(db.Integer, nullable=False, default=0)  # soma de quantidade
+
+class AuditLog(db.Model):
+    # Operações administrativas em lote: uma linha por operação (não por máquina alterada)
+    __tablename__ = "audit_log"
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    username = db.Column(db.String(80), nullable=True)
+    action = db.Column(db.String(50), nullable=False)  # ex.: machine.bulk_update
+    target_ids = db.Column(db.Text, nullable=True)  # JSON com os ids afetados
+    details = db.Column(db.Text, nullable=True)  # JSON com os valores aplicados
+
+# ------------- Catálogo de softwares e licenças -------------
+# name_key é o nome normalizado (minúsculas, espaços simples), único e sem índice de
+# prefixo. software_word / license_word guardam cada palavra do nome, indexadas para
+# busca por prefixo (ver a migração a4d7c2e9f150 para os índices por banco).
+machine_software = db.Table(
+    "machine_software",
+    db.Column("machine_id", db.Integer, db.ForeignKey("machine.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("software_id", db.Integer, db.ForeignKey("software.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+machine_license = db.Table(
+    "machine_license",
+    db.Column("machine_id", db.Integer, db.ForeignKey("machine.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("license_id", db.Integer, db.ForeignKey("license.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+software_word = db.Table(
+    "software_word",
+    db.Column("software_id", db.Integer, db.ForeignKey("software.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("word", db.String(200), primary_key=True),
+)
+
+license_word = db.Table(
+    "license_word",
+    db.Column("license_id", db.Integer, db.ForeignKey("license.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("word", db.String(200), primary_key=True),
+)
+
+class Software(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    name_key = db.Column(db.String(200), nullable=False, unique=True)
+
+class License(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    name_key = db.Column(db.String(200), nullable=False, unique=True)
+    seats = db.Column(db.Integer, nullable=True)  # licenças adquiridas; None = não informado
@@ -0,0 +1,167 @@
+"""Limite de tentativas de login por janela deslizante (IP e usuário)."""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import current_app, request
+
+from .config import LOGIN_RATE_LIMIT_IP, LOGIN_RATE_LIMIT_USER, LOGIN_RATE_MAX_KEYS, LOGIN_RATE_WINDOW
+
+# Janela deslizante: cada chave guarda apenas os instantes das últimas tentativas.
+# hit() registra a tentativa e devolve 0 se permitida, ou os segundos até a
+# próxima tentativa possível se o limite foi atingido (nesse caso nada é registrado).
+
+class MemoryRateLimitStore:
+    """Store local ao processo, limitado a max_keys chaves.
+
+    Com a tabela cheia, só saem chaves cuja janela já expirou; se todas ainda estão
+    ativas a chave nova é recusada (tratada como bloqueada) em vez de apagar o
+    contador de outra, o que deixaria um atacante zerar o limite de uma vítima.
+    """
+
+    def __init__(self, max_keys=LOGIN_RATE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _make_room(self, window, now):
+        # Ordem de uso: a primeira chave é a usada há mais tempo
+        while len(self._hits) >= self.max_keys:
+            oldest_key, oldest_hits = next(iter(self._hits.items()))
+            if oldest_hits and oldest_hits[-1] > now - window:
+                return oldest_hits[-1] + window - now
+            del self._hits[oldest_key]
+        return 0
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                retry_after = self._make_room(window, now)
+                if retry_after:
+                    return retry_after
+                hits = self._hits[key] = deque(maxlen=limit)
+            else:
+                self._hits.move_to_end(key)
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            return 0
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+
+class SQLiteRateLimitStore:
+    """Store compartilhado entre processos do mesmo host (arquivo SQLite em modo WAL)."""
+
+    # hit() só limpa a própria chave; chaves que não voltam (usuários/IPs trocados a cada
+    # tentativa) são apagadas por uma limpeza geral, no máximo uma vez a cada PURGE_INTERVAL
+    PURGE_INTERVAL = 60
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._purged_at = 0.0
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS login_attempt (key TEXT NOT NULL, ts REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_login_attempt_key_ts ON login_attempt (key, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_login_attempt_ts ON login_attempt (ts)")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if now - self._purged_at >= self.PURGE_INTERVAL:
+                conn.execute("DELETE FROM login_attempt WHERE ts <= ?", (now - window,))
+                self._purged_at = now
+            else:
+                conn.execute("DELETE FROM login_attempt WHERE key = ? AND ts <= ?", (key, now - window))
+            count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(ts) FROM login_attempt WHERE key = ?", (key,)
+            ).fetchone()
+            if count >= limit:
+                retry_after = oldest + window - now
+            else:
+                conn.execute("INSERT INTO login_attempt (key, ts) VALUES (?, ?)", (key, now))
+                retry_after = 0
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def reset(self, key):
+        self._connect().execute("DELETE FROM login_attempt WHERE key = ?", (key,))
+
+
+class RedisRateLimitStore:
+    """Store compartilhado entre hosts usando sorted sets do Redis."""
+
+    # Limpa, conta e registra numa única operação atômica: com comandos separados,
+    # tentativas simultâneas passariam todas pela contagem antes de qualquer ZADD.
+    # Devolve texto porque números do Lua viram inteiros na resposta.
+    HIT_SCRIPT = """
+local now, window, limit = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    if oldest[2] then
+        return tostring(tonumber(oldest[2]) + window - now)
+    end
+    return tostring(window)
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], math.ceil(window) + 1)
+return '0'
+"""
+
+    def __init__(self, url):
+        import redis  # dependência opcional
+        self.client = redis.Redis.from_url(url)
+        self._hit = self.client.register_script(self.HIT_SCRIPT)
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        # Membro único: duas tentativas no mesmo microssegundo contam como duas
+        member = f"{now:.6f}:{os.urandom(4).hex()}"
+        retry_after = float(self._hit(keys=[f"ltip:login:{key}"], args=[repr(now), window, limit, member]))
+        return retry_after if retry_after > 0 else 0
+
+    def reset(self, key):
+        self.client.delete(f"ltip:login:{key}")
+
+
+def make_rate_limit_store(spec):
+    if spec.startswith("sqlite:///"):
+        return SQLiteRateLimitStore(spec[len("sqlite:///"):])
+    if spec.startswith(("redis://", "rediss://")):
+        return RedisRateLimitStore(spec)
+    return MemoryRateLimitStore()
+
+def login_rate_store():
+    return current_app.extensions["login_rate_store"]
+
+def login_rate_limited(username):
+    """Registra a tentativa de login; devolve os segundos de espera se bloqueada."""
+    retry_after = login_rate_store().hit(f"ip:{request.remote_addr}", LOGIN_RATE_LIMIT_IP, LOGIN_RATE_WINDOW)
+    if not retry_after and username:
+        retry_after = login_rate_store().hit(f"user:{username.lower()}", LOGIN_RATE_LIMIT_USER, LOGIN_RATE_WINDOW)
+    return retry_after
@@ -0,0 +1,152 @@
+"""Roteamento de leituras para réplicas (DATABASE_REPLICA_URLS).
+
+Views marcadas com @read_only, em GET/HEAD, leem de uma réplica saudável; todo
+o resto (escritas, flush, views sem a marca) vai para o primário. Para que quem
+acabou de salvar veja a própria alteração, cada escrita grava na sessão do
+usuário o instante do commit e, no PostgreSQL, o LSN do primário. A réplica só
+é usada por esse usuário depois de ter aplicado esse LSN (ou, sem LSN, depois
+de REPLICA_MAX_LAG_SECONDS). Réplicas com atraso acima do limite ou fora do ar
+são ignoradas até a próxima verificação.
+
+Teste local com dois arquivos SQLite:
+    cp ltip.db /tmp/replica.db
+    DATABASE_REPLICA_URLS=sqlite:////tmp/replica.db python LTIP_Laboratory_Webapp_app.py
+"""
+
+import random
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .config import REPLICA_CHECK_INTERVAL, REPLICA_MAX_LAG_SECONDS
+
+SESSION_KEY = "ltip_last_write"
+
+
+def read_only(view):
+    """Marca a view como somente leitura (pode ser atendida por uma réplica)."""
+    view.ltip_read_only = True
+    return view
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not self.info.get("ltip_wrote") and has_request_context():
+            engine = g.get("ltip_read_engine")
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_write(sess, flush_context):
+    # A partir da primeira escrita, a sessão fica presa ao primário
+    sess.info["ltip_wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(sess):
+    if sess.info.pop("ltip_wrote", False) and has_request_context():
+        g.ltip_committed_write = True
+
+
+class ReplicaSet:
+    """Estado de saúde/atraso das réplicas deste worker, verificado a cada REPLICA_CHECK_INTERVAL s."""
+
+    def __init__(self, keys, max_lag=REPLICA_MAX_LAG_SECONDS, check_interval=REPLICA_CHECK_INTERVAL):
+        self.keys = keys
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._status = {}  # chave -> (verificado_em, saudável, atraso_s)
+        self._lock = threading.Lock()
+
+    def _probe(self, engine):
+        with engine.connect() as conn:
+            if engine.dialect.name != "postgresql":
+                return 0.0  # sem replicação física para medir (ex.: SQLite local)
+            # Tudo o que foi recebido já foi aplicado: sem atraso, mesmo que o primário esteja
+            # parado há tempo (now() - último replay cresceria sem haver nada pendente)
+            lag = conn.execute(text(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+                "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            )).scalar()
+            return float(lag or 0)
+
+    def status(self, key, engine):
+        now = time.monotonic()
+        checked_at, healthy, lag = self._status.get(key, (None, False, None))
+        if checked_at is None or now - checked_at > self.check_interval:
+            try:
+                lag = self._probe(engine)
+                healthy = lag <= self.max_lag
+            except SQLAlchemyError:
+                current_app.logger.warning("Réplica %s indisponível; usando o primário.", key)
+                healthy, lag = False, None
+            with self._lock:
+                self._status[key] = (now, healthy, lag)
+        return healthy, lag
+
+    def healthy(self, engines):
+        return [key for key in self.keys if self.status(key, engines[key])[0]]
+
+
+def _caught_up(engine, last_write):
+    """A réplica já aplicou a última escrita deste usuário?"""
+    if time.time() - last_write["ts"] > REPLICA_MAX_LAG_SECONDS:
+        return True
+    lsn = last_write.get("lsn")
+    if not lsn or engine.dialect.name != "postgresql":
+        return False  # sem LSN: espera a janela de atraso máximo passar
+    with engine.connect() as conn:
+        return bool(conn.execute(
+            text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"), {"lsn": lsn}
+        ).scalar())
+
+
+def _choose_read_engine():
+    if request.method not in ("GET", "HEAD"):
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    if not getattr(view, "ltip_read_only", False):
+        return None
+    from .extensions import db
+
+    replicas = current_app.extensions["ltip_replicas"]
+    engines = db.engines
+    candidates = replicas.healthy(engines)
+    last_write = session.get(SESSION_KEY)
+    random.shuffle(candidates)
+    for key in candidates:
+        try:
+            if not last_write or _caught_up(engines[key], last_write):
+                return engines[key]
+        except SQLAlchemyError:
+            continue
+    return None
+
+
+def _record_write(response):
+    if g.pop("ltip_committed_write", False):
+        from .extensions import db
+
+        lsn = None
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.connect() as conn:
+                lsn = conn.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+        session[SESSION_KEY] = {"ts": time.time(), "lsn": lsn}
+    return response
+
+
+def init_app(app, replica_keys):
+    app.extensions["ltip_replicas"] = ReplicaSet(replica_keys)
+
+    @app.before_request
+    def _route_reads():
+        g.ltip_read_engine = _choose_read_engine()
+
+    app.after_request(_record_write)
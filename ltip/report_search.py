@@ -0,0 +1,143 @@
+"""Extração de texto e busca textual (FTS5/tsvector) dos relatórios."""
+
+import io
+import os
+import re
+from datetime import datetime, timezone
+from html import unescape
+
+from flask import current_app
+from markupsafe import Markup, escape
+from sqlalchemy import or_, text
+
+from .extensions import db
+from .labs import current_lab_id
+from .models import Report, ReportText
+from .report_storage import open_report
+
+REPORT_TEXT_MAX_CHARS = 2_000_000  # limita o texto indexado por relatório
+REPORT_SEARCH_LIMIT = 50
+
+def _extract_docx_text(fileobj):
+    import zipfile
+    with zipfile.ZipFile(fileobj) as zf:
+        xml = zf.read("word/document.xml").decode("utf-8", errors="ignore")
+    xml = re.sub(r"</w:p>|<w:br/>|<w:tab/>", "\n", xml)
+    return unescape(re.sub(r"<[^>]+>", "", xml))
+
+def _extract_pdf_text(fileobj):
+    try:
+        from pypdf import PdfReader  # dependência opcional
+    except ImportError:
+        current_app.logger.warning("pypdf não instalado; conteúdo de PDFs não será indexado.")
+        return ""
+    reader = PdfReader(fileobj)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+def extract_report_text(rpt):
+    ext = os.path.splitext(rpt.filename)[1].lower()
+    try:
+        if ext not in (".docx", ".pdf", ".txt"):
+            return ""  # .doc e outros formatos: apenas o título é indexado
+        with open_report(rpt) as fh:
+            data = io.BytesIO(fh.read())
+        if ext == ".docx":
+            content = _extract_docx_text(data)
+        elif ext == ".pdf":
+            content = _extract_pdf_text(data)
+        else:
+            content = data.getvalue().decode("utf-8", errors="ignore")
+    except Exception:
+        current_app.logger.exception("Falha ao extrair texto de %s", rpt.filename)
+        content = ""
+    return re.sub(r"[ \t\r\f\v]+", " ", content)[:REPORT_TEXT_MAX_CHARS]
+
+def index_pending_reports():
+    """Indexa apenas relatórios novos ou cujo arquivo mudou. Devolve quantos foram indexados."""
+    pending = (
+        db.session.query(Report, ReportText)
+        .outerjoin(ReportText, ReportText.report_id == Report.id)
+        .filter(or_(ReportText.report_id.is_(None), ReportText.source_filename != Report.filename))
+        .all()
+    )
+    count = 0
+    for rpt, entry in pending:
+        body = extract_report_text(rpt)
+        if entry is None:
+            entry = ReportText(report_id=rpt.id)
+            db.session.add(entry)
+        entry.title = rpt.title
+        entry.body = body
+        entry.source_filename = rpt.filename
+        entry.indexed_at = datetime.now(timezone.utc)
+        try:
+            db.session.commit()
+            count += 1
+        except Exception:
+            # outro worker pode ter indexado o mesmo relatório ao mesmo tempo
+            db.session.rollback()
+    return count
+
+_report_indexer = None
+
+def _run_report_indexing(app):
+    with app.app_context():
+        try:
+            index_pending_reports()
+        except Exception:
+            current_app.logger.exception("Falha na indexação de relatórios")
+        finally:
+            db.session.remove()
+
+def schedule_report_indexing():
+    # A extração de texto roda fora da requisição, em uma única thread por worker
+    global _report_indexer
+    if _report_indexer is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _report_indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-indexer")
+    _report_indexer.submit(_run_report_indexing, current_app._get_current_object())
+
+# Marcadores de destaque usados nos trechos; o texto é escapado antes de virar <mark>
+_HL_START, _HL_END = "\x02", "\x03"
+
+def _highlight(snippet):
+    return Markup(str(escape(snippet or "")).replace(_HL_START, "<mark>").replace(_HL_END, "</mark>"))
+
+def _fts5_query(q):
+    terms = re.findall(r"\w+", q)
+    return " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+
+def search_reports(q, limit=REPORT_SEARCH_LIMIT):
+    """Devolve [(Report, trecho_html)] ordenados por relevância."""
+    dialect = db.engine.dialect.name
+    # SQL textual não recebe o filtro automático de labs.py: o LIMIT tem de valer dentro do laboratório
+    lab_id = current_lab_id()
+    if dialect == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return []
+        # Junção com report em vez de "rowid IN (...)": o FTS5 aceitaria a restrição de
+        # rowid e percorreria um a um os relatórios do laboratório antes do MATCH
+        lab_join = " JOIN report r ON r.id = report_fts.rowid" if lab_id is not None else ""
+        lab_filter = " AND r.lab_id = :lab" if lab_id is not None else ""
+        rows = db.session.execute(text(
+            "SELECT report_fts.rowid, snippet(report_fts, -1, :hs, :he, '…', 16) FROM report_fts" + lab_join +
+            " WHERE report_fts MATCH :q" + lab_filter + " ORDER BY bm25(report_fts, 10.0, 1.0) LIMIT :limit"
+        ), {"q": match, "hs": _HL_START, "he": _HL_END, "limit": limit, "lab": lab_id}).all()
+    elif dialect == "postgresql":
+        lab_join = " JOIN report r ON r.id = report_text.report_id" if lab_id is not None else ""
+        lab_filter = " AND r.lab_id = :lab" if lab_id is not None else ""
+        rows = db.session.execute(text(
+            "SELECT report_id, ts_headline('portuguese', coalesce(body, title, ''), query, :opts) "
+            "FROM (SELECT report_id, report_text.title, body, ts_rank(search_vector, query) AS rank, query "
+            "      FROM report_text" + lab_join + ", websearch_to_tsquery('portuguese', :q) AS query "
+            "      WHERE search_vector @@ query" + lab_filter + " ORDER BY rank DESC LIMIT :limit) ranked "
+            "ORDER BY rank DESC"
+        ), {"q": q, "limit": limit, "lab": lab_id,
+            "opts": f"StartSel={_HL_START}, StopSel={_HL_END}, MaxWords=30, MinWords=10"}).all()
+    else:
+        like = f"%{q}%"
+        rows = [(rt.report_id, rt.title) for rt in ReportText.query.join(Report, Report.id == ReportText.report_id).filter(
+            or_(ReportText.title.ilike(like), ReportText.body.ilike(like))).limit(limit)]
+    reports_by_id = {r.id: r for r in Report.query.filter(Report.id.in_([row[0] for row in rows]))}
+    return [(reports_by_id[rid], _highlight(snippet)) for rid, snippet in rows if rid in reports_by_id]
@@ -0,0 +1,134 @@
+"""Armazenamento comprimido de relatórios e downloads com Range."""
+
+import gzip
+import os
+import shutil
+import tempfile
+
+from flask import Response, redirect, request, send_file
+
+from .config import REPORT_COMPRESSION, REPORT_COMPRESSION_MIN_SAVING
+from .storage import get_storage
+
+STORAGE_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def open_compressed(path, encoding, mode="rb"):
+    if encoding == "gzip":
+        return gzip.open(path, mode, compresslevel=6)
+    if encoding == "zstd":
+        import zstandard  # dependência opcional
+        return zstandard.open(path, mode)
+    raise ValueError(f"Codificação desconhecida: {encoding}")
+
+def compress_file(src, encoding, min_saving=REPORT_COMPRESSION_MIN_SAVING):
+    """Comprime src ao lado do original e remove o original.
+
+    Devolve a codificação usada, ou None quando a compressão não compensa
+    (PDFs com imagens já comprimidas, por exemplo) e o arquivo fica como está.
+    """
+    if encoding not in STORAGE_SUFFIXES:
+        return None
+    dst = src + STORAGE_SUFFIXES[encoding]
+    tmp = dst + ".tmp"
+    with open(src, "rb") as fin, open_compressed(tmp, encoding, "wb") as fout:
+        shutil.copyfileobj(fin, fout, STREAM_CHUNK_SIZE)
+    original_size = os.path.getsize(src)
+    if os.path.getsize(tmp) > original_size * (1 - min_saving):
+        os.remove(tmp)
+        return None
+    os.replace(tmp, dst)
+    os.remove(src)
+    return encoding
+
+def report_storage_key(rpt):
+    """Nome do arquivo do relatório no armazenamento (com o sufixo da compressão)."""
+    return rpt.filename + STORAGE_SUFFIXES.get(rpt.storage_encoding, "")
+
+def store_report_file(rpt, file_storage):
+    """Grava o arquivo enviado para rpt, comprimido conforme REPORT_COMPRESSION."""
+    # Comprime numa pasta temporária e só então envia ao armazenamento (local ou S3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, rpt.filename)
+        file_storage.save(path)
+        rpt.original_size = os.path.getsize(path)
+        rpt.storage_encoding = compress_file(path, REPORT_COMPRESSION)
+        get_storage().put_file(report_storage_key(rpt), path + STORAGE_SUFFIXES.get(rpt.storage_encoding, ""))
+
+def open_report(rpt):
+    """Abre o conteúdo original (descomprimido) do relatório para leitura."""
+    path = get_storage().local_path(report_storage_key(rpt))
+    if path is None:
+        raise FileNotFoundError(report_storage_key(rpt))
+    if rpt.storage_encoding:
+        return open_compressed(path, rpt.storage_encoding)
+    return open(path, "rb")
+
+def _stream_report(fh, start, length):
+    # Recebe o arquivo já aberto: o gerador roda depois que o contexto da requisição terminou
+    with fh:
+        if start:
+            fh.seek(start)  # gzip/zstd: avança descomprimindo, sem carregar em memória
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def send_report(rpt):
+    """Envia o relatório respeitando Accept-Encoding e requisições Range (downloads retomáveis).
+
+    Com S3, downloads completos viram redirecionamentos para URLs pré-assinadas.
+    """
+    import mimetypes
+    mimetype = mimetypes.guess_type(rpt.filename)[0] or "application/octet-stream"
+    storage = get_storage()
+    key = report_storage_key(rpt)
+    if not rpt.storage_encoding:
+        url = storage.presigned_url(key, download_name=rpt.filename, content_type=mimetype)
+        if url:
+            return redirect(url)
+        return send_file(storage.local_path(key), as_attachment=True, download_name=rpt.filename, conditional=True)
+
+    size = rpt.original_size if rpt.original_size is not None else 0
+    etag = f"{rpt.id}-{size}-{rpt.storage_encoding}"
+    byte_range = request.range
+    if byte_range and request.if_range.etag and request.if_range.etag != etag:
+        byte_range = None  # representação mudou desde o download parcial: envia completo
+
+    # Sem Range e cliente aceita a codificação armazenada: envia os bytes comprimidos como estão
+    if byte_range is None and request.accept_encodings[rpt.storage_encoding]:
+        url = storage.presigned_url(key, download_name=rpt.filename, content_type=mimetype,
+                                    content_encoding=rpt.storage_encoding)
+        if url:
+            response = redirect(url)
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        response = send_file(storage.local_path(key), as_attachment=True, download_name=rpt.filename,
+                             mimetype=mimetype, conditional=False)
+        response.headers["Content-Encoding"] = rpt.storage_encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.set_etag(etag + "-enc")
+        return response.make_conditional(request)
+
+    # Caso contrário, descomprime em streaming (com suporte a Range sobre o conteúdo original)
+    status, start, length = 200, 0, size
+    if byte_range is not None:
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            response = Response(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+        start, stop = bounds
+        status, length = 206, stop - start
+    response = Response(_stream_report(open_report(rpt), start, length), status=status, mimetype=mimetype)
+    response.headers.set("Content-Disposition", "attachment", filename=rpt.filename)
+    response.content_length = length
+    response.headers["Accept-Ranges"] = "bytes"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.set_etag(etag)
+    if status == 206:
+        response.headers["Content-Range"] = f"bytes {start}-{start + length - 1}/{size}"
+    return response
@@ -0,0 +1,365 @@
+// Modo offline do inventário (ver ltip/inventory_sync.py). Os equipamentos ficam no
+// IndexedDB; a página abre com eles e depois pede só o que mudou (?since=versão).
+// Edições sem rede vão para uma fila (outbox) e são reenviadas com a versão em que se
+// basearam: se o item mudou no servidor, a resposta é 409 e o usuário escolhe.
+(function () {
+  var script = document.currentScript;
+  if ('serviceWorker' in navigator && script && script.dataset.sw) {
+    navigator.serviceWorker.register(script.dataset.sw, { scope: script.dataset.scope }).catch(function () {});
+  }
+
+  var root = document.getElementById('inventory-app');
+  if (!root || !window.indexedDB) return;
+
+  var FIELDS = [
+    ['name', 'EQUIPAMENTO'], ['tombo', 'TOMBO'], ['marca', 'MARCA'], ['modelo', 'MODELO'],
+    ['quantidade', 'QUANTIDADE'], ['localizacao', 'LOCALIZAÇÃO'], ['finalidade', 'FINALIDADE']
+  ];
+  var SEARCH_FIELDS = ['name', 'marca', 'modelo', 'tombo', 'finalidade'];
+  var SYNC_INTERVAL = 60000;
+
+  var dbName = root.dataset.db || 'ltip-inventory';  // um banco por laboratório (/lab/<slug>)
+  var api = root.dataset.api;
+  var editApi = root.dataset.editApi;  // ausente para quem não pode editar
+  var equipmentPath = root.dataset.equipmentPath;
+  var rows = document.getElementById('offline-rows');
+  var search = document.getElementById('offline-search');
+  var panel = document.getElementById('offline-panel');
+  var outboxBox = document.getElementById('offline-outbox');
+  var outboxList = document.getElementById('offline-outbox-list');
+  var statusLine = document.getElementById('sync-status');
+
+  var db = null;
+  var items = {};     // id -> item como está no servidor (com a versão seq)
+  var outbox = [];    // { key, id, base_seq, changes, status: pending|conflict|error, error, server }
+  var meta = { seq: 0, synced_at: null };
+  var syncing = false;
+  var again = false;
+  var offline = false;
+
+  // ---------- IndexedDB ----------
+  function openDb() {
+    return new Promise(function (resolve, reject) {
+      var req = indexedDB.open(dbName, 1);
+      req.onupgradeneeded = function () {
+        var d = req.result;
+        d.createObjectStore('equipment', { keyPath: 'id' });
+        d.createObjectStore('outbox', { keyPath: 'key', autoIncrement: true });
+        d.createObjectStore('meta');
+      };
+      req.onsuccess = function () { resolve(req.result); };
+      req.onerror = function () { reject(req.error); };
+    });
+  }
+
+  function transaction(stores, work) {
+    return new Promise(function (resolve, reject) {
+      var t = db.transaction(stores, 'readwrite');
+      var result = work(t);
+      t.oncomplete = function () { resolve(result); };
+      t.onerror = t.onabort = function () { reject(t.error); };
+    });
+  }
+
+  function getAll(t, store) {
+    var out = {};
+    t.objectStore(store).getAll().onsuccess = function (e) { out.value = e.target.result; };
+    return out;
+  }
+
+  function load() {
+    return transaction(['equipment', 'outbox', 'meta'], function (t) {
+      var result = { equipment: getAll(t, 'equipment'), outbox: getAll(t, 'outbox'), meta: {} };
+      t.objectStore('meta').get('state').onsuccess = function (e) { result.meta.value = e.target.result; };
+      return result;
+    }).then(function (result) {
+      result.equipment.value.forEach(function (item) { items[item.id] = item; });
+      outbox = result.outbox.value;
+      if (result.meta.value) meta = result.meta.value;
+    });
+  }
+
+  function saveEntry(entry) {
+    return transaction(['outbox'], function (t) {
+      var req = t.objectStore('outbox').put(entry);
+      req.onsuccess = function () { entry.key = req.result; };
+    });
+  }
+
+  function removeEntry(entry) {
+    outbox.splice(outbox.indexOf(entry), 1);
+    return transaction(['outbox'], function (t) { t.objectStore('outbox').delete(entry.key); });
+  }
+
+  function saveItems(list, full) {
+    return transaction(['equipment'], function (t) {
+      var store = t.objectStore('equipment');
+      if (full) store.clear();
+      list.forEach(function (item) { store.put(item); });
+    });
+  }
+
+  function saveMeta() {
+    return transaction(['meta'], function (t) { t.objectStore('meta').put(meta, 'state'); });
+  }
+
+  // ---------- Sincronização ----------
+  function pending(id) {
+    for (var i = 0; i < outbox.length; i++) {
+      if (outbox[i].id === id && outbox[i].status !== 'error') return outbox[i];
+    }
+    return null;
+  }
+
+  // Item como o usuário o vê: versão do servidor com as alterações ainda não enviadas
+  function view(item) {
+    var entry = pending(item.id);
+    return entry ? Object.assign({}, item, entry.changes) : item;
+  }
+
+  function send(entry) {
+    var body = Object.assign({ base_seq: entry.base_seq }, entry.changes);
+    return fetch(editApi + entry.id, {
+      method: 'POST',
+      credentials: 'same-origin',
+      headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+      body: JSON.stringify(body)
+    }).then(function (response) {
+      if (response.status >= 500) throw new Error('HTTP ' + response.status);
+      return response.json().then(function (data) {
+        if (response.ok) {
+          items[data.item.id] = data.item;
+          return saveItems([data.item]).then(function () { return removeEntry(entry); });
+        }
+        if (response.status === 409) {
+          entry.status = 'conflict';
+          entry.server = data.item;
+          items[data.item.id] = data.item;
+          return saveItems([data.item]).then(function () { return saveEntry(entry); });
+        }
+        entry.status = 'error';
+        entry.error = data.error || ('HTTP ' + response.status);
+        return saveEntry(entry);
+      });
+    });
+  }
+
+  function flush() {
+    var queue = outbox.filter(function (entry) { return entry.status === 'pending'; });
+    return queue.reduce(function (chain, entry) {
+      return chain.then(function () { return send(entry); });
+    }, Promise.resolve());
+  }
+
+  function pull() {
+    return fetch(api + '?since=' + meta.seq, { credentials: 'same-origin', headers: { 'Accept': 'application/json' } })
+      .then(function (response) {
+        if (!response.ok) throw new Error('HTTP ' + response.status);
+        return response.json();
+      })
+      .then(function (data) {
+        if (data.full) items = {};
+        data.items.forEach(function (item) { items[item.id] = item; });
+        meta = { seq: data.seq, synced_at: new Date().toISOString() };
+        return saveItems(data.items, data.full).then(saveMeta);
+      });
+  }
+
+  function sync() {
+    if (syncing) {
+      again = true;  // edição feita durante uma sincronização: outra rodada logo em seguida
+      return Promise.resolve();
+    }
+    syncing = true;
+    again = false;
+    return (editApi ? flush() : Promise.resolve())
+      .then(pull)
+      .then(function () { offline = false; }, function () { offline = true; })
+      .then(function () {
+        syncing = false;
+        render();
+        if (again && !offline) return sync();
+      });
+  }
+
+  function enqueue(id, changes) {
+    var entry = pending(id);
+    if (entry) {
+      // Uma entrada por equipamento: duas edições seguidas partem da mesma versão
+      Object.assign(entry.changes, changes);
+    } else {
+      entry = { id: id, base_seq: items[id].seq, changes: changes, status: 'pending' };
+      outbox.push(entry);
+    }
+    return saveEntry(entry).then(function () { render(); return sync(); });
+  }
+
+  // ---------- Interface ----------
+  function cell(tr, text) {
+    var td = document.createElement('td');
+    td.textContent = text === null || text === undefined ? '' : text;
+    tr.appendChild(td);
+    return td;
+  }
+
+  function button(label, outline, onClick) {
+    var b = document.createElement('button');
+    b.type = 'button';
+    b.className = outline ? 'btn btn-outline' : 'btn';
+    b.textContent = label;
+    b.addEventListener('click', onClick);
+    return b;
+  }
+
+  function matches(item, term) {
+    if (!term) return true;
+    return SEARCH_FIELDS.some(function (field) {
+      return String(item[field] || '').toLowerCase().indexOf(term) !== -1;
+    });
+  }
+
+  function renderRows() {
+    var term = search.value.trim().toLowerCase();
+    var list = Object.keys(items).map(function (id) { return view(items[id]); })
+      .filter(function (item) { return matches(item, term); })
+      .sort(function (a, b) { return String(a.name).localeCompare(String(b.name), 'pt-BR'); });
+    var frag = document.createDocumentFragment();
+    list.forEach(function (item) {
+      var tr = document.createElement('tr');
+      FIELDS.forEach(function (field) { cell(tr, item[field[0]]); });
+      var actions = cell(tr, '');
+      var link = document.createElement('a');
+      link.href = equipmentPath + item.id;
+      link.textContent = pending(item.id) ? 'Ver (pendente)' : 'Ver';
+      link.addEventListener('click', function (e) {
+        e.preventDefault();
+        history.pushState(null, '', link.href);
+        renderPanel();
+        panel.scrollIntoView();
+      });
+      actions.appendChild(link);
+      frag.appendChild(tr);
+    });
+    rows.replaceChildren(frag);
+  }
+
+  function currentId() {
+    var path = location.pathname;
+    if (path.indexOf(equipmentPath) !== 0) return null;
+    var id = path.slice(equipmentPath.length);
+    return /^\d+$/.test(id) ? Number(id) : null;
+  }
+
+  function renderPanel() {
+    var id = currentId();
+    var item = id !== null && items[id] ? view(items[id]) : null;
+    panel.hidden = !item;
+    if (!item) return;
+    var nodes = [];
+    var title = document.createElement('h3');
+    title.textContent = 'Detalhes do Equipamento: ' + item.name;
+    nodes.push(title);
+    if (item.imagem_url) {
+      var img = document.createElement('img');
+      img.className = 'img-thumb';
+      img.src = item.imagem_url;
+      nodes.push(img);
+    }
+    var form = document.createElement('form');
+    FIELDS.forEach(function (field) {
+      var row = document.createElement('div');
+      row.className = 'form-row';
+      var label = document.createElement('label');
+      label.textContent = field[1];
+      var input = document.createElement('input');
+      input.name = field[0];
+      input.value = item[field[0]] === null || item[field[0]] === undefined ? '' : item[field[0]];
+      if (field[0] === 'quantidade') { input.type = 'number'; input.min = 1; }
+      if (field[0] === 'name') input.required = true;
+      input.readOnly = !editApi;
+      row.appendChild(label);
+      row.appendChild(input);
+      form.appendChild(row);
+    });
+    if (editApi) {
+      var save = document.createElement('button');
+      save.className = 'btn';
+      save.textContent = 'Salvar';
+      form.appendChild(save);
+      form.addEventListener('submit', function (e) {
+        e.preventDefault();
+        var base = view(items[id]);
+        var changes = {};
+        FIELDS.forEach(function (field) {
+          var value = form.elements[field[0]].value.trim();
+          if (field[0] === 'quantidade') value = Number(value) || 1;
+          if (String(value) !== String(base[field[0]] === null ? '' : base[field[0]])) changes[field[0]] = value;
+        });
+        if (Object.keys(changes).length) enqueue(id, changes);
+      });
+    }
+    nodes.push(form);
+    nodes.push(button('Fechar', true, function () {
+      history.pushState(null, '', root.dataset.shell);
+      renderPanel();
+    }));
+    panel.replaceChildren.apply(panel, nodes);
+  }
+
+  function renderOutbox() {
+    outboxBox.hidden = !outbox.length;
+    var frag = document.createDocumentFragment();
+    outbox.forEach(function (entry) {
+      var li = document.createElement('li');
+      var item = items[entry.id];
+      var name = item ? item.name : ('#' + entry.id);
+      var fields = Object.keys(entry.changes).join(', ');
+      if (entry.status === 'conflict') {
+        li.textContent = name + ': alterado por outra pessoa enquanto você estava sem rede (' + fields + '). ';
+        li.appendChild(button('Manter a minha', false, function () {
+          entry.status = 'pending';
+          entry.base_seq = entry.server.seq;
+          delete entry.server;
+          saveEntry(entry).then(sync);
+        }));
+        li.appendChild(button('Descartar', true, function () { removeEntry(entry).then(render); }));
+      } else if (entry.status === 'error') {
+        li.textContent = name + ': não enviado (' + entry.error + '). ';
+        li.appendChild(button('Tentar de novo', false, function () {
+          entry.status = 'pending';
+          delete entry.error;
+          saveEntry(entry).then(sync);
+        }));
+        li.appendChild(button('Descartar', true, function () { removeEntry(entry).then(render); }));
+      } else {
+        li.textContent = name + ': aguardando envio (' + fields + ').';
+      }
+      frag.appendChild(li);
+    });
+    outboxList.replaceChildren(frag);
+  }
+
+  function renderStatus() {
+    var when = meta.synced_at ? new Date(meta.synced_at).toLocaleString('pt-BR') : 'nunca';
+    statusLine.textContent = (offline ? 'Sem conexão; dados salvos em ' : 'Sincronizado em ') + when + '.';
+  }
+
+  function render() {
+    renderRows();
+    renderPanel();
+    renderOutbox();
+    renderStatus();
+  }
+
+  search.addEventListener('input', renderRows);
+  window.addEventListener('popstate', renderPanel);
+  window.addEventListener('online', sync);
+  setInterval(function () {
+    if (document.visibilityState === 'visible') sync();
+  }, SYNC_INTERVAL);
+
+  openDb()
+    .then(function (d) { db = d; return load(); })
+    .then(function () { render(); return sync(); })
+    .catch(function () { statusLine.textContent = 'Armazenamento local indisponível neste navegador.'; });
+})();
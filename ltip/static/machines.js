@@ -0,0 +1,46 @@
+// Atualizações ao vivo de /machines: cada evento traz a linha já renderizada de uma
+// máquina alterada (ver ltip/machine_events.py). Sem EventSource, a página segue estática.
+(function () {
+  var tbody = document.getElementById('machine-rows');
+  if (!tbody) return;
+
+  // Ações em lote: marcar/desmarcar todas as linhas visíveis
+  var selectAll = document.getElementById('bulk-select-all');
+  if (selectAll) {
+    selectAll.addEventListener('change', function () {
+      var boxes = tbody.querySelectorAll('input[name="ids"]');
+      for (var i = 0; i < boxes.length; i++) boxes[i].checked = selectAll.checked;
+    });
+  }
+
+  if (!window.EventSource) return;
+  var source = new EventSource(tbody.dataset.events);
+
+  source.addEventListener('machine', function (e) {
+    var data = JSON.parse(e.data);
+    var holder = document.createElement('tbody');
+    holder.innerHTML = data.html;
+    var row = holder.firstElementChild;
+    var current = document.getElementById('machine-' + data.id);
+    if (current) {
+      var oldBox = current.querySelector('input[name="ids"]');
+      var newBox = row.querySelector('input[name="ids"]');
+      if (oldBox && newBox) newBox.checked = oldBox.checked;  // mantém a seleção do lote
+      current.replaceWith(row);
+      return;
+    }
+    // Máquina nova: com busca ativa não dá para saber se ela combina com o filtro
+    if (tbody.dataset.filtered) return;
+    var next = null;
+    for (var i = 0; i < tbody.rows.length; i++) {
+      if (tbody.rows[i].dataset.name > row.dataset.name) { next = tbody.rows[i]; break; }
+    }
+    tbody.insertBefore(row, next);
+  });
+
+  // O servidor já não tem todas as alterações desde a última recebida
+  source.addEventListener('reload', function () {
+    source.close();
+    window.location.reload();
+  });
+})();
@@ -0,0 +1,115 @@
+// Service worker do modo offline do inventário. Servido em /sw.js (ver
+// inventory.service_worker), que substitui __SETTINGS__ pelas URLs do deploy atual.
+var SETTINGS = __SETTINGS__;
+var CACHE = 'ltip-' + SETTINGS.version;
+var UPLOADS_CACHE = 'ltip-uploads';
+var NAVIGATION_TIMEOUT = 3000;  // rede lenta no laboratório: depois disso, a página guardada
+var MAX_UPLOADS = 300;  // imagens guardadas; as mais antigas saem primeiro
+
+self.addEventListener('install', function (event) {
+  event.waitUntil(
+    caches.open(CACHE)
+      .then(function (cache) { return cache.addAll([SETTINGS.shell].concat(SETTINGS.precache)); })
+      .then(function () { return self.skipWaiting(); })
+  );
+});
+
+self.addEventListener('activate', function (event) {
+  event.waitUntil(
+    caches.keys().then(function (keys) {
+      return Promise.all(keys.filter(function (key) {
+        return key.indexOf('ltip-') === 0 && key !== CACHE && key !== UPLOADS_CACHE;
+      }).map(function (key) { return caches.delete(key); }));
+    }).then(function () { return self.clients.claim(); })
+  );
+});
+
+function cacheFirst(request) {
+  return caches.match(request).then(function (hit) { return hit || fetch(request); });
+}
+
+// A página offline abre na hora a partir do cache e é atualizada em segundo plano
+function staleWhileRevalidate(request) {
+  return caches.open(CACHE).then(function (cache) {
+    return cache.match(request).then(function (hit) {
+      var update = fetch(request).then(function (response) {
+        if (response.ok) cache.put(request, response.clone());
+        return response;
+      });
+      if (!hit) return update;
+      update.catch(function () {});
+      return hit;
+    });
+  });
+}
+
+// Listagem e detalhes: rede primeiro; sem rede (ou rede lenta demais), a página offline
+function networkOrShell(request) {
+  return new Promise(function (resolve) {
+    var settled = false;
+    function fallback() {
+      if (settled) return;
+      caches.match(SETTINGS.shell).then(function (hit) {
+        if (settled) return;
+        if (hit) { settled = true; resolve(hit); }
+      });
+    }
+    var timer = setTimeout(fallback, NAVIGATION_TIMEOUT);
+    fetch(request).then(function (response) {
+      clearTimeout(timer);
+      if (!settled) { settled = true; resolve(response); }
+    }, function () {
+      clearTimeout(timer);
+      caches.match(SETTINGS.shell).then(function (hit) {
+        if (settled) return;
+        settled = true;
+        resolve(hit || Response.error());
+      });
+    });
+  });
+}
+
+function trim(cache) {
+  return cache.keys().then(function (keys) {
+    return Promise.all(keys.slice(0, Math.max(keys.length - MAX_UPLOADS, 0)).map(function (key) {
+      return cache.delete(key);
+    }));
+  });
+}
+
+// Imagens: rede primeiro (podem ser redirecionadas ao S3), cópia local para ver sem rede
+function networkThenCache(request) {
+  return caches.open(UPLOADS_CACHE).then(function (cache) {
+    return fetch(request).then(function (response) {
+      if (response.ok || response.type === 'opaque') {
+        cache.put(request, response.clone()).then(function () { return trim(cache); });
+      }
+      return response;
+    }, function () {
+      return cache.match(request).then(function (hit) { return hit || Response.error(); });
+    });
+  });
+}
+
+function isInventoryPage(path) {
+  if (path === SETTINGS.inventory) return true;
+  return path.indexOf(SETTINGS.equipmentPath) === 0 && /^\d+$/.test(path.slice(SETTINGS.equipmentPath.length));
+}
+
+self.addEventListener('fetch', function (event) {
+  var request = event.request;
+  if (request.method !== 'GET') return;
+  var url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+  var path = url.pathname;
+
+  if (SETTINGS.precache.indexOf(path) !== -1) {
+    event.respondWith(cacheFirst(request));
+  } else if (path === SETTINGS.shell) {
+    event.respondWith(staleWhileRevalidate(request));
+  } else if (request.mode === 'navigate' && isInventoryPage(path)) {
+    event.respondWith(networkOrShell(request));
+  } else if (path.indexOf(SETTINGS.uploadsPath) === 0) {
+    event.respondWith(networkThenCache(request));
+  }
+});
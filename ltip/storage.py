@@ -0,0 +1,247 @@
+"""Armazenamento dos arquivos enviados (imagens e relatórios).
+
+Dois backends com a mesma interface, escolhidos por UPLOAD_STORAGE:
+ - LocalStorage: pasta UPLOAD_FOLDER (padrão; um único nó)
+ - S3Storage: bucket S3 ou compatível (MinIO, via S3_ENDPOINT_URL); requer boto3.
+   Downloads são redirecionados para URLs pré-assinadas, e os bytes não passam pelo
+   Python. Quando o app precisa do arquivo no disco (descompressão com Range,
+   indexação), ele é baixado uma vez para um cache LRU local (DiskCache).
+
+Teste local com MinIO:
+    minio server /tmp/minio  # crie o bucket "ltip" no console
+    UPLOAD_STORAGE=s3 S3_BUCKET=ltip S3_ENDPOINT_URL=http://127.0.0.1:9000 \\
+    AWS_ACCESS_KEY_ID=minioadmin AWS_SECRET_ACCESS_KEY=minioadmin python LTIP_Laboratory_Webapp_app.py
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from contextlib import closing
+
+from flask import current_app
+from werkzeug.security import safe_join
+
+from .config import (
+    S3_BUCKET, S3_ENDPOINT_URL, S3_PREFIX, S3_PRESIGNED_EXPIRES, S3_PRESIGNED_REDIRECTS, S3_REGION,
+    UPLOAD_CACHE_DIR, UPLOAD_CACHE_MAX_BYTES,
+)
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class LocalStorage:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        path = safe_join(self.root, key)
+        if path is None:
+            raise ValueError(f"Nome de arquivo inválido: {key}")
+        return path
+
+    def put(self, key, fileobj, content_type=None):
+        path = self._path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as out:
+            shutil.copyfileobj(fileobj, out, COPY_CHUNK_SIZE)
+        os.replace(tmp, path)
+
+    def put_file(self, key, src, content_type=None):
+        shutil.move(src, self._path(key))
+
+    def open(self, key):
+        return open(self._path(key), "rb")
+
+    def local_path(self, key):
+        path = self._path(key)
+        return path if os.path.isfile(path) else None
+
+    def exists(self, key):
+        return self.local_path(key) is not None
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def presigned_url(self, key, download_name=None, content_type=None, content_encoding=None):
+        return None  # servido pelo próprio app
+
+
+class DiskCache:
+    """Cache LRU em disco, limitado a max_bytes.
+
+    O "uso recente" é o mtime do arquivo (atualizado a cada acerto), então workers
+    que compartilham o diretório também compartilham a ordem de descarte.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._total = None  # estimativa do tamanho ocupado; recalculada a cada limpeza
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def get(self, key, fetch):
+        """Caminho local de key; em caso de falta, fetch(destino) baixa o arquivo."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            fetch(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._added(path, os.path.getsize(path))
+        return path
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _added(self, path, size):
+        with self._lock:
+            if self._total is not None:
+                self._total += size
+                if self._total <= self.max_bytes:
+                    return
+            self._evict(keep=path)
+
+    def _evict(self, keep):
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".tmp") or entry.path == keep:
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)  # o arquivo recém-baixado fica, mesmo se for maior que o limite
+        # Libera até 90% do limite para não varrer o diretório a cada novo arquivo
+        for _, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total = total
+
+
+def _is_missing(error):
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage:
+    def __init__(self, bucket, prefix="", endpoint_url=None, region=None, presigned_redirects=True,
+                 presigned_expires=300, cache=None):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.presigned_redirects = presigned_redirects
+        self.presigned_expires = presigned_expires
+        self.cache = cache
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # boto3 é pesado: só é importado no primeiro acesso ao bucket
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3  # dependência opcional
+                    from botocore.config import Config
+                    config = Config(signature_version="s3v4",
+                                    s3={"addressing_style": "path"} if self.endpoint_url else None)
+                    self._client = boto3.client("s3", endpoint_url=self.endpoint_url,
+                                                region_name=self.region, config=config)
+        return self._client
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def put(self, key, fileobj, content_type=None):
+        # upload_fileobj envia em partes (multipart), sem carregar o arquivo na memória
+        extra = {"ContentType": content_type} if content_type else None
+        self.client.upload_fileobj(fileobj, self.bucket, self._key(key), ExtraArgs=extra)
+
+    def put_file(self, key, src, content_type=None):
+        extra = {"ContentType": content_type} if content_type else None
+        self.client.upload_file(src, self.bucket, self._key(key), ExtraArgs=extra)
+        os.remove(src)
+
+    def open(self, key):
+        return closing(self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"])
+
+    def local_path(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.cache.get(key, lambda dest: self.client.download_file(self.bucket, self._key(key), dest))
+        except ClientError as e:
+            if _is_missing(e):
+                return None
+            raise
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if _is_missing(e):
+                return False
+            raise
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+        self.cache.invalidate(key)
+
+    def presigned_url(self, key, download_name=None, content_type=None, content_encoding=None):
+        if not self.presigned_redirects:
+            return None
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if download_name:
+            params["ResponseContentDisposition"] = f'attachment; filename="{download_name}"'
+        if content_type:
+            params["ResponseContentType"] = content_type
+        if content_encoding:
+            params["ResponseContentEncoding"] = content_encoding
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.presigned_expires)
+
+
+def make_storage(kind, upload_folder):
+    if kind == "local":
+        return LocalStorage(upload_folder)
+    if kind == "s3":
+        if not S3_BUCKET:
+            raise RuntimeError("UPLOAD_STORAGE=s3 exige S3_BUCKET.")
+        return S3Storage(
+            S3_BUCKET, prefix=S3_PREFIX, endpoint_url=S3_ENDPOINT_URL, region=S3_REGION,
+            presigned_redirects=S3_PRESIGNED_REDIRECTS, presigned_expires=S3_PRESIGNED_EXPIRES,
+            cache=DiskCache(UPLOAD_CACHE_DIR, UPLOAD_CACHE_MAX_BYTES),
+        )
+    raise ValueError(f"UPLOAD_STORAGE desconhecido: {kind}")
+
+
+def get_storage():
+    return current_app.extensions["ltip_storage"]
@@ -0,0 +1,46 @@
+"""Layout base compartilhado por todas as páginas. Os templates de cada
+página ficam no blueprint correspondente, para que workers que não registram
+um blueprint também não carreguem seus templates. O CSS fica em static/ltip.css."""
+
+from .config import COLOR_WHITE
+
+BASE_TEMPLATE = f"""
+<!doctype html>
+<html lang="pt-br">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>LTIP - Laboratório</title>
+  <link rel="stylesheet" href="{{{{ asset_url('ltip.css') }}}}">
+  {{% if blueprint_enabled('inventory') %}}<link rel="manifest" href="{{{{ url_for('inventory.manifest') }}}}">{{% endif %}}
+</head>
+<body>
+  <div class="topbar">
+    <div class="container" style="display:flex; align-items:center; justify-content:flex-end; margin:0 auto; max-width:1100px; padding: 0;">
+      <div>
+        {{% if not blueprint_enabled('auth') %}}
+        {{% elif user %}}
+          Olá, <strong>{{{{ user.username }}}}</strong> ({{{{ user.role }}}})
+          <a href="{{{{ url_for('auth.logout') }}}}" class="btn btn-outline" style="border-color: {COLOR_WHITE}; color: {COLOR_WHITE};">Sair</a>
+        {{% else %}}
+          <a href="{{{{ url_for('auth.login') }}}}" class="btn">Entrar</a>
+        {{% endif %}}
+      </div>
+    </div>
+  </div>
+  <div class="container">
+    <h1 class="lab-title">{{% set lab = current_lab() %}}{{{{ lab.name if lab else 'LABORATÓRIO DE TECNOLOGIA DA INFORMAÇÃO DO PROFÁGUA - LTIP' }}}}</h1>
+    {{% with messages = get_flashed_messages(with_categories=true) %}}
+      {{% if messages %}}
+        {{% for cat,msg in messages %}}
+          <div class="flash">{{{{ msg }}}}</div>
+        {{% endfor %}}
+      {{% endif %}}
+    {{% endwith %}}
+    __CONTENT_BLOCK__
+    <hr>
+    <div class="small muted">Gerenciado por administrador e bolsista.</div>
+  </div>
+</body>
+</html>
+"""
@@ -0,0 +1,60 @@
+"""Rotas do núcleo, registradas em qualquer configuração de blueprints."""
+
+from flask import abort, redirect, render_template_string, send_file
+
+from .config import S3_PRESIGNED_EXPIRES
+from .helpers import current_user, get_lab_info
+from .storage import get_storage
+from .templates import BASE_TEMPLATE
+
+INDEX_TEMPLATE = r"""
+<h2>Bem-vindo ao Laboratório</h2>
+<p>Use o menu abaixo para navegar.</p>
+<div style="margin-bottom:12px">
+  {% if blueprint_enabled('inventory') %}<a href="{{ url_for('inventory.inventory') }}" class="btn">Inventário</a>{% endif %}
+  {% if blueprint_enabled('machines') %}<a href="{{ url_for('machines.machine_inventory') }}" class="btn">Gerenciamento de Máquinas</a>{% endif %}
+  {% if blueprint_enabled('reports') %}<a href="{{ url_for('reports.reports') }}" class="btn">Relatórios</a>{% endif %}
+  {% if blueprint_enabled('admin') and user and user.role in ['admin','bolsista'] %}
+    <a href="{{ url_for('admin.add_equipment') }}" class="btn btn-outline">Cadastrar Equipamento</a>
+    <a href="{{ url_for('admin.add_machine') }}" class="btn btn-outline">Cadastrar Máquina</a>
+    <a href="{{ url_for('admin.upload_report') }}" class="btn btn-outline">Enviar Relatório</a>
+  {% endif %}
+  {% if blueprint_enabled('admin') %}<a href="{{ url_for('admin.lab_info') }}" class="btn btn-outline">Configurações do Laboratório</a>{% endif %}
+</div>
+<div class="card">
+  <h3>Informações de Contato</h3>
+  <p>Coordenador: <strong>{{ info.coordenador_name }}</strong> ({{ info.coordenador_email }})</p>
+  <p>Bolsista: <strong>{{ info.bolsista_name }}</strong> ({{ info.bolsista_email }})</p>
+  <p>Descrição: Sistema de controle de inventário desenvolvido para o LTIP.</p>
+</div>
+"""
+
+
+def index():
+    info = get_lab_info()
+    final_template = BASE_TEMPLATE.replace("__CONTENT_BLOCK__", INDEX_TEMPLATE)
+    return render_template_string(final_template, user=current_user(), info=info)
+
+# --- Upload serve ---
+def uploaded_file(filename):
+    storage = get_storage()
+    url = storage.presigned_url(filename)
+    if url:
+        # Bytes vão direto do bucket; o navegador reaproveita o redirecionamento enquanto a URL vale
+        response = redirect(url)
+        response.cache_control.private = True
+        response.cache_control.max_age = S3_PRESIGNED_EXPIRES // 2
+        return response
+    try:
+        path = storage.local_path(filename)
+    except ValueError:
+        path = None
+    if path is None:
+        abort(404)
+    return send_file(path, conditional=True)
+
+
+def register_core_views(app):
+    # Sem blueprint: os endpoints continuam "index" e "uploaded_file"
+    app.add_url_rule("/", view_func=index)
+    app.add_url_rule("/uploads/<path:filename>", view_func=uploaded_file)
@@ -0,0 +1,51 @@
+"""Resumo dos equipamentos
+
+Revision ID: 2f9a6c3e8d41
+Revises: 8b4f2d6e9c17
+Create Date: 2026-10-19 20:41:27.915336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f9a6c3e8d41'
+down_revision = '8b4f2d6e9c17'
+branch_labels = None
+depends_on = None
+
+
+# Cópia das regras de ltip/equipment_summary.py no momento desta migração
+def _group_key(localizacao, finalidade, marca):
+    return ((localizacao or "").strip()[:200], (finalidade or "").strip()[:200], (marca or "").strip()[:100])
+
+
+def upgrade():
+    summary = op.create_table('equipment_summary',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('localizacao', sa.String(length=200), nullable=False),
+    sa.Column('finalidade', sa.String(length=200), nullable=False),
+    sa.Column('marca', sa.String(length=100), nullable=False),
+    sa.Column('cadastros', sa.Integer(), nullable=False),
+    sa.Column('unidades', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('localizacao', 'finalidade', 'marca')
+    )
+
+    # Carga inicial a partir dos equipamentos existentes
+    totals = {}
+    rows = op.get_bind().execute(sa.text("SELECT localizacao, finalidade, marca, quantidade FROM equipment"))
+    for localizacao, finalidade, marca, quantidade in rows:
+        key = _group_key(localizacao, finalidade, marca)
+        cadastros, unidades = totals.get(key, (0, 0))
+        totals[key] = (cadastros + 1, unidades + (quantidade or 0))
+    if totals:
+        op.bulk_insert(summary, [
+            {'localizacao': key[0], 'finalidade': key[1], 'marca': key[2], 'cadastros': cadastros, 'unidades': unidades}
+            for key, (cadastros, unidades) in totals.items()
+        ])
+
+
+def downgrade():
+    op.drop_table('equipment_summary')
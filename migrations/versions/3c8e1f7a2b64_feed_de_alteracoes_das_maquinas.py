@@ -0,0 +1,36 @@
+"""Feed de alteracoes das maquinas
+
+Revision ID: 3c8e1f7a2b64
+Revises: 9d3f6a1c5e28
+Create Date: 2026-10-19 14:21:40.318206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8e1f7a2b64'
+down_revision = '9d3f6a1c5e28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('machine_change',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('machine_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['machine_id'], ['machine.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('machine_change', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_machine_change_machine_id'), ['machine_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('machine_change', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_machine_change_machine_id'))
+
+    op.drop_table('machine_change')
@@ -0,0 +1,68 @@
+"""Indice de busca textual dos relatorios
+
+Revision ID: 4b7e2c91d0a5
+Revises: 26fe78687035
+Create Date: 2026-10-19 09:12:41.208337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c91d0a5'
+down_revision = '26fe78687035'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_text',
+    sa.Column('report_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('source_filename', sa.String(length=300), nullable=False),
+    sa.Column('indexed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['report_id'], ['report.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('report_id')
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Tabela FTS5 com conteúdo externo: o texto fica só em report_text e os
+        # triggers mantêm o índice sincronizado a cada INSERT/UPDATE/DELETE.
+        op.execute(
+            "CREATE VIRTUAL TABLE report_fts USING fts5("
+            "title, body, content='report_text', content_rowid='report_id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER report_text_ai AFTER INSERT ON report_text BEGIN "
+            "INSERT INTO report_fts(rowid, title, body) VALUES (new.report_id, new.title, new.body); END"
+        )
+        op.execute(
+            "CREATE TRIGGER report_text_ad AFTER DELETE ON report_text BEGIN "
+            "INSERT INTO report_fts(report_fts, rowid, title, body) VALUES ('delete', old.report_id, old.title, old.body); END"
+        )
+        op.execute(
+            "CREATE TRIGGER report_text_au AFTER UPDATE ON report_text BEGIN "
+            "INSERT INTO report_fts(report_fts, rowid, title, body) VALUES ('delete', old.report_id, old.title, old.body); "
+            "INSERT INTO report_fts(rowid, title, body) VALUES (new.report_id, new.title, new.body); END"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE report_text ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('portuguese', coalesce(body, '')), 'B')) STORED"
+        )
+        op.execute("CREATE INDEX ix_report_text_search_vector ON report_text USING GIN (search_vector)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS report_text_au")
+        op.execute("DROP TRIGGER IF EXISTS report_text_ad")
+        op.execute("DROP TRIGGER IF EXISTS report_text_ai")
+        op.execute("DROP TABLE IF EXISTS report_fts")
+    op.drop_table('report_text')
@@ -0,0 +1,117 @@
+"""Catalogo de softwares e licencas
+
+Revision ID: 5e2b8c7d1a93
+Revises: 7a1d4e9b3f02
+Create Date: 2026-10-19 18:37:05.126733
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b8c7d1a93'
+down_revision = '7a1d4e9b3f02'
+branch_labels = None
+depends_on = None
+
+# Cópia das regras de ltip/catalog.py no momento desta migração
+NAME_SEPARATORS = re.compile(r"[,;\r\n]+")
+
+
+def _split_names(text):
+    names = {}
+    for part in NAME_SEPARATORS.split(text or ""):
+        name = " ".join(part.split())[:200]
+        if name:
+            names.setdefault(name.lower(), name)
+    return names
+
+
+def _create_name_key_index(table, dialect):
+    # Índice para LIKE 'prefixo%': no SQLite o LIKE ignora maiúsculas e só usa índice
+    # NOCASE; no PostgreSQL, com collation diferente de C, só com text_pattern_ops.
+    if dialect == 'sqlite':
+        op.execute(f"CREATE INDEX ix_{table}_name_key_prefix ON {table} (name_key COLLATE NOCASE)")
+    elif dialect == 'postgresql':
+        op.execute(f"CREATE INDEX ix_{table}_name_key_prefix ON {table} (name_key text_pattern_ops)")
+
+
+def upgrade():
+    software = op.create_table('software',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('name_key', sa.String(length=200), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name_key')
+    )
+    license = op.create_table('license',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('name_key', sa.String(length=200), nullable=False),
+    sa.Column('seats', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name_key')
+    )
+    machine_software = op.create_table('machine_software',
+    sa.Column('machine_id', sa.Integer(), nullable=False),
+    sa.Column('software_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['machine_id'], ['machine.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['software_id'], ['software.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('machine_id', 'software_id')
+    )
+    with op.batch_alter_table('machine_software', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_machine_software_software_id'), ['software_id'], unique=False)
+
+    machine_license = op.create_table('machine_license',
+    sa.Column('machine_id', sa.Integer(), nullable=False),
+    sa.Column('license_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['license_id'], ['license.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['machine_id'], ['machine.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('machine_id', 'license_id')
+    )
+    with op.batch_alter_table('machine_license', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_machine_license_license_id'), ['license_id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    _create_name_key_index('software', dialect)
+    _create_name_key_index('license', dialect)
+
+    # Carga a partir dos campos de texto existentes (que continuam existindo)
+    machines = op.get_bind().execute(sa.text("SELECT id, softwares_instalados, licencas FROM machine")).all()
+    for column, catalog, association, fk in (
+        (1, software, machine_software, 'software_id'),
+        (2, license, machine_license, 'license_id'),
+    ):
+        ids, rows, links = {}, [], []
+        for machine in machines:
+            for key, name in _split_names(machine[column]).items():
+                if key not in ids:
+                    ids[key] = len(ids) + 1
+                    rows.append({'id': ids[key], 'name': name, 'name_key': key})
+                links.append({'machine_id': machine[0], fk: ids[key]})
+        if rows:
+            op.bulk_insert(catalog, rows)
+            op.bulk_insert(association, links)
+    if dialect == 'postgresql':
+        # ids explícitos na carga: ajusta as sequências
+        op.execute("SELECT setval(pg_get_serial_sequence('software', 'id'), coalesce(max(id), 1)) FROM software")
+        op.execute("SELECT setval(pg_get_serial_sequence('license', 'id'), coalesce(max(id), 1)) FROM license")
+
+
+def downgrade():
+    # Os campos de texto de machine não foram alterados: basta remover as tabelas
+    op.execute("DROP INDEX IF EXISTS ix_license_name_key_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_software_name_key_prefix")
+    with op.batch_alter_table('machine_license', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_machine_license_license_id'))
+
+    op.drop_table('machine_license')
+    with op.batch_alter_table('machine_software', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_machine_software_software_id'))
+
+    op.drop_table('machine_software')
+    op.drop_table('license')
+    op.drop_table('software')
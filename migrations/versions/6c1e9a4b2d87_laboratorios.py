@@ -0,0 +1,142 @@
+"""Laboratorios
+
+Revision ID: 6c1e9a4b2d87
+Revises: 2f9a6c3e8d41
+Create Date: 2026-10-19 21:37:05.281946
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1e9a4b2d87'
+down_revision = '2f9a6c3e8d41'
+branch_labels = None
+depends_on = None
+
+DEFAULT_LAB_ID = 1
+# Tabela: índices compostos (lab_id primeiro)
+LAB_TABLES = {
+    'lab_info': [],
+    'equipment': [('ix_equipment_lab_id_name', ['lab_id', 'name'])],
+    'machine': [('ix_machine_lab_id_name', ['lab_id', 'name'])],
+    'report': [('ix_report_lab_id_uploaded_at', ['lab_id', 'uploaded_at'])],
+}
+
+
+# UNIQUE(numero_serie) da criação inicial não tem nome no SQLite: a naming_convention
+# do batch dá a ele este nome; no PostgreSQL vale o nome gerado pelo banco.
+SERIAL_NAMING = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+
+
+def _old_serial_constraint():
+    return 'machine_numero_serie_key' if op.get_bind().dialect.name == 'postgresql' else 'uq_machine_numero_serie'
+
+
+# Cópia das regras de ltip/equipment_summary.py no momento desta migração
+def _group_key(localizacao, finalidade, marca):
+    return ((localizacao or "").strip()[:200], (finalidade or "").strip()[:200], (marca or "").strip()[:100])
+
+
+def _summary_totals(with_lab):
+    totals = {}
+    rows = op.get_bind().execute(sa.text("SELECT lab_id, localizacao, finalidade, marca, quantidade FROM equipment")
+                                 if with_lab else
+                                 sa.text("SELECT NULL, localizacao, finalidade, marca, quantidade FROM equipment"))
+    for lab_id, localizacao, finalidade, marca, quantidade in rows:
+        key = ((lab_id,) if with_lab else ()) + _group_key(localizacao, finalidade, marca)
+        cadastros, unidades = totals.get(key, (0, 0))
+        totals[key] = (cadastros + 1, unidades + (quantidade or 0))
+    return totals
+
+
+def _create_summary(with_lab):
+    columns = [sa.Column('id', sa.Integer(), nullable=False)]
+    key_columns = ['localizacao', 'finalidade', 'marca']
+    if with_lab:
+        columns.append(sa.Column('lab_id', sa.Integer(), nullable=False))
+        key_columns.insert(0, 'lab_id')
+    summary = op.create_table('equipment_summary',
+    *columns,
+    sa.Column('localizacao', sa.String(length=200), nullable=False),
+    sa.Column('finalidade', sa.String(length=200), nullable=False),
+    sa.Column('marca', sa.String(length=100), nullable=False),
+    sa.Column('cadastros', sa.Integer(), nullable=False),
+    sa.Column('unidades', sa.Integer(), nullable=False),
+    *([sa.ForeignKeyConstraint(['lab_id'], ['lab.id'])] if with_lab else []),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint(*key_columns)
+    )
+    totals = _summary_totals(with_lab)
+    if totals:
+        op.bulk_insert(summary, [
+            dict(zip(key_columns, key), cadastros=cadastros, unidades=unidades)
+            for key, (cadastros, unidades) in totals.items()
+        ])
+
+
+def upgrade():
+    lab = op.create_table('lab',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('slug', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('hostname', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hostname'),
+    sa.UniqueConstraint('slug')
+    )
+    # Tudo o que já existe passa a ser do laboratório padrão (DEFAULT_LAB="ltip")
+    op.bulk_insert(lab, [{'id': DEFAULT_LAB_ID, 'slug': 'ltip',
+                          'name': 'LABORATÓRIO DE TECNOLOGIA DA INFORMAÇÃO DO PROFÁGUA - LTIP'}])
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("SELECT setval(pg_get_serial_sequence('lab', 'id'), coalesce(max(id), 1)) FROM lab")
+
+    for table, indexes in LAB_TABLES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('lab_id', sa.Integer(), nullable=True))
+        op.execute(sa.text(f"UPDATE {table} SET lab_id = :lab").bindparams(lab=DEFAULT_LAB_ID))
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('lab_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.create_foreign_key(f'fk_{table}_lab_id_lab', 'lab', ['lab_id'], ['id'])
+            for name, columns in indexes:
+                batch_op.create_index(name, columns, unique=False)
+            if table == 'lab_info':
+                batch_op.create_unique_constraint('uq_lab_info_lab_id', ['lab_id'])
+
+    # Número de série: único por laboratório, não mais na instalação inteira
+    with op.batch_alter_table('machine', schema=None, naming_convention=SERIAL_NAMING) as batch_op:
+        batch_op.drop_constraint(_old_serial_constraint(), type_='unique')
+        batch_op.create_unique_constraint('uq_machine_lab_id_numero_serie', ['lab_id', 'numero_serie'])
+
+    # Contas existentes continuam valendo para todos os laboratórios (lab_id nulo)
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lab_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_user_lab_id_lab', 'lab', ['lab_id'], ['id'])
+
+    # A chave única do resumo ganha lab_id: mais simples recriar a tabela e recalcular
+    op.drop_table('equipment_summary')
+    _create_summary(with_lab=True)
+
+
+def downgrade():
+    # Atenção: o downgrade junta os dados de todos os laboratórios (números de série
+    # repetidos entre laboratórios impedem a volta da restrição única global)
+    op.drop_table('equipment_summary')
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_user_lab_id_lab', type_='foreignkey')
+        batch_op.drop_column('lab_id')
+    with op.batch_alter_table('machine', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_machine_lab_id_numero_serie', type_='unique')
+        batch_op.create_unique_constraint(_old_serial_constraint(), ['numero_serie'])
+    for table, indexes in reversed(list(LAB_TABLES.items())):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            if table == 'lab_info':
+                batch_op.drop_constraint('uq_lab_info_lab_id', type_='unique')
+            for name, _ in indexes:
+                batch_op.drop_index(name)
+            batch_op.drop_constraint(f'fk_{table}_lab_id_lab', type_='foreignkey')
+            batch_op.drop_column('lab_id')
+    _create_summary(with_lab=False)
+    op.drop_table('lab')
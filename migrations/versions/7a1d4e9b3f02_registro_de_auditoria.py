@@ -0,0 +1,32 @@
+"""Registro de auditoria
+
+Revision ID: 7a1d4e9b3f02
+Revises: 3c8e1f7a2b64
+Create Date: 2026-10-19 16:08:12.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a1d4e9b3f02'
+down_revision = '3c8e1f7a2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('audit_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('username', sa.String(length=80), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('target_ids', sa.Text(), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('audit_log')
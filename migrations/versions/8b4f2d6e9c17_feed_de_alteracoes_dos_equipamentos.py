@@ -0,0 +1,36 @@
+"""Feed de alteracoes dos equipamentos
+
+Revision ID: 8b4f2d6e9c17
+Revises: 5e2b8c7d1a93
+Create Date: 2026-10-19 19:52:13.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4f2d6e9c17'
+down_revision = '5e2b8c7d1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('equipment_change',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('equipment_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('equipment_change', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_equipment_change_equipment_id'), ['equipment_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('equipment_change', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_equipment_change_equipment_id'))
+
+    op.drop_table('equipment_change')
@@ -0,0 +1,29 @@
+"""Compressao dos relatorios em disco
+
+Revision ID: 9d3f6a1c5e28
+Revises: 4b7e2c91d0a5
+Create Date: 2026-10-19 10:02:17.554120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a1c5e28'
+down_revision = '4b7e2c91d0a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('storage_encoding', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('original_size', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    # Atenção: arquivos já comprimidos precisam ser descomprimidos antes do downgrade
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.drop_column('original_size')
+        batch_op.drop_column('storage_encoding')
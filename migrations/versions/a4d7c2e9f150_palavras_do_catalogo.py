@@ -0,0 +1,62 @@
+"""Palavras do catalogo
+
+Revision ID: a4d7c2e9f150
+Revises: 6c1e9a4b2d87
+Create Date: 2026-10-20 09:12:44.518302
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d7c2e9f150'
+down_revision = '6c1e9a4b2d87'
+branch_labels = None
+depends_on = None
+
+# Cópia das regras de ltip/catalog.py no momento desta migração
+WORD_RE = re.compile(r"\w+")
+
+
+def _create_prefix_index(name, table, column, dialect):
+    # Índice para LIKE 'prefixo%': no SQLite o LIKE ignora maiúsculas e só usa índice
+    # NOCASE; no PostgreSQL, com collation diferente de C, só com text_pattern_ops.
+    if dialect == 'sqlite':
+        op.execute(f"CREATE INDEX {name} ON {table} ({column} COLLATE NOCASE)")
+    elif dialect == 'postgresql':
+        op.execute(f"CREATE INDEX {name} ON {table} ({column} text_pattern_ops)")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for catalog, fk in (('software', 'software_id'), ('license', 'license_id')):
+        words = op.create_table(f'{catalog}_word',
+        sa.Column(fk, sa.Integer(), nullable=False),
+        sa.Column('word', sa.String(length=200), nullable=False),
+        sa.ForeignKeyConstraint([fk], [f'{catalog}.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint(fk, 'word')
+        )
+        _create_prefix_index(f'ix_{catalog}_word_prefix', f'{catalog}_word', 'word', dialect)
+
+        rows = op.get_bind().execute(sa.text(f"SELECT id, name_key FROM {catalog}")).all()
+        links = [{fk: entry_id, 'word': word}
+                 for entry_id, key in rows for word in sorted(set(WORD_RE.findall(key)))]
+        if links:
+            op.bulk_insert(words, links)
+
+        # A busca por prefixo passou para as palavras: o índice de name_key só custava
+        # escrita (a unicidade continua com a restrição UNIQUE de name_key)
+        op.execute(f"DROP INDEX IF EXISTS ix_{catalog}_name_key_prefix")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    _create_prefix_index('ix_software_name_key_prefix', 'software', 'name_key', dialect)
+    _create_prefix_index('ix_license_name_key_prefix', 'license', 'name_key', dialect)
+    op.execute("DROP INDEX IF EXISTS ix_license_word_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_software_word_prefix")
+    op.drop_table('license_word')
+    op.drop_table('software_word')
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+import pytest
+from flask import g
+from flask_migrate import upgrade
+
+from ltip import create_app
+from ltip.extensions import db
+from ltip.labs import directory
+from ltip.models import Lab
+
+
+@pytest.fixture
+def app(tmp_path):
+    # Banco SQLite novo por teste, criado pelas migrações (FTS5, gatilhos e índices
+    # só existem nelas, não em db.create_all())
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'ltip.db'}",
+        "UPLOAD_FOLDER": str(tmp_path / "uploads"),
+        "UPLOAD_STORAGE": "local",
+        "BACKUP_INTERVAL_HOURS": 0,
+        "TESTING": True,
+    }, with_migrations=True)
+    with app.app_context():
+        upgrade()
+        directory.invalidate()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    directory.invalidate()
+
+
+@pytest.fixture
+def make_lab(app):
+    def make_lab(slug):
+        lab = Lab(slug=slug, name=slug.upper())
+        db.session.add(lab)
+        db.session.commit()
+        directory.invalidate()
+        return lab.id
+    return make_lab
+
+
+@contextmanager
+def in_lab(app, slug):
+    """Requisição de teste dentro do laboratório slug (como em /lab/<slug>/...)."""
+    with app.test_request_context():
+        g.ltip_lab = directory.by_slug(slug)
+        yield
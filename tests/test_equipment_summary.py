@@ -0,0 +1,57 @@
+from ltip.equipment_summary import rebuild_equipment_summary, summary_totals
+from ltip.extensions import db
+from ltip.inventory_sync import lock_equipment, record_equipment_change
+from ltip.models import Equipment
+
+
+def _add_equipment(**fields):
+    item = Equipment(name="Multímetro", **fields)
+    db.session.add(item)
+    db.session.commit()
+    return item.id
+
+
+def test_summary_follows_orm_changes(app):
+    eq_id = _add_equipment(localizacao="Sala 1", marca="Fluke", quantidade=2)
+    _add_equipment(localizacao="Sala 1", marca="Fluke", quantidade=3)
+    assert tuple(summary_totals()) == (2, 5)
+
+    item = lock_equipment(eq_id)
+    item.localizacao, item.quantidade = "Sala 2", 4
+    db.session.commit()
+    db.session.delete(db.session.get(Equipment, eq_id))
+    db.session.commit()
+    assert tuple(summary_totals()) == (1, 3)
+    assert rebuild_equipment_summary(check_only=True)[1] == []
+
+
+def test_summary_matches_recount_after_overlapping_edits(app):
+    eq_id = _add_equipment(localizacao="Sala 1", marca="Fluke", quantidade=2)
+    # Esta requisição leu o equipamento antes da edição concorrente abaixo
+    stale = db.session.get(Equipment, eq_id)
+
+    other = db.session.session_factory()
+    try:
+        item = other.get(Equipment, eq_id)
+        item.localizacao = "Sala 2"
+        other.commit()
+    finally:
+        other.close()
+
+    item = lock_equipment(eq_id)
+    assert item is stale and item.localizacao == "Sala 2"
+    item.quantidade = 5
+    record_equipment_change(item)
+    db.session.commit()
+
+    assert rebuild_equipment_summary(check_only=True)[1] == []
+    assert tuple(summary_totals()) == (1, 5)
+
+
+def test_summary_reads_expired_state_from_database(app):
+    eq_id = _add_equipment(localizacao="Sala 1", quantidade=2)
+    item = db.session.get(Equipment, eq_id)
+    db.session.expire(item, ["localizacao", "quantidade"])
+    item.localizacao, item.quantidade = "Sala 3", 1
+    db.session.commit()
+    assert rebuild_equipment_summary(check_only=True)[1] == []
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from conftest import in_lab
+from ltip.change_feed import settled_cursor
+from ltip.extensions import db
+from ltip.inventory_sync import inventory_delta
+from ltip.models import Equipment, EquipmentChange
+
+
+def _add_equipment(name):
+    item = Equipment(name=name)
+    db.session.add(item)
+    db.session.commit()
+    return item.id
+
+
+def test_delta_resends_change_committed_out_of_order(app):
+    first, late, other = (_add_equipment(name) for name in ("Balança", "Estufa", "Pipeta"))
+    db.session.add(EquipmentChange(id=1, equipment_id=first))
+    db.session.commit()
+
+    # Outra sessão reservou o id 2 e ainda não fez commit; o id 3 já foi gravado
+    late_session = db.session.session_factory()
+    db.session.add(EquipmentChange(id=3, equipment_id=other))
+    db.session.commit()
+
+    with in_lab(app, "ltip"):
+        delta = inventory_delta(0)
+    assert delta["seq"] == 1
+
+    late_session.add(EquipmentChange(id=2, equipment_id=late))
+    late_session.commit()
+    late_session.close()
+
+    with in_lab(app, "ltip"):
+        delta = inventory_delta(delta["seq"])
+    assert not delta["full"]
+    assert {item["id"]: item["seq"] for item in delta["items"]} == {late: 2, other: 3}
+
+
+def test_settled_cursor_ignores_old_gaps(app):
+    item = _add_equipment("Balança")
+    old = datetime.now(timezone.utc) - timedelta(hours=1)
+    # O id 2 nunca apareceu (rollback), mas a linha acima dele é antiga
+    db.session.add_all([EquipmentChange(id=1, equipment_id=item, changed_at=old),
+                        EquipmentChange(id=3, equipment_id=item, changed_at=old)])
+    db.session.commit()
+    assert settled_cursor(EquipmentChange) == 3
+
+    db.session.add_all([EquipmentChange(id=4, equipment_id=item), EquipmentChange(id=6, equipment_id=item)])
+    db.session.commit()
+    assert settled_cursor(EquipmentChange) == 4
+    assert settled_cursor(EquipmentChange, grace=0) == 6
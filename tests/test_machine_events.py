@@ -0,0 +1,67 @@
+import json
+
+from ltip.extensions import db
+from ltip.machine_events import MachineEventHub
+from ltip.models import Machine, MachineChange
+
+
+def _add_machines(*names):
+    machines = [Machine(name=name) for name in names]
+    db.session.add_all(machines)
+    db.session.commit()
+    return [m.id for m in machines]
+
+
+def _next_event(stream):
+    chunk = next(stream)
+    if chunk.startswith(": ping"):
+        return chunk, None
+    fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+    return fields.get("event"), fields
+
+
+def test_change_committed_out_of_order_is_published(app):
+    first, late, other = _add_machines("PC-01", "PC-02", "PC-03")
+    db.session.add_all([MachineChange(id=1, machine_id=first), MachineChange(id=3, machine_id=other)])
+    db.session.commit()
+
+    hub = MachineEventHub(app, heartbeat=0.01)
+    hub._poll()
+    # O id 2 ainda pode aparecer: o cursor seguro para antes dele
+    assert hub.cursor == 1
+
+    stream = hub.stream(0, lambda m: m.name)
+    assert next(stream).startswith("retry:")
+    sent = [_next_event(stream) for _ in range(2)]
+    assert [json.loads(fields["data"])["id"] for _, fields in sent] == [first, other]
+    assert {fields["id"] for _, fields in sent} == {"1"}
+
+    late_session = db.session.session_factory()
+    late_session.add(MachineChange(id=2, machine_id=late))
+    late_session.commit()
+    late_session.close()
+    hub._poll()
+
+    event, fields = _next_event(stream)
+    assert event == "machine" and json.loads(fields["data"])["id"] == late
+    # Sem buracos: o cursor alcança o fim do feed
+    assert fields["id"] == "3"
+    # Ids já publicados não voltam na próxima leitura
+    hub._poll()
+    assert _next_event(stream) == (": ping\n\n", None)
+    stream.close()
+
+
+def test_full_pages_are_read_without_waiting(app):
+    ids = _add_machines(*(f"PC-{n:02}" for n in range(5)))
+    db.session.add_all(MachineChange(machine_id=machine_id) for machine_id in ids)
+    db.session.commit()
+
+    hub = MachineEventHub(app, buffer_size=2, heartbeat=0.01)
+    hub._poll()
+    assert [seq for _, seq, _ in hub.events] == [4, 5]
+
+    # O assinante que começou do 0 perdeu alterações que saíram do buffer
+    stream = hub.stream(0, lambda m: m.name)
+    next(stream)
+    assert _next_event(stream)[0] == "reload"
@@ -0,0 +1,40 @@
+from ltip.ratelimit import MemoryRateLimitStore, SQLiteRateLimitStore
+
+
+def test_memory_store_limits_within_window():
+    store = MemoryRateLimitStore(max_keys=10)
+    assert [store.hit("user:a", 3, 60, now=100 + n) for n in range(3)] == [0, 0, 0]
+    assert store.hit("user:a", 3, 60, now=110) == 50
+    # Fora da janela a primeira tentativa deixa de contar
+    assert store.hit("user:a", 3, 60, now=160.5) == 0
+
+
+def test_memory_store_full_table_does_not_evict_active_keys():
+    store = MemoryRateLimitStore(max_keys=2)
+    for n in range(3):
+        store.hit("user:vitima", 3, 60, now=100 + n)
+    assert store.hit("user:vitima", 3, 60, now=103)
+    # Chaves novas não tiram o contador da vítima: com a tabela cheia, são recusadas
+    store.hit("ip:atacante-0", 3, 60, now=104)
+    for n in range(1, 50):
+        assert store.hit(f"ip:atacante-{n}", 3, 60, now=104) > 0
+    assert store.hit("user:vitima", 3, 60, now=105) > 0
+
+
+def test_memory_store_full_table_reuses_expired_keys():
+    store = MemoryRateLimitStore(max_keys=2)
+    store.hit("ip:a", 3, 60, now=100)
+    store.hit("ip:b", 3, 60, now=130)
+    # ip:a expirou: sai para dar lugar à chave nova; ip:b continua ativa
+    assert store.hit("ip:c", 3, 60, now=170) == 0
+    assert store.hit("ip:d", 3, 60, now=170) == 20
+
+
+def test_sqlite_store_shares_counts_between_instances(tmp_path):
+    path = str(tmp_path / "login.db")
+    first, second = SQLiteRateLimitStore(path), SQLiteRateLimitStore(path)
+    assert first.hit("user:a", 2, 60, now=100) == 0
+    assert second.hit("user:a", 2, 60, now=101) == 0
+    assert first.hit("user:a", 2, 60, now=102) == 58
+    second.reset("user:a")
+    assert first.hit("user:a", 2, 60, now=103) == 0
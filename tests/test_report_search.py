@@ -0,0 +1,56 @@
+from sqlalchemy import event
+
+from conftest import in_lab
+from ltip.extensions import db
+from ltip.models import Report, ReportText
+from ltip.report_search import search_reports
+
+REPORTS_PER_LAB = 300
+
+
+def _add_reports(lab_id, prefix):
+    for n in range(REPORTS_PER_LAB):
+        rpt = Report(title=f"{prefix} {n}", filename=f"{prefix}-{n}.txt", lab_id=lab_id)
+        db.session.add(rpt)
+        db.session.flush()
+        db.session.add(ReportText(report_id=rpt.id, title=rpt.title,
+                                  body=f"calibração do medidor de vazão {n}", source_filename=rpt.filename))
+    db.session.commit()
+
+
+def test_search_is_scoped_to_the_current_lab(app, make_lab):
+    bio = make_lab("bio")
+    _add_reports(1, "Relatório LTIP")
+    _add_reports(bio, "Relatório BIO")
+
+    with in_lab(app, "bio"):
+        found = search_reports("vazão", limit=1000)
+        assert len(found) == REPORTS_PER_LAB
+        assert {rpt.lab_id for rpt, _ in found} == {bio}
+        assert len(search_reports("vazão", limit=10)) == 10
+        assert search_reports("LTIP") == []
+    with in_lab(app, "ltip"):
+        assert {rpt.lab_id for rpt, _ in search_reports("medidor", limit=1000)} == {1}
+
+
+def test_search_lab_filter_is_not_pushed_into_fts(app, make_lab):
+    make_lab("bio")
+    _add_reports(1, "Relatório LTIP")
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "report_fts" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        with in_lab(app, "bio"):
+            search_reports("vazão")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[0]
+    plan = [row[-1] for row in db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+    # "INDEX 0:=M..." seria a restrição de rowid dentro do FTS5: um passo por relatório do laboratório
+    fts_scan = [step for step in plan if "report_fts VIRTUAL TABLE" in step]
+    assert fts_scan and all("0:=" not in step for step in fts_scan), plan